@@ -0,0 +1,110 @@
+"""
+Benchmark of how scraped matches are accumulated per sport.
+
+Webpages are not requested: every season returns the same synthetic matches,
+so only the time spent accumulating matches is measured. The previous
+approach (one pd.concat per season) is measured as a reference.
+
+Usage: python benchmark_web_scrape.py [--seasons 250 500 1000 2000]
+"""
+
+import argparse
+import time
+from collections import defaultdict
+from typing import Callable
+from unittest import mock
+
+import pandas as pd
+
+import tournament_matches.scrape.web_scrape as scrape
+
+MATCHES_PER_SEASON: int = 380  # a season of a 20 team league
+SEASONS_PER_TOURNAMENT: int = 10
+
+MATCHES: list[list] = [
+    [f"Team{i} - Team{i + 1}", "1:0", "01.01.2014", 1.5, 3.0, 2.0]
+    for i in range(MATCHES_PER_SEASON)
+]
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--seasons",
+        nargs="+",
+        type=int,
+        default=[250, 500, 1000, 2000],
+        help="number of seasons of each run",
+    )
+
+    return parser.parse_args()
+
+
+def _get_paths(num_seasons: int) -> list[str]:
+    num_tournaments: int = -(-num_seasons // SEASONS_PER_TOURNAMENT)
+    return [f"/soccer/country/name{i}/" for i in range(num_tournaments)]
+
+
+def _get_season_paths(path: str, num_seasons: int) -> list[str]:
+    tournament: int = int(path.split("name")[-1].strip("/"))
+    first: int = tournament * SEASONS_PER_TOURNAMENT
+    last: int = min(first + SEASONS_PER_TOURNAMENT, num_seasons)
+
+    return [f"{path[:-1]}-{year}/" for year in range(first, last)]
+
+
+def _concat_per_season(paths: list[str], num_seasons: int) -> dict[str, pd.DataFrame]:
+    # previous approach: every season copies all matches of its sport again
+    sport_to_matches: dict[str, pd.DataFrame] = defaultdict(pd.DataFrame)
+
+    for path in paths:
+        for season_path in _get_season_paths(path, num_seasons):
+            df_matches: pd.DataFrame = pd.DataFrame(MATCHES)
+            df_matches.loc[:, "id"] = "name@" + season_path
+
+            sport_to_matches["soccer"] = pd.concat(
+                [sport_to_matches["soccer"], df_matches.set_index("id")]
+            )
+
+    return sport_to_matches
+
+
+def _builder_per_sport(paths: list[str], num_seasons: int) -> dict[str, pd.DataFrame]:
+    with mock.patch.object(
+        scrape,
+        "get_path_to_desired_seasons",
+        lambda path, *_: _get_season_paths(path, num_seasons),
+    ), mock.patch.object(scrape, "web_scrape_matches_information", lambda _: MATCHES):
+        return scrape._web_scrape_from_paths(paths, ("", ""), ("", ""))
+
+
+def _time(function: Callable[[list[str], int], dict], num_seasons: int) -> float:
+    paths: list[str] = _get_paths(num_seasons)
+
+    start: float = time.perf_counter()
+    sport_to_matches: dict = function(paths, num_seasons)
+    elapsed: float = time.perf_counter() - start
+
+    assert len(sport_to_matches["soccer"]) == num_seasons * MATCHES_PER_SEASON
+
+    return elapsed
+
+
+def benchmark(seasons: list[int]) -> None:
+    print(f"{MATCHES_PER_SEASON} matches per season")
+    print(f"{'seasons':>8} | {'builder (s)':>11} {'ms/season':>9} | ", end="")
+    print(f"{'concat (s)':>10} {'ms/season':>9}")
+
+    for num_seasons in seasons:
+        builder: float = _time(_builder_per_sport, num_seasons)
+        concat: float = _time(_concat_per_season, num_seasons)
+
+        print(
+            f"{num_seasons:>8} | {builder:>11.2f} {1000 * builder / num_seasons:>9.2f}"
+            f" | {concat:>10.2f} {1000 * concat / num_seasons:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+    benchmark(arguments.seasons)
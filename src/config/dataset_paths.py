@@ -5,3 +5,15 @@ DATA_PATH = Path("../data/")
 SCRAPE_PATH: Path = DATA_PATH / "bet_explorer/"
 FORMAT_PATH: Path = DATA_PATH / "formatted/"
 FILTER_PATH: Path = DATA_PATH / "filtered/"
+CACHE_PATH: Path = DATA_PATH / "cache/"
+ARCHIVE_PATH: Path = DATA_PATH / "archive/" / "pages.sqlite3"
+
+STATE_PATH: Path = DATA_PATH / "scrape_state/"
+JOURNAL_PATH: Path = STATE_PATH / "journal.jsonl"
+DEAD_LETTERS_PATH: Path = STATE_PATH / "dead_letters.jsonl"
+SEASON_INDEX_PATH: Path = STATE_PATH / "seasons.sqlite3"
+SEASON_COSTS_PATH: Path = STATE_PATH / "season_costs.sqlite3"
+MAIN_QUERIES_PATH: Path = STATE_PATH / "main_queries.sqlite3"
+DROPDOWNS_PATH: Path = STATE_PATH / "season_dropdowns.sqlite3"
+QUEUE_PATH: Path = STATE_PATH / "work_queue.sqlite3"
+SHARDS_PATH: Path = STATE_PATH / "shards/"
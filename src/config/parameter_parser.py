@@ -1,7 +1,7 @@
 import json
 import logging
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Optional
 
 import tournament_matches as tm
 
@@ -42,3 +42,223 @@ def get_url_paths(url_paths_config: ConfigurationType, sports: Iterable[str]):
     raise ValueError(
         "Only valid parameters.json modes are: ['homepage', 'json_list', 'file']."
     )
+
+
+def create_response_cache(
+    cache_config: ConfigurationType, directory: Path
+) -> Optional[tm.scrape.ResponseCache]:
+    """
+    Create the on-disk webpage cache, if it is enabled.
+    """
+
+    if not cache_config["enabled"]:
+        return None
+
+    return tm.scrape.ResponseCache(
+        directory,
+        max_bytes=int(cache_config["max_megabytes"] * 2**20),
+        current_ttl=cache_config["current_season_ttl"],
+    )
+
+
+def create_html_archive(
+    archive_config: ConfigurationType, path: Path
+) -> Optional[tm.scrape.HtmlArchive]:
+    """
+    Create the archive of downloaded webpages, if it is enabled.
+    """
+
+    if not archive_config["enabled"]:
+        return None
+
+    return tm.scrape.HtmlArchive(
+        path,
+        level=archive_config["level"],
+        dictionary_size=archive_config["dictionary_size"],
+        dictionary_samples=archive_config["dictionary_samples"],
+    )
+
+
+def create_season_index(
+    index_config: ConfigurationType, path: Path
+) -> Optional[tm.scrape.SeasonIndex]:
+    """
+    Create the index of scraped seasons, if it is enabled.
+    """
+
+    if not index_config["enabled"]:
+        return None
+
+    return tm.scrape.SeasonIndex(
+        path, index_config["closed_after_days"], index_config["incremental"]
+    )
+
+
+def create_season_costs(
+    costs_config: ConfigurationType, path: Path
+) -> Optional[tm.scrape.SeasonCosts]:
+    """
+    Create the history of seasons' scraping costs, if it is enabled.
+    """
+
+    if not costs_config["enabled"]:
+        return None
+
+    return tm.scrape.SeasonCosts(path)
+
+
+def create_season_dropdowns(
+    dropdowns_config: ConfigurationType, path: Path
+) -> Optional[tm.scrape.SeasonDropdowns]:
+    """
+    Create the record of tournaments' season dropdowns, if it is enabled.
+    """
+
+    if not dropdowns_config["enabled"]:
+        return None
+
+    return tm.scrape.SeasonDropdowns(path, dropdowns_config["max_age_days"])
+
+
+def create_work_queue(
+    queue_config: ConfigurationType, path: Path
+) -> tm.scrape.WorkQueue:
+    """
+    Open the queue of seasons shared by the coordinator and workers.
+    """
+
+    return tm.scrape.WorkQueue(path, queue_config["lease_seconds"])
+
+
+def create_concurrency_limiter(
+    concurrency_config: ConfigurationType,
+) -> Optional[tm.scrape.AdaptiveConcurrencyLimiter]:
+    """
+    Create the adaptive limiter of requests in flight, if it is enabled.
+    """
+
+    if not concurrency_config["adaptive"]:
+        return None
+
+    return tm.scrape.AdaptiveConcurrencyLimiter(
+        initial=concurrency_config["initial"],
+        minimum=concurrency_config["minimum"],
+        maximum=concurrency_config["maximum"],
+        latency_target=concurrency_config["latency_target"],
+        max_error_rate=concurrency_config["max_error_rate"],
+    )
+
+
+def create_circuit_breaker(
+    circuit_breaker_config: ConfigurationType,
+) -> Optional[tm.scrape.HostCircuitBreaker]:
+    """
+    Create the per-host circuit breaker of requests, if it is enabled.
+    """
+
+    if not circuit_breaker_config["enabled"]:
+        return None
+
+    return tm.scrape.HostCircuitBreaker(
+        failure_rate=circuit_breaker_config["failure_rate"],
+        window=circuit_breaker_config["window"],
+        min_requests=circuit_breaker_config["min_requests"],
+        cooldown=circuit_breaker_config["cooldown"],
+        probes=circuit_breaker_config["probes"],
+    )
+
+
+def create_scrape_client(
+    client_config: ConfigurationType,
+    cache: Optional[tm.scrape.ResponseCache],
+    archive: Optional[tm.scrape.HtmlArchive] = None,
+) -> tm.scrape.ScrapeClient:
+    """
+    Create the HTTP client used by every scraping request.
+    """
+
+    timeout = client_config["timeout"]
+
+    return tm.scrape.ScrapeClient(
+        timeout=tuple(timeout) if isinstance(timeout, list) else timeout,
+        pool_size=client_config["pool_size"],
+        cache=cache,
+        rate_limiter=tm.scrape.HostRateLimiter(
+            client_config["requests_per_second"], client_config["burst"]
+        ),
+        max_retries=client_config["max_retries"],
+        retry_budget=tm.scrape.RetryBudget(client_config["retry_budget"]),
+        backoff_base=client_config["backoff_base"],
+        backoff_max=client_config["backoff_max"],
+        concurrency=create_concurrency_limiter(client_config["concurrency"]),
+        archive=archive,
+        circuit_breaker=create_circuit_breaker(client_config["circuit_breaker"]),
+    )
+
+
+def create_replay_client(archive_path: Path) -> tm.scrape.ScrapeClient:
+    """
+    Create a client that answers every request with archived webpages,
+    without network access, so it is neither cached nor rate limited.
+    """
+
+    archive = tm.scrape.HtmlArchive(archive_path)
+
+    return tm.scrape.ScrapeClient(transport=tm.scrape.ArchiveTransport(archive))
+
+
+def web_scrape_with_engine(
+    engine_config: ConfigurationType,
+    paths: list[str],
+    first_season: tuple[str, str],
+    last_season: tuple[str, str],
+    journal: Optional[tm.scrape.ScrapeJournal],
+    index: Optional[tm.scrape.SeasonIndex],
+    writer: Optional[tm.scrape.MatchesWriter] = None,
+    costs: Optional[tm.scrape.SeasonCosts] = None,
+):
+    """
+    Web scrape matches with the engine selected in the configuration.
+    """
+
+    mode: str = engine_config["mode"]
+
+    if mode == "sync":
+        return tm.scrape.web_scrape_from_provided_paths(
+            paths, first_season, last_season, journal, index, writer, costs
+        )
+
+    if mode == "async":
+        return tm.scrape.async_web_scrape_from_provided_paths(
+            paths,
+            first_season,
+            last_season,
+            engine_config["max_in_flight"],
+            journal,
+            index,
+            writer,
+            costs,
+        )
+
+    if mode == "pipeline":
+        parse_pool = tm.scrape.ParsePool(
+            engine_config["parse_workers"], engine_config["parse_queue_size"]
+        )
+
+        try:
+            return tm.scrape.pipeline_web_scrape_from_provided_paths(
+                paths,
+                first_season,
+                last_season,
+                engine_config["max_in_flight"],
+                parse_pool,
+                journal,
+                index,
+                writer,
+                costs,
+            )
+        finally:
+            parse_pool.close()
+
+    logging.error(f"Invalid engine mode: {mode}")
+    raise ValueError("Only valid engine modes are: ['sync', 'async', 'pipeline'].")
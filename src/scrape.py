@@ -1,30 +1,262 @@
+import argparse
+import logging
+from typing import Optional
+
 import config
 import tournament_matches as tm
 
 
-def scrape() -> None:
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Scrape tournament matches.")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="skip work recorded in the journal of an interrupted run",
+    )
+    parser.add_argument(
+        "--replay",
+        action="store_true",
+        help="extract matches again from archived webpages, without network access",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        metavar="MINUTES",
+        help="stop scraping seasons after this many minutes (most urgent first)",
+    )
+
+    # seasons may be scraped by many workers (processes or hosts) from a queue
+    queue_role = parser.add_mutually_exclusive_group()
+    queue_role.add_argument(
+        "--coordinator",
+        action="store_true",
+        help="queue the desired seasons of every tournament, without scraping them",
+    )
+    queue_role.add_argument(
+        "--worker",
+        metavar="NAME",
+        help="scrape queued seasons into this worker's shard",
+    )
+    queue_role.add_argument(
+        "--merge",
+        action="store_true",
+        help="merge the shards of all workers into one file per sport",
+    )
+    queue_role.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="scrape again only the seasons that failed in previous runs",
+    )
+
+    return parser.parse_args()
+
+
+def merge() -> None:
+    index_params = config.parser.read_json_configuration("scrape.json")["season_index"]
+
+    # in incremental mode, workers only scrape new or changed matches
+    append = index_params["enabled"] and index_params["incremental"]
+
+    tm.scrape.merge_scraped_shards(
+        config.path.SHARDS_PATH, config.path.SCRAPE_PATH, append
+    )
+
+
+def scrape(
+    resume: bool,
+    replay: bool,
+    coordinator: bool,
+    worker: Optional[str],
+    deadline_minutes: Optional[float],
+    retry_failed: bool,
+) -> None:
     params = config.parser.read_json_configuration("scrape.json")
 
+    deadline = None
+
+    if deadline_minutes is not None:
+        # seasons skipped after the deadline keep their stored matches,
+        # otherwise they would be missing from the rewritten files
+        if replay or not params["season_index"]["enabled"]:
+            logging.error("--deadline requires the season index.")
+            raise ValueError(
+                '--deadline requires "season_index" enabled (and no --replay).'
+            )
+
+        deadline = tm.scrape.Deadline(deadline_minutes * 60)
+
+    tm.scrape.set_deadline(deadline)
+
     sports = params["sports"]
 
     scrape_dir = config.path.SCRAPE_PATH
     scrape_dir.mkdir(exist_ok=True, parents=True)
 
-    paths_params = params["url_paths"]
-    paths = config.parser.get_url_paths(paths_params, sports)
-    unique_paths = sorted(set(paths))
+    if replay:
+        client = config.parser.create_replay_client(config.path.ARCHIVE_PATH)
+    else:
+        cache = config.parser.create_response_cache(
+            params["cache"], config.path.CACHE_PATH
+        )
+        archive = config.parser.create_html_archive(
+            params["archive"], config.path.ARCHIVE_PATH
+        )
+        client = config.parser.create_scrape_client(params["client"], cache, archive)
 
-    if paths_params["validate"]:
-        tm.scrape.validate_url_paths(unique_paths)
+    tm.scrape.set_client(client)
+    tm.scrape.set_parser_backend(params["parser"])
+    tm.scrape.set_partial_parsing(params["partial_parsing"])
+    tm.scrape.set_streaming(params["streaming"])
 
-    sport_to_matches = tm.scrape.web_scrape_from_provided_paths(
-        unique_paths,
-        params["seasons"]["first"],
-        params["seasons"]["last"],
-    )
+    # when replaying, every webpage is parsed again: only the queries are
+    # reused, seasons scraped through them have no archived /results/ webpage
+    queries = tm.scrape.MainSectionQueries(config.path.MAIN_QUERIES_PATH, replay)
+    dropdowns = None
+
+    if not replay:
+        dropdowns = config.parser.create_season_dropdowns(
+            params["season_dropdowns"], config.path.DROPDOWNS_PATH
+        )
 
-    tm.scrape.save_web_scraped_matches(sport_to_matches, scrape_dir)
+    tm.scrape.set_main_section_queries(queries)
+    tm.scrape.set_season_dropdowns(dropdowns)
+
+    # failed work is recorded, so it is retried by "--retry-failed"
+    dead_letters = tm.scrape.DeadLetters(config.path.DEAD_LETTERS_PATH)
+    tm.scrape.set_dead_letters(dead_letters)
+
+    unique_paths = []
+
+    # workers get their seasons from the queue, the retry pass from the
+    # dead letters
+    if worker is None and not retry_failed:
+        paths_params = params["url_paths"]
+        paths = config.parser.get_url_paths(paths_params, sports)
+        unique_paths = sorted(set(paths))
+
+        if paths_params["validate"]:
+            tm.scrape.validate_url_paths(unique_paths)
+
+    journal = None
+    index = None
+    costs = None
+
+    # replayed webpages are not downloaded, so they say nothing about costs
+    if not replay:
+        # only single-process runs keep a journal: the coordinator, workers
+        # and the retry pass must not overwrite the one of an interrupted run
+        if not (retry_failed or coordinator or worker is not None):
+            journal = tm.scrape.ScrapeJournal(config.path.JOURNAL_PATH, resume)
+
+        index = config.parser.create_season_index(
+            params["season_index"], config.path.SEASON_INDEX_PATH
+        )
+        costs = config.parser.create_season_costs(
+            params["season_costs"], config.path.SEASON_COSTS_PATH
+        )
+
+    if coordinator or worker is not None:
+        queue = config.parser.create_work_queue(
+            params["work_queue"], config.path.QUEUE_PATH
+        )
+
+        if coordinator:
+            tm.scrape.queue_season_paths(
+                queue,
+                unique_paths,
+                params["seasons"]["first"],
+                params["seasons"]["last"],
+                journal,
+                index,
+                costs,
+                config.path.SHARDS_PATH,
+            )
+        else:
+            tm.scrape.web_scrape_from_queue(
+                queue,
+                worker,
+                config.path.SHARDS_PATH,
+                params["work_queue"]["batch_size"],
+                index,
+                costs,
+            )
+
+        report = client.report() + f"\nwork queue: {queue.report()}"
+        queue.close()
+    elif retry_failed:
+        # retried seasons were missing from the files: they are appended to them
+        writer = tm.scrape.MatchesWriter(scrape_dir, append=True)
+
+        tm.scrape.web_scrape_failed_seasons(
+            params["seasons"]["first"],
+            params["seasons"]["last"],
+            dead_letters,
+            index,
+            writer,
+            costs,
+        )
+
+        writer.close()
+        report = client.report() + f"\n{writer.report()}"
+    else:
+        # in incremental mode, only new or changed matches are scraped
+        append = index is not None and index.incremental
+        writer = tm.scrape.MatchesWriter(scrape_dir, append)
+
+        config.parser.web_scrape_with_engine(
+            params["engine"],
+            unique_paths,
+            params["seasons"]["first"],
+            params["seasons"]["last"],
+            journal,
+            index,
+            writer,
+            costs,
+        )
+
+        writer.close()
+        report = client.report() + f"\n{writer.report()}"
+
+    if journal is not None:
+        journal.close()
+
+    report += f"\nmain section queries: {queries.report()}"
+    tm.scrape.set_main_section_queries(None)
+
+    if dropdowns is not None:
+        report += f"\nseason dropdowns: {dropdowns.report()}"
+        tm.scrape.set_season_dropdowns(None)
+
+    report += f"\ndead letters: {dead_letters.report()}"
+    tm.scrape.set_dead_letters(None)
+
+    if deadline is not None:
+        report += f"\ndeadline: {deadline.report()}"
+        tm.scrape.set_deadline(None)
+
+    if index is not None:
+        report += f"\nseason index: {index.report()}"
+        index.close()
+
+    if costs is not None:
+        report += f"\nseason costs: {costs.report()}"
+        costs.close()
+
+    logging.info(report)
+    print(report)
 
 
 if __name__ == "__main__":
-    scrape()
+    arguments = parse_arguments()
+
+    if arguments.merge:
+        merge()
+    else:
+        scrape(
+            arguments.resume,
+            arguments.replay,
+            arguments.coordinator,
+            arguments.worker,
+            arguments.deadline,
+            arguments.retry_failed,
+        )
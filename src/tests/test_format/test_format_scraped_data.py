@@ -281,3 +281,19 @@ def test_format_web_scraped():
         .sort_index(axis=1)
         .equals(expected.sort_index(axis=1))
     )
+
+
+def test_format_web_scraped_keeps_matches_with_same_teams_and_date():
+    # a match replayed on the same day is a different match
+    test_cols = {
+        "id": ["season1", "season1", "season1"],
+        "teams": ["A - B", "B - A", "A - B"],
+        "result": ["1:0", "2:2", "3:0"],
+        "date": ["01.01.2020", "02.01.2020", "01.01.2020"],
+    }
+    test = pd.DataFrame(data=test_cols)
+
+    formatted = fmt.format_web_scraped(test)
+
+    assert len(formatted) == 3
+    assert sorted(formatted["result"]) == ["1:0", "2:2", "3:0"]
@@ -1,3 +1,4 @@
 from .constant_variables import MOCK_PATH
+from .local_transport import LocalTransport
 
-__all__ = ["MOCK_PATH"]
+__all__ = ["MOCK_PATH", "LocalTransport"]
@@ -0,0 +1,57 @@
+import io
+from typing import Callable, Optional
+
+import requests
+from requests.adapters import BaseAdapter
+
+# Handler returns (status code, body, headers) for a prepared request.
+# The body may also be a file-like object (read as it is streamed).
+Handler = Callable[
+    [requests.PreparedRequest], tuple[int, bytes | io.RawIOBase, dict[str, str]]
+]
+
+
+class LocalTransport(BaseAdapter):
+    """
+    Transport answering requests locally, without any network access.
+
+    Pages are either fixed (url -> body) or built by a handler.
+    Unknown urls are answered with 404.
+    """
+
+    def __init__(
+        self,
+        pages: Optional[dict[str, bytes]] = None,
+        handler: Optional[Handler] = None,
+    ) -> None:
+        super().__init__()
+        self.pages: dict[str, bytes] = pages or {}
+        self.handler: Optional[Handler] = handler
+        self.requests: list[requests.PreparedRequest] = []
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        self.requests.append(request)
+
+        if self.handler is not None:
+            status_code, body, headers = self.handler(request)
+        elif request.url in self.pages:
+            status_code, body, headers = 200, self.pages[request.url], {}
+        else:
+            status_code, body, headers = 404, b"", {}
+
+        response = requests.Response()
+        response.status_code = status_code
+        # read like a network response
+        response.raw = body if hasattr(body, "read") else io.BytesIO(body)
+        response.headers.update(headers)
+        response.url = request.url
+        response.request = request
+
+        return response
+
+    @property
+    def urls(self) -> list[str]:
+        return [request.url for request in self.requests]
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,194 @@
+import time
+
+import pytest
+
+import tournament_matches.scrape.archive as archive
+import tournament_matches.scrape.client as client
+import tournament_matches.scrape.main_queries as mq
+import tournament_matches.scrape.scrape_matches as scp
+
+from .constant_variables import MOCK_PATH
+from .local_transport import LocalTransport
+
+HOMEPAGE = "https://www.betexplorer.com"
+RESULTS_URL = f"{HOMEPAGE}/sport/country/name-2014/results/"
+
+MOCKS = sorted(MOCK_PATH.glob("*.html"))
+
+
+@pytest.fixture
+def html_archive(tmp_path):
+    html_archive = archive.HtmlArchive(tmp_path / "pages.sqlite3")
+    yield html_archive
+    html_archive.close()
+
+
+@pytest.fixture(params=[True, False], ids=["zstd", "zlib"])
+def codec(request, monkeypatch):
+    if request.param:
+        pytest.importorskip("zstandard")
+    else:
+        monkeypatch.setattr(archive, "ZSTD_AVAILABLE", False)
+
+
+def test_put_and_get(html_archive, codec):
+    webpage = (MOCK_PATH / "matches_webpage_mock.html").read_bytes()
+
+    html_archive.put(RESULTS_URL, webpage)
+
+    assert html_archive.get(RESULTS_URL) == webpage
+    assert html_archive.get(f"{HOMEPAGE}/not/archived/") is None
+    assert html_archive.stats.compressed_bytes < html_archive.stats.stored_bytes
+
+
+def test_latest_webpage_is_returned(html_archive):
+    html_archive.put(RESULTS_URL, b"first")
+    between = time.time()
+    time.sleep(0.01)
+    html_archive.put(RESULTS_URL, b"second")
+
+    assert html_archive.get(RESULTS_URL) == b"second"
+    assert html_archive.get(RESULTS_URL, fetched_before=between) == b"first"
+
+
+def test_dictionary(tmp_path):
+    pytest.importorskip("zstandard")
+
+    html_archive = archive.HtmlArchive(
+        tmp_path / "pages.sqlite3", dictionary_size=4096, dictionary_samples=64
+    )
+    webpages = {
+        f"{HOMEPAGE}/{i}/{mock.name}": mock.read_bytes().replace(b"Team", b"T%d" % i)
+        for i in range(8)
+        for mock in MOCKS
+    }
+
+    for url, webpage in webpages.items():
+        html_archive.put(url, webpage)
+
+    assert html_archive._dictionary_id is not None
+    html_archive.close()
+
+    # webpages compressed with and without the dictionary are read back
+    html_archive = archive.HtmlArchive(tmp_path / "pages.sqlite3")
+
+    assert html_archive._dictionary_id is not None
+    for url, webpage in webpages.items():
+        assert html_archive.get(url) == webpage
+
+    html_archive.close()
+
+
+def test_zlib_pages_are_read_with_zstd(html_archive, monkeypatch):
+    pytest.importorskip("zstandard")
+
+    monkeypatch.setattr(archive, "ZSTD_AVAILABLE", False)
+    html_archive.put(RESULTS_URL, b"zlib")
+    monkeypatch.setattr(archive, "ZSTD_AVAILABLE", True)
+
+    assert html_archive.get(RESULTS_URL) == b"zlib"
+
+
+def test_client_archives_downloaded_webpages(html_archive):
+    webpage = (MOCK_PATH / "matches_webpage_mock.html").read_bytes()
+    scrape_client = client.ScrapeClient(
+        transport=LocalTransport({RESULTS_URL: webpage}), archive=html_archive
+    )
+
+    scrape_client.get(RESULTS_URL)
+    scrape_client.get(f"{HOMEPAGE}/not/found/")
+
+    assert html_archive.stats.stored == 1
+    assert html_archive.get(RESULTS_URL) == webpage
+    assert "archive: stored: 1" in scrape_client.report()
+
+
+def test_client_archives_cached_webpages_once(tmp_path, html_archive):
+    webpage = (MOCK_PATH / "matches_webpage_mock.html").read_bytes()
+    response_cache = client.ResponseCache(
+        tmp_path / "cache", max_bytes=10**7, current_ttl=0
+    )
+    response_cache.put(RESULTS_URL, webpage)
+
+    # cached by a run without archive
+    scrape_client = client.ScrapeClient(
+        transport=LocalTransport(), cache=response_cache, archive=html_archive
+    )
+
+    assert scrape_client.get(RESULTS_URL).from_cache
+    assert scrape_client.get(RESULTS_URL).from_cache
+
+    assert html_archive.stats.stored == 1
+    assert html_archive.has(RESULTS_URL)
+    assert html_archive.get(RESULTS_URL) == webpage
+    response_cache.close()
+
+
+def test_replay(html_archive):
+    webpage = (MOCK_PATH / "matches_webpage_mock.html").read_bytes()
+    html_archive.put(RESULTS_URL, webpage)
+
+    transport = archive.ArchiveTransport(html_archive)
+    replay_client = client.ScrapeClient(transport=transport)
+
+    assert replay_client.get(RESULTS_URL).content == webpage
+    assert replay_client.get(f"{HOMEPAGE}/not/archived/").status_code == 404
+
+    previous = client._client
+    client._client = replay_client
+
+    try:
+        matches = scp._web_scrape_all_results_in_two_steps(
+            "/sport/country/name-2014/", RESULTS_URL, None
+        )
+    finally:
+        client._client = previous
+
+    assert matches == scp._scrape_main_section_webpage(webpage)
+
+
+def test_replay_uses_recorded_main_section_queries(tmp_path, html_archive):
+    query_webpage = (MOCK_PATH / "main_query_mock.html").read_bytes()
+    matches_webpage = (MOCK_PATH / "matches_webpage_mock.html").read_bytes()
+    query = "?stage=main&month=all"
+    pages = {}
+
+    for year in [2012, 2013, 2014]:
+        results_url = f"{HOMEPAGE}/basketball/usa/nba-{year}/results/"
+        pages[results_url] = query_webpage
+        pages[results_url + query] = query_webpage + matches_webpage
+
+    previous = client._client
+
+    try:
+        # live run: the main section of 2014 is requested with a guessed query
+        client._client = client.ScrapeClient(
+            transport=LocalTransport(pages), archive=html_archive
+        )
+        mq.set_main_section_queries(mq.MainSectionQueries(tmp_path / "q.sqlite3"))
+
+        live = [
+            scp.web_scrape_matches_information(f"/basketball/usa/nba-{year}/")
+            for year in [2012, 2013, 2014]
+        ]
+
+        assert mq.get_main_section_queries().stats.guessed == 1
+        assert not html_archive.has(f"{HOMEPAGE}/basketball/usa/nba-2014/results/")
+
+        client._client = client.ScrapeClient(
+            transport=archive.ArchiveTransport(html_archive)
+        )
+        mq.set_main_section_queries(
+            mq.MainSectionQueries(tmp_path / "q.sqlite3", read_only=True)
+        )
+
+        replayed = [
+            scp.web_scrape_matches_information(f"/basketball/usa/nba-{year}/")
+            for year in [2012, 2013, 2014]
+        ]
+    finally:
+        client._client = previous
+        mq.set_main_section_queries(None)
+
+    assert replayed == live
+    assert len(live[2]) == 4
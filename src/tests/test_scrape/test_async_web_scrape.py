@@ -0,0 +1,70 @@
+import pytest
+
+import tournament_matches.scrape.async_web_scrape as async_scrape
+import tournament_matches.scrape.web_scrape as scrape
+
+SEASONS = {
+    "/soccer/country/name/": ["/soccer/country/name-2014/", "/soccer/country/n-2013/"],
+    "/basketball/country/name/": ["/basketball/country/name-2014/"],
+    "/soccer/country/other/": ["/soccer/country/other-2014/"],
+    "/soccer/country/empty/": [],
+}
+
+MATCHES = {
+    "/soccer/country/name-2014/": [["A - B", "1:0", "01.01.2014", 1.5, 3.0, 2.0]],
+    "/soccer/country/n-2013/": [
+        ["B - A", "2:2", "01.01.2013", 1.2, 3.1, 2.2],
+        ["A - C", "0:1", "02.01.2013", 1.1, 3.2, 2.3],
+    ],
+    "/basketball/country/name-2014/": [["D - E", "90:80", "01.01.2014", 1.9, 1.8]],
+    "/soccer/country/other-2014/": [],
+}
+
+
+@pytest.fixture
+def fake_network(monkeypatch):
+    def fake_seasons(path, first_season, last_season):
+        return SEASONS[path]
+
+    def fake_matches(season_path):
+        return MATCHES[season_path]
+
+    monkeypatch.setattr(scrape, "get_path_to_desired_seasons", fake_seasons)
+    monkeypatch.setattr(scrape, "web_scrape_matches_information", fake_matches)
+
+
+def test_web_scrape_season_matches(fake_network):
+    id, matches = scrape._web_scrape_season_matches("name", "/soccer/country/n-2013/")
+
+    assert id == "name@/soccer/country/n-2013/"
+    assert matches == MATCHES["/soccer/country/n-2013/"]
+
+    _, matches = scrape._web_scrape_season_matches(
+        "other", "/soccer/country/other-2014/"
+    )
+    assert matches == []
+
+
+def test_same_output_as_sync(fake_network):
+    paths = list(SEASONS)
+
+    expected = scrape.web_scrape_from_provided_paths(paths, "first", "last")
+
+    for max_in_flight in [1, 2, 8]:
+        output = async_scrape.async_web_scrape_from_provided_paths(
+            paths, "first", "last", max_in_flight
+        )
+
+        assert output.keys() == expected.keys()
+        for sport, df_matches in expected.items():
+            assert output[sport].equals(df_matches)
+
+
+def test_group_seasons_by_sport():
+    paths = ["/soccer/a/b/", "/handball/a/b/"]
+    tournaments = [
+        [("b@/soccer/a/b-1/", None), ("b@/soccer/a/b-2/", [])],
+        [("id", None)],
+    ]
+
+    assert async_scrape._group_seasons_by_sport(paths, tournaments) == {}
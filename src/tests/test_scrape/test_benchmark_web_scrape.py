@@ -0,0 +1,9 @@
+import benchmark_web_scrape as bench
+
+
+def test_benchmark_runs(capsys):
+    # the benchmark asserts every season's matches were accumulated
+    bench.benchmark([5, 12])
+
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split()[0] for line in lines[2:]] == ["5", "12"]
@@ -0,0 +1,169 @@
+import pytest
+
+import tournament_matches.scrape.cache as cache
+import tournament_matches.scrape.client as client
+
+from .local_transport import LocalTransport
+
+HOMEPAGE = "https://www.betexplorer.com"
+CURRENT_YEAR = int(cache.CURRENT_YEAR)
+
+HISTORIC_URL = f"{HOMEPAGE}/soccer/england/premier-league-2012-2013/results/"
+CURRENT_URL = f"{HOMEPAGE}/soccer/england/premier-league-{CURRENT_YEAR}/results/"
+
+
+@pytest.fixture
+def response_cache(tmp_path):
+    response_cache = cache.ResponseCache(tmp_path, max_bytes=100, current_ttl=3600)
+    yield response_cache
+    response_cache.close()
+
+
+def test_last_season_year():
+    assert cache._get_last_season_year(HISTORIC_URL) == 2013
+    assert cache._get_last_season_year(f"{HOMEPAGE}/soccer/c/name-2012/") == 2012
+    assert cache._get_last_season_year(f"{HOMEPAGE}/soccer/c/name/") is None
+    assert cache._get_last_season_year(f"{HOMEPAGE}/") is None
+
+
+def test_is_historic_season_url():
+    assert cache.is_historic_season_url(HISTORIC_URL)
+    assert cache.is_historic_season_url(HISTORIC_URL + "?stage=main&month=all")
+    assert not cache.is_historic_season_url(CURRENT_URL)
+    assert not cache.is_historic_season_url(
+        f"{HOMEPAGE}/soccer/c/name-{CURRENT_YEAR - 1}-{CURRENT_YEAR}/"
+    )
+    assert not cache.is_historic_season_url(f"{HOMEPAGE}/soccer/england/name/")
+
+
+def test_ttl(response_cache):
+    assert response_cache.ttl_for(HISTORIC_URL) is None
+    assert response_cache.ttl_for(CURRENT_URL) == 3600
+
+
+def test_hit_and_miss(response_cache):
+    assert response_cache.get(HISTORIC_URL) is None
+
+    response_cache.put(HISTORIC_URL, b"historic")
+    assert response_cache.get(HISTORIC_URL) == b"historic"
+
+    assert response_cache.stats.hits == 1
+    assert response_cache.stats.misses == 1
+    assert response_cache.stats.stores == 1
+    assert "hits: 1" in response_cache.stats.report()
+
+
+def test_expired(tmp_path):
+    response_cache = cache.ResponseCache(tmp_path, max_bytes=100, current_ttl=0)
+
+    response_cache.put(CURRENT_URL, b"current")
+    response_cache.put(HISTORIC_URL, b"historic")
+
+    assert response_cache.get(CURRENT_URL) is None
+    assert response_cache.get(HISTORIC_URL) == b"historic"
+    assert response_cache.stats.expired == 1
+
+    response_cache.close()
+
+
+def test_least_recently_used_eviction(response_cache):
+    urls = [f"{HISTORIC_URL}?page={i}" for i in range(3)]
+
+    response_cache.put(urls[0], b"0" * 40)
+    response_cache.put(urls[1], b"1" * 40)
+    response_cache.get(urls[0])  # urls[1] is now the least recently used
+    response_cache.put(urls[2], b"2" * 40)
+
+    assert response_cache.total_bytes == 80
+    assert response_cache.stats.evictions == 1
+    assert response_cache.get(urls[1]) is None
+    assert response_cache.get(urls[0]) is not None
+    assert response_cache.get(urls[2]) is not None
+
+
+def test_replace_entry(response_cache):
+    response_cache.put(HISTORIC_URL, b"0" * 50)
+    response_cache.put(HISTORIC_URL, b"1" * 60)
+
+    assert response_cache.total_bytes == 60
+    assert response_cache.get(HISTORIC_URL) == b"1" * 60
+
+
+def test_persistent(tmp_path):
+    response_cache = cache.ResponseCache(tmp_path, max_bytes=100, current_ttl=3600)
+    response_cache.put(HISTORIC_URL, b"historic")
+    response_cache.close()
+
+    response_cache = cache.ResponseCache(tmp_path, max_bytes=100, current_ttl=3600)
+    assert response_cache.total_bytes == len(b"historic")
+    assert response_cache.get(HISTORIC_URL) == b"historic"
+    response_cache.close()
+
+
+def test_client_uses_cache(response_cache):
+    transport = LocalTransport({HISTORIC_URL: b"historic"})
+    scrape_client = client.ScrapeClient(transport=transport, cache=response_cache)
+
+    first = scrape_client.get(HISTORIC_URL)
+    second = scrape_client.get(HISTORIC_URL)
+    not_found = scrape_client.get(CURRENT_URL)
+
+    assert not first.from_cache
+    assert second.from_cache
+    assert first.content == second.content == b"historic"
+    assert not_found.status_code == 404
+
+    # only successful responses are cached
+    assert scrape_client.get(CURRENT_URL).status_code == 404
+    assert transport.urls == [HISTORIC_URL, CURRENT_URL, CURRENT_URL]
+
+
+def test_stale_and_refresh(tmp_path):
+    response_cache = cache.ResponseCache(tmp_path, max_bytes=100, current_ttl=0)
+
+    response_cache.put(CURRENT_URL, b"current", etag='"v1"', last_modified="date")
+    assert response_cache.get(CURRENT_URL) is None
+
+    stale = response_cache.get_stale(CURRENT_URL)
+    assert stale == cache.CachedResponse(b"current", '"v1"', "date")
+    assert response_cache.get_stale(HISTORIC_URL) is None
+
+    response_cache.current_ttl = 3600
+    response_cache.refresh(CURRENT_URL)
+    assert response_cache.get(CURRENT_URL) == b"current"
+    assert response_cache.stats.revalidated == 1
+
+    response_cache.close()
+
+
+def test_parsed_values(response_cache):
+    response_cache.put(HISTORIC_URL, b"historic")
+    assert response_cache.get_parsed(HISTORIC_URL, "parser") is None
+
+    response_cache.put_parsed(HISTORIC_URL, "parser", ["query", [["A - B", 1.5]]])
+    assert response_cache.get_parsed(HISTORIC_URL, "parser") == [
+        "query",
+        [["A - B", 1.5]],
+    ]
+    assert response_cache.get_parsed(HISTORIC_URL, "other parser") is None
+    assert response_cache.stats.parses_skipped == 1
+
+    # a new webpage invalidates values extracted from the previous one
+    response_cache.put(HISTORIC_URL, b"new historic")
+    assert response_cache.get_parsed(HISTORIC_URL, "parser") is None
+
+
+def test_old_cache_gets_validator_columns(tmp_path):
+    connection = cache.sqlite3.connect(tmp_path / cache.CACHE_FILE_NAME)
+    connection.execute(
+        "CREATE TABLE responses (url TEXT PRIMARY KEY, content BLOB NOT NULL,"
+        " size INTEGER NOT NULL, stored_at REAL NOT NULL, expires_at REAL,"
+        " last_access REAL NOT NULL)"
+    )
+    connection.commit()
+    connection.close()
+
+    response_cache = cache.ResponseCache(tmp_path, max_bytes=100, current_ttl=0)
+    response_cache.put(CURRENT_URL, b"current", etag='"v1"')
+    assert response_cache.get_stale(CURRENT_URL).etag == '"v1"'
+    response_cache.close()
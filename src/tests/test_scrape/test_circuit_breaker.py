@@ -0,0 +1,238 @@
+import threading
+import time
+
+import pytest
+import requests
+
+import tournament_matches.scrape.circuit_breaker as cb
+import tournament_matches.scrape.client as client
+
+from .local_transport import LocalTransport
+
+URL = "https://www.betexplorer.com/"
+
+
+def _breaker(**kwargs):
+    parameters = dict(
+        host="www.betexplorer.com",
+        failure_rate=0.5,
+        window=4,
+        min_requests=4,
+        cooldown=0.05,
+        probes=1,
+    )
+    parameters.update(kwargs)
+
+    return cb.CircuitBreaker(**parameters)
+
+
+def _finish(breaker, failed):
+    breaker.release(breaker.acquire(), failed)
+
+
+def _states(breaker):
+    return [(transition.state, transition.reason) for transition in breaker.history]
+
+
+def test_opens_on_failure_rate():
+    breaker = _breaker()
+
+    for failed in [True, False, True]:
+        _finish(breaker, failed)
+
+    # not enough requests yet
+    assert breaker.state == cb.CircuitState.CLOSED
+
+    _finish(breaker, False)
+
+    assert breaker.state == cb.CircuitState.OPEN
+    assert _states(breaker) == [(cb.CircuitState.OPEN, "failure rate 50%")]
+
+
+def test_healthy_circuit_stays_closed():
+    breaker = _breaker()
+
+    for _ in range(3):
+        for failed in [True, False, False, False]:
+            _finish(breaker, failed)
+
+    assert breaker.state == cb.CircuitState.CLOSED
+    assert breaker.held == 0
+
+
+def test_open_circuit_holds_requests_for_cooldown():
+    breaker = _breaker(min_requests=1, cooldown=0.2)
+    _finish(breaker, True)
+
+    start = time.monotonic()
+    permit = breaker.acquire()
+
+    assert time.monotonic() - start >= 0.15
+    assert breaker.state == cb.CircuitState.HALF_OPEN
+    assert permit is not None  # probe
+    assert breaker.held == 1
+
+
+def test_successful_probes_close_circuit():
+    breaker = _breaker(min_requests=1, probes=2)
+    _finish(breaker, True)
+
+    first, second = breaker.acquire(), breaker.acquire()
+    breaker.release(first, False)
+
+    assert breaker.state == cb.CircuitState.HALF_OPEN
+
+    breaker.release(second, False)
+
+    assert breaker.state == cb.CircuitState.CLOSED
+    assert [state for state, _ in _states(breaker)] == [
+        cb.CircuitState.OPEN,
+        cb.CircuitState.HALF_OPEN,
+        cb.CircuitState.CLOSED,
+    ]
+
+
+def test_failed_probe_opens_circuit_again():
+    breaker = _breaker(min_requests=1, probes=2)
+    _finish(breaker, True)
+
+    first, second = breaker.acquire(), breaker.acquire()
+    breaker.release(first, True)
+
+    assert breaker.state == cb.CircuitState.OPEN
+    assert _states(breaker)[-1] == (cb.CircuitState.OPEN, "probe failed")
+
+    # a probe of the previous half-open period changes nothing
+    breaker.release(second, False)
+    breaker.release(breaker.acquire(), False)
+    breaker.release(breaker.acquire(), False)
+
+    assert breaker.state == cb.CircuitState.CLOSED
+
+
+def test_half_open_circuit_only_sends_probes():
+    breaker = _breaker(min_requests=1)
+    _finish(breaker, True)
+
+    probe = breaker.acquire()
+    acquired = threading.Event()
+
+    def request():
+        permit = breaker.acquire()
+        acquired.set()
+        breaker.release(permit, False)
+
+    thread = threading.Thread(target=request)
+    thread.start()
+
+    assert not acquired.wait(0.1)
+
+    breaker.release(probe, False)
+    thread.join(1)
+
+    assert acquired.is_set()
+    assert breaker.state == cb.CircuitState.CLOSED
+
+
+def test_request_classifies_exceptions():
+    breaker = _breaker(min_requests=1)
+
+    with pytest.raises(requests.ConnectionError):
+        with breaker.request():
+            raise requests.ConnectionError()
+
+    assert breaker.state == cb.CircuitState.OPEN
+
+
+def test_circuits_are_per_host():
+    breakers = cb.HostCircuitBreaker(
+        failure_rate=0.5, window=4, min_requests=1, cooldown=60
+    )
+
+    with breakers.request(URL) as observation:
+        observation.status_code = 503
+
+    assert breakers.get_breaker(URL).state == cb.CircuitState.OPEN
+    assert breakers.get_breaker("https://other.com/").state == cb.CircuitState.CLOSED
+    assert "www.betexplorer.com open" in breakers.report()
+    assert "failure rate 100%" in breakers.report()
+
+
+def test_client_holds_requests_while_host_fails():
+    statuses = [503, 503, 503, 200, 200]
+
+    def handler(request):
+        return statuses.pop(0), b"", {}
+
+    breakers = cb.HostCircuitBreaker(
+        failure_rate=0.5, window=4, min_requests=2, cooldown=0.1
+    )
+    scrape_client = client.ScrapeClient(
+        transport=LocalTransport(handler=handler),
+        backoff_base=0,
+        circuit_breaker=breakers,
+    )
+
+    start = time.monotonic()
+
+    # opened after two failures: the probe fails and it waits again
+    assert scrape_client.get(URL).status_code == 200
+    assert time.monotonic() - start >= 0.2
+    assert breakers.get_breaker(URL).state == cb.CircuitState.CLOSED
+    assert breakers.get_breaker(URL).held == 2
+    assert "requests held: 2" in scrape_client.report()
+
+
+def test_held_retries_do_not_spend_budget_or_back_off():
+    statuses = [503, 503, 200]
+
+    def handler(request):
+        return statuses.pop(0), b"", {}
+
+    breakers = cb.HostCircuitBreaker(
+        failure_rate=0.5, window=4, min_requests=1, cooldown=0.05
+    )
+    scrape_client = client.ScrapeClient(
+        transport=LocalTransport(handler=handler),
+        retry_budget=client.RetryBudget(0),
+        backoff_base=10,
+        circuit_breaker=breakers,
+    )
+
+    start = time.monotonic()
+
+    # the circuit opens on the first failure: retries wait for its cool-down
+    assert scrape_client.get(URL).status_code == 200
+    assert time.monotonic() - start < 1
+    assert scrape_client.retry_budget.spent == 0
+    assert scrape_client.retries == 2
+    assert breakers.get_breaker(URL).held == 2  # both retries were held
+
+
+def test_sent_retries_spend_budget():
+    statuses = [503, 200, 503]
+
+    def handler(request):
+        return statuses.pop(0), b"", {}
+
+    # the circuit stays closed: retries are sent right away
+    breakers = cb.HostCircuitBreaker(
+        failure_rate=0.5, window=4, min_requests=4, cooldown=0.05
+    )
+    scrape_client = client.ScrapeClient(
+        transport=LocalTransport(handler=handler),
+        retry_budget=client.RetryBudget(1),
+        backoff_base=0,
+        circuit_breaker=breakers,
+    )
+
+    assert scrape_client.get(URL).status_code == 200
+    assert not breakers.is_holding(URL)
+    assert scrape_client.retry_budget.spent == 1
+    assert scrape_client.retries == 1
+
+    # the budget is exhausted: the next failure is not retried
+    with pytest.raises(requests.HTTPError):
+        scrape_client.get(URL + "other/")
+
+    assert scrape_client.retries == 1
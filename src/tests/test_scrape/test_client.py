@@ -0,0 +1,380 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+import tournament_matches.scrape.client as client
+import tournament_matches.scrape.scrape_matches as scp
+import tournament_matches.scrape.season_years as sea
+import tournament_matches.scrape.validate_paths as val
+import tournament_matches.scrape.web_scrape as scrape
+import tournament_matches.scrape.webpage_regions as regions
+from tournament_matches.scrape.journal import ScrapeJournal
+
+from .constant_variables import MOCK_PATH
+from .local_transport import LocalTransport
+
+HOMEPAGE = "https://www.betexplorer.com"
+
+
+@pytest.fixture
+def local_client():
+    pages = {
+        f"{HOMEPAGE}/sport/country/name/": (
+            MOCK_PATH / "two_year_dropdown_mock.html"
+        ).read_bytes(),
+        f"{HOMEPAGE}/sport/country/name-2014/results/": (
+            MOCK_PATH / "matches_webpage_mock.html"
+        ).read_bytes(),
+    }
+    transport = LocalTransport(pages)
+    scrape_client = client.ScrapeClient(transport=transport)
+
+    previous = client._client
+    client.set_client(scrape_client)
+    yield scrape_client, transport
+    client._client = previous
+
+
+def test_accept_encoding():
+    assert "gzip" in client.ACCEPT_ENCODING
+
+    scrape_client = client.ScrapeClient(transport=LocalTransport())
+    assert scrape_client.session.headers["Accept-Encoding"] == client.ACCEPT_ENCODING
+
+
+def test_get(local_client):
+    scrape_client, transport = local_client
+
+    page = scrape_client.get(f"{HOMEPAGE}/sport/country/name/")
+    assert page.status_code == 200
+    assert b"DropDown Two Year Mock" in page.content
+
+    page = scrape_client.get(f"{HOMEPAGE}/not/found/")
+    assert page.status_code == 404
+
+    assert transport.urls == [
+        f"{HOMEPAGE}/sport/country/name/",
+        f"{HOMEPAGE}/not/found/",
+    ]
+
+
+def test_downloaded_bytes_are_counted_per_thread(local_client):
+    scrape_client, _ = local_client
+    url = f"{HOMEPAGE}/sport/country/name/"
+
+    size = len(scrape_client.get(url).content)
+    scrape_client.get(f"{HOMEPAGE}/not/found/", keep=True)
+    scrape_client.get(f"{HOMEPAGE}/not/found/")  # kept page: not downloaded again
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        assert executor.submit(scrape_client.downloaded_bytes).result() == 0
+
+    not_found = len(scrape_client.get(f"{HOMEPAGE}/not/found/").content)
+    assert scrape_client.downloaded_bytes() == size + 2 * not_found
+
+
+def test_default_client_is_shared():
+    previous = client._client
+    client._client = None
+
+    assert client.get_client() is client.get_client()
+
+    client._client = previous
+
+
+def test_scrape_package_uses_client(local_client):
+    _, transport = local_client
+
+    assert not val._is_path_invalid("/sport/country/name/")
+    assert val._is_path_invalid("/sport/country/invalid/")
+
+    seasons = sea.get_path_to_desired_seasons(
+        "/sport/country/name/", ["2013", "2013-2014"], ["2014", "2014-2015"]
+    )
+    assert seasons == [
+        "/sport/country/name1-2014-2015/",
+        "/sport/country/name1-2013-2014/",
+    ]
+
+    matches = scp.web_scrape_matches_information("/sport/country/name-2014/")
+    assert len(matches) == 4
+
+    # the validated default page is reused to find the seasons
+    assert len(transport.requests) == 3
+
+
+def test_kept_page_is_reused_once(local_client):
+    scrape_client, transport = local_client
+    url = f"{HOMEPAGE}/sport/country/name/"
+
+    kept = scrape_client.get(url, keep=True)
+    assert scrape_client.get(url) is kept
+    assert scrape_client.get(url) is not kept
+
+    assert len(transport.requests) == 2
+    assert scrape_client.reused == 1
+
+
+def test_kept_page_is_released_when_seasons_are_journaled(local_client, tmp_path):
+    scrape_client, transport = local_client
+    path = "/sport/country/name/"
+    seasons = ["/sport/country/name-2014/"]
+
+    journal = ScrapeJournal(tmp_path / "journal.jsonl", resume=False)
+    journal.record_season_paths(path, ["2014"], ["2014"], seasons)
+
+    val.validate_url_paths([path])
+    assert scrape._get_path_to_desired_seasons(path, ["2014"], ["2014"], journal) == (
+        seasons
+    )
+    journal.close()
+
+    # the validated page was not parsed, but it is not kept for the whole run
+    assert scrape_client._kept == {}
+    assert scrape_client.reused == 0
+
+
+def test_concurrent_requests_are_coalesced():
+    release = threading.Event()
+
+    def handler(request):
+        release.wait(5)
+        return 200, b"webpage", {}
+
+    transport = LocalTransport(handler=handler)
+    scrape_client = client.ScrapeClient(transport=transport)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(scrape_client.get, HOMEPAGE) for _ in range(4)]
+
+        while scrape_client.coalesced < 3:
+            time.sleep(0.01)
+        release.set()
+
+    assert all(future.result().content == b"webpage" for future in futures)
+    assert len(transport.requests) == 1
+    assert "requests coalesced: 3" in scrape_client.report()
+
+    # once the request is done, the url can be requested again
+    scrape_client.get(HOMEPAGE)
+    assert len(transport.requests) == 2
+
+
+def test_coalesced_requests_share_failures():
+    release = threading.Event()
+
+    def handler(request):
+        release.wait(5)
+        raise requests.ConnectionError("down")
+
+    scrape_client = client.ScrapeClient(
+        transport=LocalTransport(handler=handler), max_retries=0
+    )
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(scrape_client.get, HOMEPAGE) for _ in range(2)]
+
+        while scrape_client.coalesced < 1:
+            time.sleep(0.01)
+        release.set()
+
+    for future in futures:
+        with pytest.raises(requests.ConnectionError):
+            future.result()
+
+
+@pytest.fixture
+def revalidating_client(tmp_path):
+    def handler(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return 304, b"", {}
+
+        return 200, b"webpage", {"ETag": '"v1"', "Last-Modified": "date"}
+
+    transport = LocalTransport(handler=handler)
+    response_cache = client.ResponseCache(tmp_path, max_bytes=1000, current_ttl=0)
+    scrape_client = client.ScrapeClient(transport=transport, cache=response_cache)
+
+    yield scrape_client, transport
+    scrape_client.close()
+
+
+def test_conditional_request(revalidating_client):
+    scrape_client, transport = revalidating_client
+    url = f"{HOMEPAGE}/sport/country/name/"
+
+    first = scrape_client.get(url)
+    second = scrape_client.get(url)
+
+    assert not first.from_cache
+    assert second.from_cache
+    assert second.status_code == 200
+    assert second.content == b"webpage"
+
+    assert "If-None-Match" not in transport.requests[0].headers
+    assert transport.requests[1].headers["If-None-Match"] == '"v1"'
+    assert transport.requests[1].headers["If-Modified-Since"] == "date"
+
+
+def test_not_modified_skips_parsing(revalidating_client):
+    scrape_client, _ = revalidating_client
+    url = f"{HOMEPAGE}/sport/country/name/"
+    parsed_webpages = []
+
+    def parser(webpage):
+        parsed_webpages.append(webpage)
+        return ["value", len(webpage)]
+
+    assert scrape_client.parse(url, parser) == ["value", 7]
+    assert scrape_client.parse(url, parser) == ["value", 7]
+    assert parsed_webpages == [b"webpage"]
+
+
+def test_parsing_settings_are_not_mixed(revalidating_client):
+    scrape_client, _ = revalidating_client
+    url = f"{HOMEPAGE}/sport/country/name/"
+    parsed_webpages = []
+
+    def parser(webpage):
+        parsed_webpages.append(webpage)
+        return len(parsed_webpages)
+
+    assert scrape_client.parse(url, parser) == 1
+
+    # values extracted with partial parsing are not reused without it
+    regions.set_partial_parsing(False)
+    try:
+        assert scrape_client.parse(url, parser) == 2
+        assert scrape_client.parse(url, parser) == 2
+    finally:
+        regions.set_partial_parsing(True)
+
+    assert scrape_client.parse(url, parser) == 1
+
+
+def test_parser_version_covers_extraction_modules(monkeypatch):
+    version = client._get_parser_version(sea._scrape_seasons_webpage)
+    client._get_parser_version.cache_clear()
+
+    real_getsource = client.inspect.getsource
+
+    def getsource(module):
+        source = real_getsource(module)
+        return source + "# changed" if module is regions else source
+
+    monkeypatch.setattr(client.inspect, "getsource", getsource)
+
+    try:
+        assert client._get_parser_version(sea._scrape_seasons_webpage) != version
+    finally:
+        client._get_parser_version.cache_clear()
+
+
+def test_parse_without_cache(local_client):
+    scrape_client, _ = local_client
+    url = f"{HOMEPAGE}/sport/country/name/"
+
+    assert scrape_client.parse(url, len) == scrape_client.parse(url, len) > 0
+
+
+def _failing_handler(failures):
+    def handler(request):
+        if failures:
+            failure = failures.pop()
+
+            if isinstance(failure, Exception):
+                raise failure
+
+            return failure, b"", {}
+
+        return 200, b"webpage", {}
+
+    return handler
+
+
+def _retrying_client(handler, **kwargs):
+    transport = LocalTransport(handler=handler)
+    scrape_client = client.ScrapeClient(
+        transport=transport, backoff_base=0, backoff_max=0, **kwargs
+    )
+    return scrape_client, transport
+
+
+def test_retry_transient_failures():
+    failures = [503, 429, requests.Timeout(), requests.ConnectionError()]
+    scrape_client, transport = _retrying_client(_failing_handler(failures))
+
+    page = scrape_client.get(f"{HOMEPAGE}/sport/country/name/")
+
+    assert page.status_code == 200
+    assert len(transport.requests) == 5
+    assert scrape_client.retries == 4
+
+
+def test_no_retry_for_not_found():
+    scrape_client, transport = _retrying_client(_failing_handler([404]))
+
+    assert scrape_client.get(f"{HOMEPAGE}/sport/").status_code == 404
+    assert len(transport.requests) == 1
+
+
+def test_max_retries():
+    failures = [503, 503, 503]
+    scrape_client, transport = _retrying_client(
+        _failing_handler(failures), max_retries=2
+    )
+
+    with pytest.raises(requests.HTTPError):
+        scrape_client.get(f"{HOMEPAGE}/sport/")
+
+    assert len(transport.requests) == 3
+
+    failures = [requests.Timeout()]
+    scrape_client, transport = _retrying_client(
+        _failing_handler(failures), max_retries=0
+    )
+
+    with pytest.raises(requests.Timeout):
+        scrape_client.get(f"{HOMEPAGE}/sport/")
+
+
+def test_retry_budget_is_shared():
+    failures = [503, 503, 503, 503]
+    scrape_client, transport = _retrying_client(
+        _failing_handler(failures), retry_budget=client.RetryBudget(1)
+    )
+
+    with pytest.raises(requests.HTTPError):
+        scrape_client.get(f"{HOMEPAGE}/sport/")
+
+    with pytest.raises(requests.HTTPError):
+        scrape_client.get(f"{HOMEPAGE}/sport/")
+
+    assert len(transport.requests) == 3
+    assert "budget left: 0" in scrape_client.report()
+
+
+def test_retry_after():
+    response = requests.Response()
+    assert client._get_retry_after(response) == 0
+
+    response.headers["Retry-After"] = "12"
+    assert client._get_retry_after(response) == 12
+
+    response.headers["Retry-After"] = "Wed, 21 Oct 2015 07:28:00 GMT"
+    assert client._get_retry_after(response) == 0
+
+
+def test_failed_request_is_not_fatal(local_client, monkeypatch):
+    scrape_client, _ = local_client
+
+    def fail(url, headers, on_chunk=None):
+        raise requests.ConnectionError()
+
+    monkeypatch.setattr(scrape_client, "_send", fail)
+
+    assert scp.web_scrape_matches_information("/sport/country/name-2014/") == []
+    assert sea.get_path_to_desired_seasons("/sport/country/name/", "", "") == []
@@ -0,0 +1,221 @@
+import io
+import threading
+import time
+
+import pytest
+import requests
+
+import tournament_matches.scrape.client as client
+import tournament_matches.scrape.concurrency as cc
+
+from .local_transport import LocalTransport
+
+
+def _limiter(**kwargs):
+    parameters = dict(
+        initial=4,
+        minimum=1,
+        maximum=8,
+        latency_target=1.0,
+        max_error_rate=0.1,
+        window=10,
+    )
+    parameters.update(kwargs)
+
+    return cc.AdaptiveConcurrencyLimiter(**parameters)
+
+
+def test_classify_outcome():
+    assert cc.classify_outcome(200, None) == cc.Outcome.OK
+    assert cc.classify_outcome(404, None) == cc.Outcome.OK
+    assert cc.classify_outcome(500, None) == cc.Outcome.ERROR
+    assert cc.classify_outcome(429, None) == cc.Outcome.CONGESTION
+    assert cc.classify_outcome(503, None) == cc.Outcome.CONGESTION
+    assert cc.classify_outcome(None, requests.ReadTimeout()) == cc.Outcome.CONGESTION
+    assert cc.classify_outcome(None, requests.ConnectionError()) == cc.Outcome.ERROR
+
+
+def test_percentile():
+    assert cc._get_percentile([float(i) for i in range(1, 101)], 0.95) == 95
+    assert cc._get_percentile([3.0], 0.95) == 3
+
+
+def test_additive_increase():
+    limiter = _limiter()
+
+    for _ in range(30):
+        limiter.acquire()
+        limiter.release(0.1, cc.Outcome.OK)
+
+    assert limiter.limit == 7
+    assert [change.limit for change in limiter.history] == [4, 5, 6, 7]
+
+
+def test_maximum():
+    limiter = _limiter(maximum=5)
+
+    for _ in range(100):
+        limiter.acquire()
+        limiter.release(0.1, cc.Outcome.OK)
+
+    assert limiter.limit == 5
+
+
+def test_multiplicative_decrease_on_congestion():
+    limiter = _limiter(initial=8)
+
+    # requests that failed together only decrease the limit once
+    for _ in range(4):
+        limiter.acquire()
+    for _ in range(4):
+        limiter.release(0.1, cc.Outcome.CONGESTION)
+
+    assert limiter.limit == 4
+    assert limiter.history[-1].reason == "throttled"
+
+
+def test_decrease_on_latency_and_errors():
+    limiter = _limiter(initial=8)
+
+    for _ in range(10):
+        limiter.acquire()
+        limiter.release(5.0, cc.Outcome.OK)
+
+    assert limiter.limit == 4
+    assert "latency" in limiter.history[-1].reason
+
+    for i in range(10):
+        limiter.acquire()
+        limiter.release(0.1, cc.Outcome.ERROR if i < 2 else cc.Outcome.OK)
+
+    assert limiter.limit == 2
+    assert "error rate" in limiter.history[-1].reason
+
+
+def test_limit_is_respected():
+    limiter = _limiter(initial=2, maximum=2)
+    in_flight = []
+    peak = []
+    lock = threading.Lock()
+
+    def request():
+        with limiter.slot() as observation:
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.pop()
+            observation.status_code = 200
+
+    threads = [threading.Thread(target=request) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) <= 2
+
+
+def test_slot_classifies_exceptions():
+    limiter = _limiter(initial=8)
+
+    with pytest.raises(requests.ReadTimeout):
+        with limiter.slot():
+            raise requests.ReadTimeout()
+
+    assert limiter.limit == 4
+    assert limiter._in_flight == 0
+
+
+def test_client_reports_to_limiter():
+    statuses = [503, 200]
+
+    def handler(request):
+        return statuses.pop(0), b"", {}
+
+    limiter = _limiter(initial=8)
+    scrape_client = client.ScrapeClient(
+        transport=LocalTransport(handler=handler),
+        backoff_base=0,
+        concurrency=limiter,
+    )
+
+    assert scrape_client.get("https://www.betexplorer.com/").status_code == 200
+    assert limiter.limit == 4
+    assert "limit 4" in scrape_client.report()
+
+
+class _StreamedBody(io.RawIOBase):
+    # body whose chunks arrive slowly, or whose connection is lost halfway
+    def __init__(self, chunks, delay=0.0):
+        self.chunks = list(chunks)
+        self.delay = delay
+
+    def read(self, size=-1):
+        time.sleep(self.delay)
+
+        if not self.chunks:
+            return b""
+
+        chunk = self.chunks.pop(0)
+
+        if isinstance(chunk, Exception):
+            raise chunk
+
+        return chunk
+
+
+def _streaming_client(limiter, chunks, delay=0.0):
+    def handler(request):
+        return 200, _StreamedBody(chunks, delay), {}
+
+    transport = LocalTransport(handler=handler)
+    scrape_client = client.ScrapeClient(
+        transport=transport, backoff_base=0, concurrency=limiter
+    )
+
+    return scrape_client, transport
+
+
+def test_streamed_body_is_read_in_slot():
+    limiter = _limiter(window=100)
+    scrape_client, _ = _streaming_client(limiter, [b"web", b"page"], delay=0.05)
+    in_flight = []
+
+    page = scrape_client.get(
+        "https://www.betexplorer.com/",
+        on_chunk=lambda chunk: in_flight.append(limiter._in_flight),
+    )
+
+    assert page.content == b"webpage"
+    assert in_flight == [1, 1]
+    assert limiter._in_flight == 0
+    assert limiter._latencies[0] >= 0.15  # body download included
+
+
+def test_connection_lost_while_streaming_is_reported():
+    limiter = _limiter(window=100)
+    scrape_client, transport = _streaming_client(
+        limiter, [b"web", requests.ConnectionError("lost")]
+    )
+
+    with pytest.raises(requests.ConnectionError):
+        scrape_client.get("https://www.betexplorer.com/", on_chunk=lambda chunk: None)
+
+    assert limiter._errors == 1
+    assert len(transport.requests) == 1  # part of the body was handed over
+
+
+def test_parser_failure_while_streaming_is_not_reported():
+    limiter = _limiter(window=100)
+    scrape_client, _ = _streaming_client(limiter, [b"web", b"page"])
+
+    def on_chunk(chunk):
+        raise ValueError("unexpected webpage")
+
+    with pytest.raises(ValueError):
+        scrape_client.get("https://www.betexplorer.com/", on_chunk=on_chunk)
+
+    assert limiter._errors == 0
+    assert limiter._in_flight == 0
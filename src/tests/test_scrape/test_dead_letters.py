@@ -0,0 +1,197 @@
+import pytest
+import requests
+
+import tournament_matches.scrape.dead_letters as dl
+import tournament_matches.scrape.retry_web_scrape as retry_scrape
+import tournament_matches.scrape.scrape_matches as scp
+import tournament_matches.scrape.web_scrape as scrape
+from tournament_matches.scrape.utils import empty_on_request_failure
+
+SEASONS = {
+    "/soccer/country/name/": ["/soccer/country/name-2014/", "/soccer/country/n-2013/"],
+    "/soccer/country/other/": ["/soccer/country/other-2014/"],
+}
+MATCHES = {
+    "/soccer/country/name-2014/": [["A - B", "1:0", "01.01.2014", 1.5, 3.0, 2.0]],
+    "/soccer/country/n-2013/": [["B - A", "2:2", "01.01.2013", 1.2, 3.1, 2.2]],
+    "/soccer/country/other-2014/": [["C - D", "0:1", "02.01.2014", 1.1, 3.2, 2.3]],
+}
+
+
+@pytest.fixture
+def dead_letters(tmp_path):
+    dead_letters = dl.DeadLetters(tmp_path / "dead_letters.jsonl")
+    dl.set_dead_letters(dead_letters)
+    yield dead_letters
+    dl.set_dead_letters(None)
+
+
+@pytest.fixture
+def flaky_network(monkeypatch):
+    # paths in "down" fail, like webpages that could not be downloaded
+    down = set()
+
+    def scraper(answers):
+        @empty_on_request_failure
+        def fake(path, *_):
+            if path in down:
+                raise requests.ConnectionError(f"{path} is down")
+
+            return answers[path]
+
+        return fake
+
+    monkeypatch.setattr(scrape, "get_path_to_desired_seasons", scraper(SEASONS))
+    monkeypatch.setattr(scrape, "web_scrape_matches_information", scraper(MATCHES))
+
+    return down
+
+
+def test_record_and_resolve(tmp_path, dead_letters):
+    dead_letters.record("/a/", "function", requests.Timeout("slow"))
+    dead_letters.record("/a/", "function", requests.ConnectionError("down"))
+    dead_letters.record("/b/", "function", ValueError("unexpected webpage"))
+    dead_letters.resolve("/b/")
+    dead_letters.resolve("/never/failed/")
+
+    assert dead_letters.get_failures("/a/") == 2
+    assert dead_letters.get_failures("/b/") == 0
+    assert dead_letters.stats.resolved == 1
+    dead_letters.set_tournament("/a/", "/sport/country/name/")
+    dead_letters.set_tournament("/never/failed/", "/sport/country/name/")
+    dead_letters.close()
+
+    # a run killed while recording leaves an incomplete line
+    with open(tmp_path / "dead_letters.jsonl", "a") as dead_letters_file:
+        dead_letters_file.write('{"path": "/c/", "func')
+
+    dead_letters = dl.DeadLetters(tmp_path / "dead_letters.jsonl")
+
+    (dead_letter,) = dead_letters.pending()
+    assert dead_letter.path == "/a/"
+    assert dead_letter.error == "ConnectionError"
+    assert dead_letter.failures == 2
+    assert dead_letter.tournament == "/sport/country/name/"
+    assert dead_letters.report().startswith("1 pending (ConnectionError: 1)")
+    dead_letters.close()
+
+
+def test_failed_requests_are_recorded(dead_letters, monkeypatch):
+    def fail(*_):
+        raise requests.ConnectionError("down")
+
+    monkeypatch.setattr(scp, "_web_scrape_all_results", fail)
+
+    assert scp.web_scrape_matches_information("/sport/country/name-2014/") == []
+
+    (dead_letter,) = dead_letters.pending()
+    assert dead_letter.path == "/sport/country/name-2014/"
+    assert dead_letter.function == "web_scrape_matches_information"
+    assert dead_letter.error == "ConnectionError"
+
+
+def test_parse_failures_are_recorded_only_with_dead_letters(monkeypatch):
+    def fail(*_):
+        raise AttributeError("'NoneType' object has no attribute 'find'")
+
+    monkeypatch.setattr(scp, "_web_scrape_all_results", fail)
+
+    with pytest.raises(AttributeError):
+        scp.web_scrape_matches_information("/sport/country/name-2014/")
+
+
+def test_parse_failures_do_not_stop_the_run(dead_letters, monkeypatch):
+    def fail(*_):
+        raise AttributeError("'NoneType' object has no attribute 'find'")
+
+    monkeypatch.setattr(scp, "_web_scrape_all_results", fail)
+
+    assert scp.web_scrape_matches_information("/sport/country/name-2014/") == []
+    assert dead_letters.pending()[0].error == "AttributeError"
+
+
+def test_retry_only_failed_work(dead_letters, flaky_network):
+    paths = list(SEASONS)
+    flaky_network.update({"/soccer/country/n-2013/", "/soccer/country/other/"})
+
+    output = scrape.web_scrape_from_provided_paths(paths, "first", "last")
+
+    assert list(output["soccer"].index) == ["name@/soccer/country/name-2014/"]
+    assert {letter.path for letter in dead_letters.pending()} == {
+        "/soccer/country/n-2013/",
+        "/soccer/country/other/",
+    }
+
+    # still down: nothing is lost
+    flaky_network.discard("/soccer/country/other/")
+    output = retry_scrape.web_scrape_failed_seasons("first", "last", dead_letters)
+
+    assert list(output["soccer"].index) == ["other@/soccer/country/other-2014/"]
+    (dead_letter,) = dead_letters.pending()
+    assert dead_letter.path == "/soccer/country/n-2013/"
+    assert dead_letter.failures == 2
+
+    flaky_network.clear()
+    output = retry_scrape.web_scrape_failed_seasons("first", "last", dead_letters)
+
+    assert list(output["soccer"].index) == ["name@/soccer/country/n-2013/"]
+    assert dead_letters.pending() == []
+    assert retry_scrape.web_scrape_failed_seasons("first", "last", dead_letters) == {}
+
+
+def test_success_in_a_normal_run_resolves_failures(dead_letters, flaky_network):
+    paths = list(SEASONS)
+    flaky_network.update({"/soccer/country/n-2013/", "/soccer/country/other/"})
+
+    scrape.web_scrape_from_provided_paths(paths, "first", "last")
+    assert len(dead_letters.pending()) == 2
+
+    flaky_network.clear()
+    output = scrape.web_scrape_from_provided_paths(paths, "first", "last")
+
+    assert len(output["soccer"]) == len(MATCHES)
+    assert dead_letters.pending() == []
+
+    # nothing is scraped (or appended) again
+    assert retry_scrape.web_scrape_failed_seasons("first", "last", dead_letters) == {}
+
+
+def test_retry_requests_only_failed_tournaments(
+    dead_letters, flaky_network, monkeypatch
+):
+    paths = list(SEASONS)
+    flaky_network.update({"/soccer/country/n-2013/", "/soccer/country/other/"})
+
+    scrape.web_scrape_from_provided_paths(paths, "first", "last")
+
+    assert {letter.path: letter.tournament for letter in dead_letters.pending()} == {
+        "/soccer/country/n-2013/": "/soccer/country/name/",
+        "/soccer/country/other/": "/soccer/country/other/",
+    }
+
+    requested = []
+
+    def record_request(func):
+        def wrapper(path, *args):
+            requested.append(path)
+            return func(path, *args)
+
+        return wrapper
+
+    for function in ["get_path_to_desired_seasons", "web_scrape_matches_information"]:
+        monkeypatch.setattr(scrape, function, record_request(getattr(scrape, function)))
+
+    flaky_network.clear()
+    output = retry_scrape.web_scrape_failed_seasons("first", "last", dead_letters)
+
+    # seasons of "name" are not found again
+    assert sorted(requested) == [
+        "/soccer/country/n-2013/",
+        "/soccer/country/other-2014/",
+        "/soccer/country/other/",
+    ]
+    assert sorted(output["soccer"].index) == [
+        "name@/soccer/country/n-2013/",
+        "other@/soccer/country/other-2014/",
+    ]
+    assert dead_letters.pending() == []
@@ -0,0 +1,61 @@
+import pytest
+
+import tournament_matches.scrape.html_backend as backend
+import tournament_matches.scrape.scrape_matches as scp
+import tournament_matches.scrape.season_years as sea
+
+from .constant_variables import MOCK_PATH
+
+pytest.importorskip("lxml")
+
+WEBPAGE_PARSERS = [
+    scp._scrape_results_webpage,
+    scp._scrape_main_section_webpage,
+    scp._scrape_guessed_main_section_webpage,
+    sea._scrape_seasons_webpage,
+]
+MOCKS = sorted(MOCK_PATH.glob("*.html"))
+
+
+def parse_with(backend_name, parser, webpage):
+    previous = backend.get_parser_backend()
+    backend.set_parser_backend(backend_name)
+
+    try:
+        return parser(webpage)
+    finally:
+        backend.set_parser_backend(previous)
+
+
+@pytest.mark.parametrize("mock", MOCKS, ids=lambda mock: mock.name)
+@pytest.mark.parametrize("parser", WEBPAGE_PARSERS, ids=lambda parser: parser.__name__)
+def test_lxml_is_equivalent_to_bs4(parser, mock):
+    webpage = mock.read_bytes()
+
+    assert parse_with("lxml", parser, webpage) == parse_with("bs4", parser, webpage)
+
+
+@pytest.mark.parametrize("parser", WEBPAGE_PARSERS, ids=lambda parser: parser.__name__)
+def test_empty_webpage(parser):
+    assert parse_with("lxml", parser, b"") == parse_with("bs4", parser, b"")
+
+
+def test_matches_are_extracted():
+    webpage = (MOCK_PATH / "matches_webpage_mock.html").read_bytes()
+    matches = parse_with("lxml", scp._scrape_main_section_webpage, webpage)
+
+    assert len(matches) == 4
+    assert matches[0][:2] == ["TeamA - TeamB", "0:1"]
+    assert matches[0][3:] == [10.12, 6.97, 1.17]
+
+
+def test_invalid_backend():
+    with pytest.raises(ValueError):
+        backend.set_parser_backend("regex")
+
+
+def test_lxml_not_installed(monkeypatch):
+    monkeypatch.setattr(backend, "LXML_AVAILABLE", False)
+
+    with pytest.raises(ValueError):
+        backend.set_parser_backend("lxml")
@@ -0,0 +1,103 @@
+import pytest
+
+import tournament_matches.scrape.journal as jou
+import tournament_matches.scrape.web_scrape as scrape
+
+FIRST = ("2013", "2013-2014")
+LAST = ("2014", "2014-2015")
+
+SEASONS = {"/soccer/country/name/": ["/soccer/country/name-2014/"]}
+MATCHES = {"/soccer/country/name-2014/": [["A - B", "1:0", "01.01.2014", 1.5, 3, 2]]}
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+    return tmp_path / "state" / "journal.jsonl"
+
+
+def test_record_and_resume(journal_path):
+    journal = jou.ScrapeJournal(journal_path, resume=False)
+
+    journal.record_season_paths("/s/c/n/", FIRST, LAST, ["/s/c/n-2014/"])
+    journal.record_matches("/s/c/n-2014/", [["A - B", "1:0", "01.01.2014", 1.5]])
+    journal.record_matches("/s/c/ignored-2014/", None)
+    journal.close()
+
+    journal = jou.ScrapeJournal(journal_path, resume=True)
+
+    assert journal.get_season_paths("/s/c/n/", FIRST, LAST) == ["/s/c/n-2014/"]
+    assert journal.get_season_paths("/s/c/n/", FIRST, ("2015", "2015-2016")) is None
+    assert journal.get_matches("/s/c/n-2014/") == [["A - B", "1:0", "01.01.2014", 1.5]]
+    assert journal.has_matches("/s/c/ignored-2014/")
+    assert journal.get_matches("/s/c/ignored-2014/") is None
+    journal.close()
+
+
+def test_empty_results_are_not_recorded(journal_path):
+    journal = jou.ScrapeJournal(journal_path, resume=False)
+
+    journal.record_season_paths("/s/c/n/", FIRST, LAST, [])
+    journal.record_matches("/s/c/n-2014/", [])
+    journal.close()
+
+    assert journal_path.read_text() == ""
+
+
+def test_without_resume_journal_starts_empty(journal_path):
+    journal = jou.ScrapeJournal(journal_path, resume=False)
+    journal.record_matches("/s/c/n-2014/", [["A - B"]])
+    journal.close()
+
+    journal = jou.ScrapeJournal(journal_path, resume=False)
+    assert not journal.has_matches("/s/c/n-2014/")
+    journal.close()
+
+
+def test_interrupted_write(journal_path):
+    journal = jou.ScrapeJournal(journal_path, resume=False)
+    journal.record_matches("/s/c/n-2014/", [["A - B"]])
+    journal.close()
+
+    with open(journal_path, "a") as journal_file:
+        journal_file.write('{"season_path": "/s/c/n-2015/", "mat')
+
+    journal = jou.ScrapeJournal(journal_path, resume=True)
+    assert journal.has_matches("/s/c/n-2014/")
+    assert not journal.has_matches("/s/c/n-2015/")
+
+    journal.record_matches("/s/c/n-2016/", [["C - D"]])
+    journal.close()
+
+    journal = jou.ScrapeJournal(journal_path, resume=True)
+    assert journal.get_matches("/s/c/n-2016/") == [["C - D"]]
+    journal.close()
+
+
+def test_resumed_scrape_skips_recorded_work(journal_path, monkeypatch):
+    calls = []
+
+    def fake_seasons(path, first_season, last_season):
+        calls.append(path)
+        return SEASONS[path]
+
+    def fake_matches(season_path):
+        calls.append(season_path)
+        return MATCHES[season_path]
+
+    monkeypatch.setattr(scrape, "get_path_to_desired_seasons", fake_seasons)
+    monkeypatch.setattr(scrape, "web_scrape_matches_information", fake_matches)
+
+    journal = jou.ScrapeJournal(journal_path, resume=False)
+    expected = scrape.web_scrape_from_provided_paths(
+        list(SEASONS), FIRST, LAST, journal
+    )
+    journal.close()
+
+    assert len(calls) == 2
+
+    journal = jou.ScrapeJournal(journal_path, resume=True)
+    resumed = scrape.web_scrape_from_provided_paths(list(SEASONS), FIRST, LAST, journal)
+    journal.close()
+
+    assert len(calls) == 2
+    assert resumed["soccer"].equals(expected["soccer"])
@@ -0,0 +1,145 @@
+import pytest
+
+import tournament_matches.scrape.client as client
+import tournament_matches.scrape.main_queries as mq
+import tournament_matches.scrape.scrape_matches as scp
+
+from .constant_variables import MOCK_PATH
+from .local_transport import LocalTransport
+
+HOMEPAGE = "https://www.betexplorer.com"
+QUERY = "?stage=main&month=all"
+
+QUERY_WEBPAGE = (MOCK_PATH / "main_query_mock.html").read_bytes()
+MATCHES_WEBPAGE = (MOCK_PATH / "matches_webpage_mock.html").read_bytes()
+# main sections also have the submenu with the main section query
+MAIN_SECTION_WEBPAGE = QUERY_WEBPAGE + MATCHES_WEBPAGE
+
+
+def results_url(season_path):
+    return f"{HOMEPAGE}{season_path}results/"
+
+
+@pytest.fixture
+def queries(tmp_path):
+    queries = mq.MainSectionQueries(tmp_path / "queries.sqlite3")
+    yield queries
+    queries.close()
+
+
+@pytest.fixture
+def scrape_with_queries(queries):
+    pages = {}
+    for year in [2012, 2013, 2014]:
+        url = results_url(f"/basketball/usa/nba-{year}/")
+        pages[url] = QUERY_WEBPAGE
+        pages[url + QUERY] = MAIN_SECTION_WEBPAGE
+
+    transport = LocalTransport(pages)
+
+    previous_client = client._client
+    client.set_client(client.ScrapeClient(transport=transport))
+    mq.set_main_section_queries(queries)
+
+    yield queries, transport
+
+    mq._queries = None
+    client._client = previous_client
+
+
+def test_tournament_path():
+    assert mq.get_tournament_path("/soccer/c/premier-league-2012-2013/") == (
+        "/soccer/c/premier-league/"
+    )
+    assert mq.get_tournament_path("/basketball/usa/nba-2012/") == "/basketball/usa/nba/"
+
+
+def test_get_and_record(queries):
+    assert queries.get("/basketball/usa/nba-2012/") is None
+
+    queries.record("/basketball/usa/nba-2012/", QUERY)
+    queries.record("/soccer/c/name-2012/", "")
+
+    assert queries.get("/basketball/usa/nba-2012/") == QUERY
+    assert queries.get("/soccer/c/name-2012/") == ""
+
+
+def test_guess(queries):
+    queries.record("/basketball/usa/nba-2012/", QUERY)
+    assert queries.guess("/basketball/usa/nba-2014/") is None
+
+    queries.record("/basketball/usa/nba-2013/", QUERY)
+    assert queries.guess("/basketball/usa/nba-2014/") == QUERY
+    assert queries.guess("/basketball/usa/other-2014/") is None
+
+    queries.record("/basketball/usa/nba-2011/", "?stage=other")
+    assert queries.guess("/basketball/usa/nba-2014/") is None
+
+
+def test_no_main_section_is_never_guessed(queries):
+    queries.record("/soccer/c/name-2012/", "")
+    queries.record("/soccer/c/name-2013/", "")
+
+    assert queries.guess("/soccer/c/name-2014/") is None
+
+
+def test_known_and_guessed_queries_skip_results(scrape_with_queries):
+    queries, transport = scrape_with_queries
+
+    for year in [2012, 2013]:
+        assert len(scp.web_scrape_matches_information(f"/basketball/usa/nba-{year}/"))
+    assert len(transport.requests) == 4
+
+    # known query
+    matches = scp.web_scrape_matches_information("/basketball/usa/nba-2012/")
+    assert len(matches) == 4
+    assert transport.urls[-1] == results_url("/basketball/usa/nba-2012/") + QUERY
+
+    # guessed query
+    matches = scp.web_scrape_matches_information("/basketball/usa/nba-2014/")
+    assert len(matches) == 4
+    assert transport.urls[-1] == results_url("/basketball/usa/nba-2014/") + QUERY
+
+    assert len(transport.requests) == 6
+    assert queries.stats.guessed == 1
+    assert queries.get("/basketball/usa/nba-2014/") == QUERY
+
+
+def test_wrong_guess_falls_back_to_results(scrape_with_queries):
+    queries, transport = scrape_with_queries
+
+    queries.record("/basketball/usa/nba-2010/", "?stage=old&month=all")
+    queries.record("/basketball/usa/nba-2011/", "?stage=old&month=all")
+
+    matches = scp.web_scrape_matches_information("/basketball/usa/nba-2014/")
+
+    assert len(matches) == 4
+    assert len(transport.requests) == 3
+    assert queries.stats.wrong_guesses == 1
+    assert queries.get("/basketball/usa/nba-2014/") == QUERY
+
+
+def test_wrong_guesses_are_kept(tmp_path, queries):
+    queries.record("/basketball/usa/nba-2012/", QUERY)
+    queries.record("/basketball/usa/nba-2013/", QUERY)
+    queries.record_wrong_guess("/basketball/usa/nba-2014/")
+    queries.close()
+
+    queries = mq.MainSectionQueries(tmp_path / "queries.sqlite3")
+
+    # even if the recorded seasons still share the same query
+    assert queries.guess("/basketball/usa/nba-2015/") is None
+    queries.close()
+
+
+def test_read_only_queries_are_neither_recorded_nor_guessed(tmp_path, queries):
+    queries.record("/basketball/usa/nba-2012/", QUERY)
+    queries.record("/basketball/usa/nba-2013/", QUERY)
+
+    read_only = mq.MainSectionQueries(tmp_path / "queries.sqlite3", read_only=True)
+    read_only.record("/basketball/usa/nba-2014/", QUERY)
+
+    assert read_only.get("/basketball/usa/nba-2012/") == QUERY
+    assert read_only.guess("/basketball/usa/nba-2014/") is None
+    assert read_only.get("/basketball/usa/nba-2014/") is None
+    read_only.close()
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tournament_matches.scrape.matches_builder import MatchesBuilder
+
+
+@pytest.fixture
+def matches_with_ties():
+    return [
+        ["A - B", "1:0", "01.01.2014", 1.5, 3.0, 2.0],
+        ["B - A", "2:2", "02.01.2014", 1.2, 3.1, 2.2],
+    ]
+
+
+@pytest.fixture
+def matches_without_ties():
+    return [["D - E", "90:80", "01.01.2014", 1.9, 1.8]]
+
+
+def test_build_with_ties(matches_with_ties):
+    builder = MatchesBuilder()
+    builder.add("name@/soccer/country/name-2014/", matches_with_ties)
+
+    df_matches = builder.build()
+
+    assert df_matches.index.name == "id"
+    assert list(df_matches.index) == ["name@/soccer/country/name-2014/"] * 2
+    assert list(df_matches.columns) == [
+        "teams",
+        "result",
+        "date",
+        "odds home",
+        "odds tie",
+        "odds away",
+    ]
+    assert list(df_matches["teams"]) == ["A - B", "B - A"]
+    assert list(df_matches["odds tie"]) == pytest.approx([3.0, 3.1])
+
+
+def test_build_without_ties(matches_without_ties):
+    builder = MatchesBuilder()
+    builder.add("id", matches_without_ties)
+
+    df_matches = builder.build()
+
+    assert list(df_matches.columns) == [
+        "teams",
+        "result",
+        "date",
+        "odds home",
+        "odds away",
+    ]
+    assert df_matches.iloc[0].tolist()[:3] == ["D - E", "90:80", "01.01.2014"]
+
+
+def test_odds_are_float32(matches_with_ties):
+    builder = MatchesBuilder()
+    builder.add("id", matches_with_ties)
+
+    df_matches = builder.build()
+
+    for column in ["odds home", "odds tie", "odds away"]:
+        assert df_matches[column].dtype == np.float32
+
+
+def test_seasons_keep_their_order_and_id(matches_with_ties):
+    builder = MatchesBuilder()
+    builder.add("first", matches_with_ties)
+    builder.add("empty", [])
+    builder.add("second", matches_with_ties[:1])
+
+    assert len(builder) == 3
+    assert list(builder.build().index) == ["first", "first", "second"]
+
+
+def test_same_as_data_frame_of_lists(matches_with_ties):
+    builder = MatchesBuilder()
+    builder.add("id", matches_with_ties)
+
+    expected = pd.DataFrame(
+        matches_with_ties,
+        index=pd.Index(["id", "id"], name="id"),
+        columns=["teams", "result", "date", "odds home", "odds tie", "odds away"],
+    )
+
+    pd.testing.assert_frame_equal(builder.build(), expected, check_dtype=False)
+
+
+def test_missing_odds_are_nan(matches_with_ties, matches_without_ties):
+    builder = MatchesBuilder()
+    builder.add("two odds", matches_without_ties)
+    builder.add("three odds", matches_with_ties)
+
+    df_matches = builder.build()
+
+    assert len(df_matches.columns) == 6
+    assert np.isnan(df_matches.iloc[0, -1])
+
+
+def test_build_twice(matches_with_ties):
+    builder = MatchesBuilder()
+    builder.add("first", matches_with_ties)
+    first = builder.build()
+
+    builder.add("second", matches_with_ties)
+
+    assert len(first) == 2
+    assert len(builder.build()) == 4
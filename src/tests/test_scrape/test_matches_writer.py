@@ -0,0 +1,150 @@
+import pandas as pd
+import pytest
+
+import tournament_matches.scrape.async_web_scrape as async_scrape
+import tournament_matches.scrape.web_scrape as scrape
+from tournament_matches.scrape.matches_writer import MatchesWriter
+
+from .test_async_web_scrape import MATCHES, SEASONS
+
+SOCCER = [
+    ["A - B", "1:0", "01.01.2014", 1.5, 3.0, 2.0],
+    ["B - A", "2:2", "02.01.2014", 1.2, 3.1, 2.2],
+]
+BASKETBALL = [["D - E", "90:80", "01.01.2014", 1.9, 1.8]]
+
+
+@pytest.fixture
+def fake_network(monkeypatch):
+    monkeypatch.setattr(
+        scrape, "get_path_to_desired_seasons", lambda path, *_: SEASONS[path]
+    )
+    monkeypatch.setattr(scrape, "web_scrape_matches_information", MATCHES.get)
+
+
+def read(file_path):
+    return pd.read_csv(file_path, index_col="id")
+
+
+def test_files_have_header_and_rows(tmp_path):
+    writer = MatchesWriter(tmp_path)
+    writer.write("soccer", "a@/soccer/c/a-2014/", SOCCER)
+    writer.write("basketball", "b@/basketball/c/b-2014/", BASKETBALL)
+    writer.write("soccer", "empty", [])
+    writer.write("soccer", "ignored", None)
+    writer.close()
+
+    soccer = read(tmp_path / "soccer.csv")
+    assert list(soccer.columns) == [
+        "teams",
+        "result",
+        "date",
+        "odds home",
+        "odds tie",
+        "odds away",
+    ]
+    assert list(soccer.index) == ["a@/soccer/c/a-2014/"] * 2
+    assert soccer["odds tie"].tolist() == [3.0, 3.1]
+
+    assert read(tmp_path / "basketball.csv").shape == (1, 5)
+    assert writer.written == {"soccer": 2, "basketball": 1}
+
+
+def test_partial_output_is_on_disk(tmp_path):
+    (tmp_path / "soccer.csv").write_text("previous")
+
+    writer = MatchesWriter(tmp_path)
+    writer.write("soccer", "id", SOCCER)
+
+    assert (tmp_path / "soccer.csv.partial").read_text().count("\n") == 2
+    assert (tmp_path / "soccer.csv").read_text() == "previous"
+
+    writer.close()
+
+    assert not (tmp_path / "soccer.csv.partial").exists()
+    assert not (tmp_path / "soccer.csv.tmp").exists()
+    assert read(tmp_path / "soccer.csv").shape == (2, 6)
+
+
+def test_append(tmp_path):
+    writer = MatchesWriter(tmp_path)
+    writer.write("soccer", "id", SOCCER)
+    writer.close()
+
+    writer = MatchesWriter(tmp_path, append=True)
+    writer.write("soccer", "new", SOCCER[:1])
+    writer.close()
+
+    assert list(read(tmp_path / "soccer.csv").index) == ["id", "id", "new"]
+
+
+def test_missing_odds_are_nan(tmp_path):
+    writer = MatchesWriter(tmp_path)
+    writer.write("soccer", "two odds", [["A - B", "1:0", "01.01.2014", 1.5, 2.0]])
+    writer.write("soccer", "three odds", SOCCER)
+    writer.close()
+
+    soccer = read(tmp_path / "soccer.csv")
+    assert soccer.shape == (3, 6)
+    assert soccer["odds away"].isna().tolist() == [True, False, False]
+
+
+def test_same_as_save_web_scraped_matches(tmp_path, fake_network):
+    paths = list(SEASONS)
+
+    sport_to_matches = scrape.web_scrape_from_provided_paths(paths, "first", "last")
+    scrape.save_web_scraped_matches(sport_to_matches, tmp_path / "saved")
+
+    writer = MatchesWriter(tmp_path / "written")
+    output = scrape.web_scrape_from_provided_paths(
+        paths, "first", "last", writer=writer
+    )
+    writer.close()
+
+    assert output == {}
+
+    for sport in sport_to_matches:
+        saved = read(tmp_path / "saved" / f"{sport}.csv")
+        pd.testing.assert_frame_equal(
+            read(tmp_path / "written" / f"{sport}.csv"), saved
+        )
+
+
+@pytest.mark.parametrize("max_in_flight", [1, 8])
+def test_async_writer(tmp_path, fake_network, max_in_flight):
+    writer = MatchesWriter(tmp_path)
+    async_scrape.async_web_scrape_from_provided_paths(
+        list(SEASONS), "first", "last", max_in_flight, writer=writer
+    )
+    writer.close()
+
+    soccer = read(tmp_path / "soccer.csv")
+    expected = sum(len(matches) for matches in MATCHES.values()) - 1  # basketball
+
+    assert len(soccer) == expected
+    assert sorted(soccer.index.unique()) == [
+        "name@/soccer/country/n-2013/",
+        "name@/soccer/country/name-2014/",
+    ]
+
+
+def test_appended_matches_replace_their_previous_versions(tmp_path):
+    replayed = [["A - B", "2:0", "01.01.2014", 1.5, 3.0, 2.0]]
+
+    writer = MatchesWriter(tmp_path)
+    writer.write("soccer", "id", SOCCER + replayed)
+    writer.write("soccer", "other", SOCCER[:1])
+    writer.close()
+
+    # full scrapes keep matches with the same teams and date
+    assert len(read(tmp_path / "soccer.csv")) == 4
+
+    changed = [[*SOCCER[0][:1], "3:3", *SOCCER[0][2:]]]
+
+    writer = MatchesWriter(tmp_path, append=True)
+    writer.write("soccer", "other", changed)
+    writer.close()
+
+    soccer = read(tmp_path / "soccer.csv")
+    assert list(soccer.index) == ["id", "id", "id", "other"]
+    assert soccer["result"].tolist() == ["1:0", "2:2", "2:0", "3:3"]
@@ -0,0 +1,85 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import tournament_matches.scrape.client as client
+import tournament_matches.scrape.parse_pool as pp
+import tournament_matches.scrape.pipeline_web_scrape as pipeline
+import tournament_matches.scrape.scrape_matches as scp
+import tournament_matches.scrape.web_scrape as scrape
+
+from .constant_variables import MOCK_PATH
+from .local_transport import LocalTransport
+
+HOMEPAGE = "https://www.betexplorer.com"
+
+DROPDOWN_WEBPAGE = (MOCK_PATH / "two_year_dropdown_mock.html").read_bytes()
+MATCHES_WEBPAGE = (MOCK_PATH / "matches_webpage_mock.html").read_bytes()
+
+
+def slow_length(webpage):
+    time.sleep(0.05)
+    return len(webpage)
+
+
+@pytest.fixture
+def parse_pool():
+    parse_pool = pp.ParsePool(workers=2, queue_size=1)
+    yield parse_pool
+    parse_pool.close()
+
+
+@pytest.fixture
+def local_client():
+    def handler(request):
+        if request.url.endswith("/results/"):
+            return 200, MATCHES_WEBPAGE, {}
+
+        return 200, DROPDOWN_WEBPAGE, {}
+
+    previous = client._client
+    client.set_client(client.ScrapeClient(transport=LocalTransport(handler=handler)))
+    yield client._client
+    client._client = previous
+
+
+def test_parse_in_worker_process(parse_pool):
+    parser = scp._scrape_main_section_webpage
+
+    assert parse_pool.parse(parser, MATCHES_WEBPAGE) == parser(MATCHES_WEBPAGE)
+    assert parse_pool.stats.parsed == 1
+
+
+def test_pending_webpages_are_bounded(parse_pool):
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        lengths = list(executor.map(parse_pool.parse, [slow_length] * 8, [b"1"] * 8))
+
+    assert lengths == [1] * 8
+    assert parse_pool.stats.peak_pending == parse_pool.capacity == 3
+    assert parse_pool.stats.blocked > 0
+
+
+def test_workers_are_not_forked(parse_pool):
+    assert parse_pool._executor._mp_context.get_start_method() != "fork"
+    assert parse_pool.parse(slow_length, b"webpage") == 7
+
+
+def test_default_workers():
+    parse_pool = pp.ParsePool(workers=None, queue_size=0)
+    assert parse_pool.workers >= 1
+    parse_pool.close()
+
+
+def test_same_output_as_sync(local_client, parse_pool):
+    paths = ["/sport/country/name/"]
+    first, last = ["2013", "2013-2014"], ["2014", "2014-2015"]
+
+    expected = scrape.web_scrape_from_provided_paths(paths, first, last)
+    output = pipeline.pipeline_web_scrape_from_provided_paths(
+        paths, first, last, 2, parse_pool
+    )
+
+    assert output["sport"].equals(expected["sport"])
+    assert parse_pool.stats.parsed == 3  # dropdown and two seasons
+    assert local_client.parse_pool is None
@@ -0,0 +1,67 @@
+import threading
+import time
+
+import tournament_matches.scrape.rate_limit as rl
+
+
+def test_token_bucket_burst_is_free():
+    bucket = rl.TokenBucket(rate=1, burst=5)
+
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+
+    assert time.monotonic() - start < 0.5
+
+
+def test_token_bucket_rate():
+    bucket = rl.TokenBucket(rate=100, burst=1)
+
+    start = time.monotonic()
+    for _ in range(11):
+        bucket.acquire()
+
+    # first token is free, the other ten take 1/100 seconds each
+    assert time.monotonic() - start >= 0.09
+
+
+def test_token_bucket_threads():
+    bucket = rl.TokenBucket(rate=200, burst=1)
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(21)]
+
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert time.monotonic() - start >= 0.09
+
+
+def test_host_rate_limiter_one_bucket_per_host():
+    limiter = rl.HostRateLimiter(requests_per_second=0.01, burst=1)
+
+    start = time.monotonic()
+    limiter.acquire("https://www.betexplorer.com/soccer/")
+    limiter.acquire("https://other.com/soccer/")
+    limiter.acquire("http://localhost:8000/")
+
+    assert time.monotonic() - start < 0.5
+    assert len(limiter._buckets) == 3
+
+
+def test_retry_budget():
+    budget = rl.RetryBudget(2)
+
+    assert budget.try_spend()
+    assert budget.try_spend()
+    assert not budget.try_spend()
+    assert budget.remaining == 0
+
+
+def test_backoff_delay():
+    for attempt in range(10):
+        delay = rl.get_backoff_delay(attempt, base=1, maximum=30)
+        assert 0 <= delay <= min(30, 2**attempt)
+
+    assert rl.get_backoff_delay(5, base=0, maximum=30) == 0
@@ -0,0 +1,202 @@
+import time
+from datetime import timedelta
+
+import pytest
+import requests
+
+import tournament_matches.scrape.dead_letters as dl
+import tournament_matches.scrape.queue_web_scrape as queue_scrape
+import tournament_matches.scrape.scheduling as scheduling
+import tournament_matches.scrape.web_scrape as scrape
+from tournament_matches.scrape.season_costs import SeasonCosts
+from tournament_matches.scrape.season_index import TODAY_DATETIME, SeasonIndex
+from tournament_matches.scrape.utils import CURRENT_YEAR
+from tournament_matches.scrape.work_queue import WorkQueue
+
+OLD_DATE = (TODAY_DATETIME - timedelta(days=200)).strftime("%d.%m.%Y")
+RECENT_DATE = (TODAY_DATETIME - timedelta(days=2)).strftime("%d.%m.%Y")
+
+CLOSED = "/soccer/c/closed-2014/"
+FAILED = "/soccer/c/failed-2014/"
+RECENT = "/soccer/c/recent-2019/"  # matches played recently (postponed ones)
+CURRENT = f"/soccer/c/current-{CURRENT_YEAR}/"
+NEW = "/soccer/c/new-2014/"
+OLDEST = "/soccer/c/oldest-2014/"  # scraped the longest time ago
+OLDER = "/soccer/c/older-2014/"
+EMPTY = "/soccer/c/empty-2014/"  # scraped successfully, without matches
+
+SEASONS = {"/soccer/c/name/": [CLOSED, OLDER, NEW, OLDEST, CURRENT, RECENT, FAILED]}
+MATCHES = {
+    season_path: [[f"{season_path} - B", "1:0", OLD_DATE, 1.5, 3.0, 2.0]]
+    for season_path in SEASONS["/soccer/c/name/"]
+}
+MATCHES[RECENT] = [["A - B", "1:0", RECENT_DATE, 1.5, 3.0, 2.0]]
+MATCHES[FAILED] = []
+
+
+@pytest.fixture
+def history(tmp_path):
+    index = SeasonIndex(tmp_path / "seasons.sqlite3", 90)
+    costs = SeasonCosts(tmp_path / "costs.sqlite3")
+
+    for season_path in [OLDEST, OLDER, FAILED, RECENT, CLOSED]:
+        time.sleep(0.001)
+        costs.record(
+            season_path,
+            len(MATCHES[season_path]),
+            1000,
+            1.0,
+            failed=season_path == FAILED,
+        )
+
+    costs.record(EMPTY, 0, 1000, 1.0)
+
+    # historical seasons were scraped while the index was disabled
+    for season_path in [FAILED, RECENT, CLOSED]:
+        index.record(season_path, MATCHES[season_path])
+
+    costs.close()
+
+    # estimates are based on the history of previous runs
+    costs = SeasonCosts(tmp_path / "costs.sqlite3")
+    yield index, costs
+    index.close()
+    costs.close()
+
+
+@pytest.fixture
+def fake_network(monkeypatch):
+    scraped = []
+
+    def fake_matches(season_path):
+        scraped.append(season_path)
+        return MATCHES[season_path]
+
+    monkeypatch.setattr(
+        scrape, "get_path_to_desired_seasons", lambda path, *_: SEASONS[path]
+    )
+    monkeypatch.setattr(scrape, "web_scrape_matches_information", fake_matches)
+
+    return scraped
+
+
+@pytest.fixture
+def deadline():
+    deadline = scheduling.Deadline(0)
+    scheduling.set_deadline(deadline)
+    yield deadline
+    scheduling.set_deadline(None)
+
+
+def test_freshness(history):
+    index, costs = history
+    Freshness = scheduling.Freshness
+
+    assert scheduling.get_freshness(CLOSED, index, costs) is Freshness.CLOSED
+    assert scheduling.get_freshness(FAILED, index, costs) is Freshness.FAILED
+    assert scheduling.get_freshness(RECENT, index, costs) is Freshness.IN_PROGRESS
+    assert scheduling.get_freshness(CURRENT, index, costs) is Freshness.IN_PROGRESS
+    assert scheduling.get_freshness("/soccer/c/name/", None, None) is (
+        Freshness.IN_PROGRESS
+    )
+    assert scheduling.get_freshness(NEW, index, costs) is Freshness.NEW
+    assert scheduling.get_freshness(OLDER, index, costs) is Freshness.HISTORICAL
+    assert scheduling.get_freshness(EMPTY, index, costs) is Freshness.HISTORICAL
+    assert scheduling.get_freshness(OLDER, None, None) is Freshness.NEW
+
+
+def test_schedule_seasons(history):
+    season_paths = SEASONS["/soccer/c/name/"]
+
+    order = scheduling.schedule_seasons(season_paths, *history)
+
+    assert [season_paths[i] for i in order] == [
+        FAILED,
+        CURRENT,
+        RECENT,
+        NEW,
+        OLDEST,
+        OLDER,
+        CLOSED,
+    ]
+
+    # without history, only current seasons are known to be in progress
+    assert scheduling.schedule_seasons(season_paths) == [4, 0, 1, 2, 3, 5, 6]
+
+
+def test_failures_are_recorded(tmp_path, monkeypatch):
+    dead_letters = dl.DeadLetters(tmp_path / "dead_letters.jsonl")
+    dl.set_dead_letters(dead_letters)
+
+    def flaky_matches(season_path):
+        # like empty_on_request_failure
+        if season_path == NEW:
+            dead_letters.record(season_path, "fake", requests.ConnectionError())
+
+        return [] if season_path == NEW else MATCHES[season_path]
+
+    monkeypatch.setattr(
+        scrape, "get_path_to_desired_seasons", lambda path, *_: SEASONS[path]
+    )
+    monkeypatch.setattr(scrape, "web_scrape_matches_information", flaky_matches)
+
+    costs = SeasonCosts(tmp_path / "costs.sqlite3")
+
+    try:
+        scrape.web_scrape_from_provided_paths(
+            list(SEASONS), "first", "last", costs=costs
+        )
+    finally:
+        costs.close()
+        dl.set_dead_letters(None)
+
+    costs = SeasonCosts(tmp_path / "costs.sqlite3")
+
+    assert costs.get_history(NEW).failed
+    # no matches, but nothing failed
+    assert costs.get_history(FAILED).rows == 0
+    assert not costs.get_history(FAILED).failed
+    costs.close()
+
+
+def test_sync_engine_scrapes_by_freshness(history, fake_network):
+    index, costs = history
+    paths = list(SEASONS)
+
+    expected = scrape.web_scrape_from_provided_paths(paths, "first", "last")
+    fake_network.clear()
+
+    output = scrape.web_scrape_from_provided_paths(
+        paths, "first", "last", index=index, costs=costs
+    )
+
+    # closed season is not scraped, its stored matches are used
+    assert fake_network == [FAILED, CURRENT, RECENT, NEW, OLDEST, OLDER]
+    assert output["soccer"].equals(expected["soccer"])
+
+
+def test_stored_matches_are_used_after_the_deadline(history, fake_network, deadline):
+    index, costs = history
+
+    output = scrape.web_scrape_from_provided_paths(
+        list(SEASONS), "first", "last", index=index, costs=costs
+    )
+
+    assert fake_network == []
+    assert deadline.skipped == 6  # every season but the closed one
+
+    # seasons that were never scraped are missing
+    assert sorted(output["soccer"].index.unique()) == sorted(
+        f"name@{season_path}" for season_path in [CLOSED, RECENT]
+    )
+
+
+def test_workers_stop_at_the_deadline(tmp_path, fake_network, deadline):
+    queue = WorkQueue(tmp_path / "queue.sqlite3", lease_seconds=60)
+    queue_scrape.queue_season_paths(queue, list(SEASONS), "first", "last")
+
+    assert queue_scrape.web_scrape_from_queue(queue, "w", tmp_path / "shards") == 0
+    assert fake_network == []
+    assert queue.counts()["done"] == 0
+
+    queue.close()
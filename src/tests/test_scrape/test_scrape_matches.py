@@ -179,3 +179,15 @@ def test_web_scrape(matches_mock):
     assert result == "0:5"
     assert date == "01.07.1995"
     assert odds == [1.51, 4.76, 4.13]
+
+
+def test_scrape_results_webpage():
+    query, matches = scp._scrape_results_webpage(QUERY_PATH.read_bytes())
+    assert query == "?stage=main&month=all"
+    assert matches is None
+
+    query, matches = scp._scrape_results_webpage(MATCHES_PATH.read_bytes())
+    assert query == ""
+    assert len(matches) == 4
+
+    assert scp._scrape_main_section_webpage(MATCHES_PATH.read_bytes()) == matches
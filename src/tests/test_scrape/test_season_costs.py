@@ -0,0 +1,155 @@
+import sqlite3
+
+import pytest
+
+import tournament_matches.scrape.async_web_scrape as async_scrape
+import tournament_matches.scrape.season_costs as season_costs
+import tournament_matches.scrape.web_scrape as scrape
+
+NBA = "/basketball/usa/nba/"
+SMALL = "/basketball/country/small/"
+
+SEASONS = {
+    SMALL: [f"{SMALL[:-1]}-2014/", f"{SMALL[:-1]}-2013/"],
+    NBA: ["/basketball/usa/nba-2014-2015/", "/basketball/usa/nba-2013-2014/"],
+}
+MATCHES = {
+    season_path: [[f"{season_path} - B", "90:80", "01.01.2014", 1.9, 1.8]]
+    for season_paths in SEASONS.values()
+    for season_path in season_paths
+}
+
+
+@pytest.fixture
+def costs(tmp_path):
+    costs = season_costs.SeasonCosts(tmp_path / "costs.sqlite3")
+    yield costs
+    costs.close()
+
+
+def test_tournament_key():
+    assert season_costs.get_tournament_key("/soccer/c/name-2014/") == "/soccer/c/name"
+    assert season_costs.get_tournament_key("/soccer/c/name-2013-2014/") == (
+        "/soccer/c/name"
+    )
+    assert season_costs.get_tournament_key("/soccer/c/name/") == "/soccer/c/name"
+
+
+def test_estimates(tmp_path):
+    costs = season_costs.SeasonCosts(tmp_path / "costs.sqlite3")
+    costs.record("/basketball/usa/nba-2013-2014/", 1300, 900_000, 30.0)
+    costs.record("/basketball/usa/nba-2012-2013/", 1250, 850_000, 20.0)
+    costs.record("/soccer/c/small-2014/", 50, 40_000, 1.0)
+    costs.record("/soccer/c/cached-2014/", 100, 0, 0.001)  # from the cache
+    costs.close()
+
+    # estimates are based on the history of previous runs
+    costs = season_costs.SeasonCosts(tmp_path / "costs.sqlite3")
+
+    assert costs.estimate("/basketball/usa/nba-2013-2014/") == 30.0
+    assert costs.estimate("/basketball/usa/nba-2014-2015/") == 25.0
+    assert costs.estimate("/soccer/c/cached-2014/") == pytest.approx(100 * 51 / 2600)
+    # median of every season's cost
+    assert costs.estimate("/soccer/c/unknown-2014/") == pytest.approx(
+        (100 * 51 / 2600 + 20.0) / 2
+    )
+    assert costs.stats.known == 2
+    assert costs.stats.from_tournament == 1
+    assert costs.stats.unknown == 1
+    costs.close()
+
+
+def test_cached_scrapes_keep_download_times(tmp_path, costs):
+    costs.record(SMALL, 10, 1000, 2.0)
+    costs.record(SMALL, 12, 0, 0.01)
+    costs.close()
+
+    costs = season_costs.SeasonCosts(tmp_path / "costs.sqlite3")
+
+    assert costs.estimate(SMALL) == 2.0
+    assert costs.report().startswith("1 seasons (1 with download times)")
+
+
+def test_failed_scrapes_keep_history(tmp_path, costs):
+    costs.record(SMALL, 10, 1000, 2.0)
+    costs.record(SMALL, 0, 500, 0.5, failed=True)
+    costs.close()
+
+    costs = season_costs.SeasonCosts(tmp_path / "costs.sqlite3")
+    history = costs.get_history(SMALL)
+
+    assert history.failed
+    assert (history.rows, history.bytes, history.seconds) == (10, 1000, 2.0)
+
+    costs.record(SMALL, 0, 1000, 2.0)  # legitimately empty
+    costs.close()
+
+    costs = season_costs.SeasonCosts(tmp_path / "costs.sqlite3")
+    assert not costs.get_history(SMALL).failed
+
+
+def test_histories_without_failures_are_migrated(tmp_path):
+    connection = sqlite3.connect(tmp_path / "costs.sqlite3")
+    connection.execute(
+        "CREATE TABLE costs (season_path TEXT PRIMARY KEY, rows INTEGER NOT NULL,"
+        " bytes INTEGER NOT NULL, seconds REAL)"
+    )
+    connection.execute("INSERT INTO costs VALUES (?, 10, 1000, 2.0)", (SMALL,))
+    connection.commit()
+    connection.close()
+
+    costs = season_costs.SeasonCosts(tmp_path / "costs.sqlite3")
+
+    assert costs.get_history(SMALL) == season_costs.SeasonCost(10, 1000, 2.0, 0, False)
+    costs.close()
+
+
+def test_without_history_every_estimate_is_the_same(costs):
+    assert costs.estimate(SMALL) == costs.estimate(NBA) == season_costs.DEFAULT_COST
+
+
+@pytest.fixture
+def fake_network(monkeypatch):
+    scraped = []
+
+    def fake_matches(season_path):
+        scraped.append(season_path)
+        return MATCHES[season_path]
+
+    monkeypatch.setattr(
+        scrape, "get_path_to_desired_seasons", lambda path, *_: SEASONS[path]
+    )
+    monkeypatch.setattr(scrape, "web_scrape_matches_information", fake_matches)
+
+    return scraped
+
+
+def test_costs_are_recorded(costs, fake_network):
+    scrape.web_scrape_from_provided_paths(list(SEASONS), "first", "last", costs=costs)
+
+    assert costs.stats.recorded == len(MATCHES)
+
+
+def test_most_costly_seasons_are_scraped_first(tmp_path, fake_network):
+    # seasons to be scraped are new: they are estimated from their tournaments
+    costs = season_costs.SeasonCosts(tmp_path / "costs.sqlite3")
+    costs.record("/basketball/usa/nba-2012-2013/", 1300, 900_000, 30.0)
+    costs.record(f"{SMALL[:-1]}-2012/", 50, 40_000, 1.0)
+    costs.close()
+
+    costs = season_costs.SeasonCosts(tmp_path / "costs.sqlite3")
+    paths = list(SEASONS)
+
+    expected = scrape.web_scrape_from_provided_paths(paths, "first", "last")
+    fake_network.clear()
+
+    output = async_scrape.async_web_scrape_from_provided_paths(
+        paths, "first", "last", 1, costs=costs
+    )
+    costs.close()
+
+    # one thread: seasons are scraped from the most costly to the least costly
+    assert fake_network == [*SEASONS[NBA], *SEASONS[SMALL]]
+
+    # output keeps the order of the tournaments and their seasons
+    assert output["basketball"].equals(expected["basketball"])
@@ -0,0 +1,111 @@
+import pytest
+
+import tournament_matches.scrape.client as client
+import tournament_matches.scrape.season_dropdowns as sdd
+import tournament_matches.scrape.season_years as sea
+import tournament_matches.scrape.validate_paths as val
+
+from .constant_variables import MOCK_PATH
+from .local_transport import LocalTransport
+
+HOMEPAGE = "https://www.betexplorer.com"
+YEAR = int(sdd.CURRENT_YEAR)
+
+CURRENT_SEASONS = [
+    f"/sport/country/name-{YEAR}-{YEAR + 1}/",
+    f"/sport/country/name-{YEAR - 1}-{YEAR}/",
+    f"/sport/country/name-{YEAR - 2}-{YEAR - 1}/",
+]
+
+
+@pytest.fixture
+def dropdowns(tmp_path):
+    dropdowns = sdd.SeasonDropdowns(tmp_path / "dropdowns.sqlite3", max_age=30)
+    yield dropdowns
+    dropdowns.close()
+
+
+@pytest.fixture
+def local_scrape(dropdowns):
+    pages = {
+        f"{HOMEPAGE}/sport/country/name/": (
+            MOCK_PATH / "two_year_dropdown_mock.html"
+        ).read_bytes()
+    }
+    transport = LocalTransport(pages)
+
+    previous_client = client._client
+    client.set_client(client.ScrapeClient(transport=transport))
+    sdd.set_season_dropdowns(dropdowns)
+
+    yield dropdowns, transport
+
+    sdd._dropdowns = None
+    client._client = previous_client
+
+
+def test_has_current_season():
+    assert sdd.has_current_season(CURRENT_SEASONS)
+    assert sdd.has_current_season([f"/sport/country/name-{YEAR}/"])
+    assert not sdd.has_current_season(CURRENT_SEASONS[2:])
+    assert not sdd.has_current_season([f"/sport/country/name{YEAR}/"])
+
+
+def test_get_and_put(dropdowns):
+    assert dropdowns.get("/sport/country/name/") is None
+
+    dropdowns.put("/sport/country/name/", CURRENT_SEASONS)
+    assert dropdowns.get("/sport/country/name/") == CURRENT_SEASONS
+    assert dropdowns.stats.hits == 1
+
+
+def test_outdated_dropdowns(tmp_path, dropdowns):
+    dropdowns.put("/sport/country/old/", CURRENT_SEASONS[2:])
+    assert dropdowns.get("/sport/country/old/") is None
+
+    expired = sdd.SeasonDropdowns(tmp_path / "expired.sqlite3", max_age=-1)
+    expired.put("/sport/country/name/", CURRENT_SEASONS)
+    assert expired.get("/sport/country/name/") is None
+    assert expired.stats.refreshes == 1
+    expired.close()
+
+
+def test_seasons_are_stored_and_reused(local_scrape):
+    dropdowns, transport = local_scrape
+
+    seasons = sea.get_path_to_desired_seasons(
+        "/sport/country/name/", ["2013", "2013-2014"], ["2014", "2014-2015"]
+    )
+    assert len(seasons) == 2
+    assert len(transport.requests) == 1
+
+    # the mock's seasons are from the past, so they are always outdated
+    assert dropdowns.get("/sport/country/name/") is None
+
+    dropdowns.put("/sport/country/name/", CURRENT_SEASONS)
+
+    for first_year in [YEAR - 2, YEAR - 1]:
+        seasons = sea.get_path_to_desired_seasons(
+            "/sport/country/name/",
+            [str(first_year), f"{first_year}-{first_year + 1}"],
+            [str(YEAR), f"{YEAR}-{YEAR + 1}"],
+        )
+        assert seasons == CURRENT_SEASONS[: YEAR - first_year + 1]
+
+    assert len(transport.requests) == 1
+
+
+def test_validated_page_is_kept_only_without_stored_dropdown(local_scrape):
+    dropdowns, _ = local_scrape
+    scrape_client = client.get_client()
+
+    assert not val._is_path_invalid("/sport/country/name/")
+    assert list(scrape_client._kept) == [f"{HOMEPAGE}/sport/country/name/"]
+
+    scrape_client._kept.clear()
+    dropdowns.put("/sport/country/name/", CURRENT_SEASONS)
+
+    assert dropdowns.has("/sport/country/name/")
+    assert not val._is_path_invalid("/sport/country/name/")
+    assert scrape_client._kept == {}
+    assert dropdowns.stats.hits == 0
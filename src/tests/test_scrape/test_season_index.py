@@ -0,0 +1,129 @@
+from datetime import timedelta
+
+import pytest
+
+import tournament_matches.scrape.season_index as season_index
+import tournament_matches.scrape.web_scrape as scrape
+
+TODAY = season_index.TODAY_DATETIME
+OLD_DATE = (TODAY - timedelta(days=200)).strftime("%d.%m.%Y")
+RECENT_DATE = (TODAY - timedelta(days=2)).strftime("%d.%m.%Y")
+
+CLOSED = "/soccer/country/name-2014/"
+OPEN = "/soccer/country/name-open/"
+
+SEASONS = {"/soccer/country/name/": [CLOSED, OPEN]}
+MATCHES = {
+    CLOSED: [
+        ["A - B", "1:0", "01.01.2014", 1.5, 3.0, 2.0],
+        ["B - A", "0:0", OLD_DATE, 1.2, 3.1, 2.2],
+    ],
+    OPEN: [["C - D", "2:1", RECENT_DATE, 1.9, 3.3, 1.8]],
+}
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = season_index.SeasonIndex(tmp_path / "seasons.sqlite3", 90)
+    yield index
+    index.close()
+
+
+def test_last_match_date():
+    matches = [["A - B", "1:0", "02.01.2014"], ["B - A", "1:0", "01.03.2013"]]
+
+    assert season_index.get_last_match_date(matches).year == 2014
+    assert season_index.get_last_match_date([["A - B", "1:0", "?"]]) is None
+
+
+def test_is_closed(index):
+    assert index.is_closed(TODAY - timedelta(days=91))
+    assert not index.is_closed(TODAY - timedelta(days=89))
+    assert not index.is_closed(None)
+
+
+def test_record(index):
+    index.record(CLOSED, MATCHES[CLOSED])
+    index.record(OPEN, MATCHES[OPEN])
+    index.record("/soccer/country/empty-2014/", [])
+    index.record("/soccer/country/ignored-2014/", None)
+
+    assert index.get_closed_matches(CLOSED) == MATCHES[CLOSED]
+    assert index.get_closed_matches(OPEN) is None
+    assert index.stats.recorded == 2
+    assert index.stats.closed == 1
+    assert index.report().startswith("2 seasons (1 closed)")
+
+
+def test_index_is_persistent(tmp_path):
+    index = season_index.SeasonIndex(tmp_path / "seasons.sqlite3", 90)
+    index.record(CLOSED, MATCHES[CLOSED])
+    index.close()
+
+    index = season_index.SeasonIndex(tmp_path / "seasons.sqlite3", 90)
+    assert index.get_closed_matches(CLOSED) == MATCHES[CLOSED]
+    index.close()
+
+
+def test_only_open_seasons_are_scraped_again(index, monkeypatch):
+    scraped = []
+
+    def fake_seasons(path, first_season, last_season):
+        return SEASONS[path]
+
+    def fake_matches(season_path):
+        scraped.append(season_path)
+        return MATCHES[season_path]
+
+    monkeypatch.setattr(scrape, "get_path_to_desired_seasons", fake_seasons)
+    monkeypatch.setattr(scrape, "web_scrape_matches_information", fake_matches)
+
+    paths = list(SEASONS)
+    expected = scrape.web_scrape_from_provided_paths(paths, "first", "last")
+    scrape.web_scrape_from_provided_paths(paths, "first", "last", index=index)
+
+    scraped.clear()
+    output = scrape.web_scrape_from_provided_paths(paths, "first", "last", index=index)
+
+    assert scraped == [OPEN]
+    assert index.stats.reused == 1
+    assert output["soccer"].equals(expected["soccer"])
+
+
+def test_new_or_changed_matches():
+    stored = [["A - B", "1:0", "01.01.2014", 1.5], ["B - A", "", "02.01.2014", 1.2]]
+    scraped = [
+        ["A - B", "1:0", "01.01.2014", 1.5],
+        ["B - A", "2:2", "02.01.2014", 1.2],
+        ["A - C", "0:1", "03.01.2014", 1.1],
+    ]
+
+    assert season_index.get_new_or_changed_matches(stored, scraped) == scraped[1:]
+    assert season_index.get_new_or_changed_matches([], scraped) == scraped
+
+
+def test_incremental_mode_only_emits_new_matches(tmp_path, monkeypatch):
+    index = season_index.SeasonIndex(tmp_path / "seasons.sqlite3", 90, incremental=True)
+    new_match = ["E - F", "1:1", RECENT_DATE, 2.0, 3.0, 4.0]
+
+    def fake_seasons(path, first_season, last_season):
+        return SEASONS[path]
+
+    def fake_matches(season_path):
+        return MATCHES[season_path]
+
+    monkeypatch.setattr(scrape, "get_path_to_desired_seasons", fake_seasons)
+    monkeypatch.setattr(scrape, "web_scrape_matches_information", fake_matches)
+
+    paths = list(SEASONS)
+    first = scrape.web_scrape_from_provided_paths(paths, "first", "last", index=index)
+    assert len(first["soccer"]) == 3
+
+    assert scrape.web_scrape_from_provided_paths(paths, "f", "l", index=index) == {}
+
+    monkeypatch.setitem(MATCHES, OPEN, MATCHES[OPEN] + [new_match])
+    delta = scrape.web_scrape_from_provided_paths(paths, "first", "last", index=index)
+
+    assert delta["soccer"]["teams"].to_list() == ["E - F"]
+    assert index.stats.new_matches == 4
+    index.close()
@@ -0,0 +1,128 @@
+import pytest
+
+import tournament_matches.scrape.client as client
+import tournament_matches.scrape.html_backend as backend
+import tournament_matches.scrape.scrape_matches as scp
+import tournament_matches.scrape.stream_parser as stream
+
+from .constant_variables import MOCK_PATH
+from .local_transport import LocalTransport
+
+pytest.importorskip("lxml")
+
+HOMEPAGE = "https://www.betexplorer.com"
+
+# (webpage parser, its streaming version)
+PARSERS = [
+    (scp._scrape_results_webpage, scp._ResultsStreamParser),
+    (scp._scrape_main_section_webpage, scp._MainSectionStreamParser),
+    (
+        scp._scrape_guessed_main_section_webpage,
+        scp._GuessedMainSectionStreamParser,
+    ),
+]
+MOCKS = sorted(MOCK_PATH.glob("*.html"))
+
+
+def parse_with_bs4(parser, webpage):
+    previous = backend.get_parser_backend()
+    backend.set_parser_backend("bs4")
+
+    try:
+        return parser(webpage)
+    finally:
+        backend.set_parser_backend(previous)
+
+
+def stream_parse(stream_parser_class, webpage, chunk_size):
+    stream_parser = stream_parser_class()
+
+    for start in range(0, len(webpage), chunk_size):
+        stream_parser.feed(webpage[start : start + chunk_size])
+
+    return stream_parser.finish()
+
+
+@pytest.fixture
+def streaming():
+    previous = stream.is_streaming_enabled()
+    stream.set_streaming(True)
+    yield
+    stream.set_streaming(previous)
+
+
+@pytest.mark.parametrize("chunk_size", [7, 1024, 1 << 20])
+@pytest.mark.parametrize("mock", MOCKS, ids=lambda mock: mock.name)
+@pytest.mark.parametrize("parsers", PARSERS, ids=lambda parsers: parsers[0].__name__)
+def test_stream_is_equivalent_to_bs4(parsers, mock, chunk_size):
+    parser, stream_parser_class = parsers
+    webpage = mock.read_bytes()
+
+    assert stream_parse(stream_parser_class, webpage, chunk_size) == parse_with_bs4(
+        parser, webpage
+    )
+
+
+@pytest.mark.parametrize("parsers", PARSERS, ids=lambda parsers: parsers[0].__name__)
+def test_empty_webpage(parsers):
+    parser, stream_parser_class = parsers
+
+    assert stream_parse(stream_parser_class, b"", 7) == parse_with_bs4(parser, b"")
+
+
+def test_rows_are_extracted_as_they_arrive():
+    webpage = (MOCK_PATH / "matches_webpage_mock.html").read_bytes()
+    first_row_end = webpage.index(b"</tr>", webpage.index(b"<span>TeamA</span>")) + 5
+
+    stream_parser = stream.WebpageStreamParser()
+    stream_parser.feed(webpage[:first_row_end])
+    stream_parser.feed(b"<tr>")  # lxml only reports "tr" ends on the next tag
+
+    assert stream_parser.raw_rows[0][0][0] == "TeamA - TeamB"
+
+
+def test_scraped_rows_are_freed():
+    webpage = (MOCK_PATH / "matches_webpage_mock.html").read_bytes()
+
+    stream_parser = stream.WebpageStreamParser()
+    stream_parser.feed(webpage)
+
+    table = stream_parser._match_table
+    assert table is None or not list(table.iter("tr"))
+
+
+def test_streaming_requires_lxml(monkeypatch):
+    monkeypatch.setattr(stream, "LXML_AVAILABLE", False)
+
+    with pytest.raises(ValueError):
+        stream.set_streaming(True)
+
+
+def test_client_streams_chunks(streaming):
+    url = f"{HOMEPAGE}/sport/country/name-2014/results/"
+    webpage = (MOCK_PATH / "matches_webpage_mock.html").read_bytes()
+
+    scrape_client = client.ScrapeClient(transport=LocalTransport({url: webpage}))
+
+    chunks = []
+    page = scrape_client.get(url, on_chunk=chunks.append)
+
+    assert page.streamed
+    assert b"".join(chunks) == page.content == webpage
+
+
+def test_scrape_with_streaming(streaming):
+    url = f"{HOMEPAGE}/sport/country/name-2014/results/"
+    webpage = (MOCK_PATH / "matches_webpage_mock.html").read_bytes()
+
+    previous = client._client
+    client._client = client.ScrapeClient(transport=LocalTransport({url: webpage}))
+
+    try:
+        matches = scp._web_scrape_all_results_in_two_steps(
+            "/sport/country/name-2014/", url, None
+        )
+    finally:
+        client._client = previous
+
+    assert matches == scp._scrape_main_section_webpage(webpage)
@@ -0,0 +1,92 @@
+import pytest
+
+import tournament_matches.scrape.html_backend as backend
+import tournament_matches.scrape.scrape_matches as scp
+import tournament_matches.scrape.season_years as sea
+import tournament_matches.scrape.webpage_regions as regions
+
+from .constant_variables import MOCK_PATH
+
+WEBPAGE_PARSERS = [
+    scp._scrape_results_webpage,
+    scp._scrape_main_section_webpage,
+    scp._scrape_guessed_main_section_webpage,
+    sea._scrape_seasons_webpage,
+]
+MOCKS = sorted(MOCK_PATH.glob("*.html"))
+BACKENDS = ["bs4", "lxml"] if backend.LXML_AVAILABLE else ["bs4"]
+
+
+def parse_with(partial, backend_name, parser, webpage):
+    previous = backend.get_parser_backend()
+    backend.set_parser_backend(backend_name)
+    regions.set_partial_parsing(partial)
+
+    try:
+        return parser(webpage)
+    finally:
+        regions.set_partial_parsing(True)
+        backend.set_parser_backend(previous)
+
+
+@pytest.mark.parametrize("backend_name", BACKENDS)
+@pytest.mark.parametrize("mock", MOCKS, ids=lambda mock: mock.name)
+@pytest.mark.parametrize("parser", WEBPAGE_PARSERS, ids=lambda parser: parser.__name__)
+def test_partial_parsing_is_equivalent(parser, mock, backend_name):
+    webpage = mock.read_bytes()
+
+    partial = parse_with(True, backend_name, parser, webpage)
+    assert partial == parse_with(False, backend_name, parser, webpage)
+
+
+def test_results_regions():
+    webpage = (MOCK_PATH / "matches_webpage_mock.html").read_bytes()
+    document = regions.get_results_regions(webpage)
+
+    assert b"js-leagueresults-all" in document
+    assert b"<title>" not in document
+    assert document.count(b"<tr>") == webpage.count(b"<tr>")
+
+    document = regions.get_results_regions(
+        (MOCK_PATH / "main_query_mock.html").read_bytes()
+    )
+    assert b"?stage=main" in document
+
+
+def test_seasons_region():
+    webpage = (MOCK_PATH / "two_year_dropdown_mock.html").read_bytes()
+    document = regions.get_seasons_region(webpage)
+
+    assert document.count(b"<option") == webpage.count(b"<option")
+    assert regions.get_seasons_region(b"<html></html>") is None
+
+
+def test_nested_elements():
+    webpage = (
+        b'<div id="js-leagueresults-all"><div><div>a</div></div>b</div><div>c</div>'
+    )
+    document = regions.get_results_regions(webpage)
+
+    assert b"<div><div>a</div></div>b</div></body>" in document
+    assert b"c" not in document.replace(b"charset", b"")
+
+
+def test_regions_not_found():
+    assert regions.get_results_regions(b"<html><body></body></html>") is None
+
+
+def test_unclosed_region_goes_until_the_end():
+    webpage = b'<p>a</p><div id="js-leagueresults-all"><div>b</div><p>c</p>'
+    document = regions.get_results_regions(webpage)
+
+    assert b"<p>a</p>" not in document
+    assert document.endswith(b"<div>b</div><p>c</p></body></html>")
+
+
+def test_declared_encoding_is_kept():
+    webpage = (
+        b'<html><head><meta charset="windows-1252"></head>'
+        b'<div id="js-leagueresults-all"></div></html>'
+    )
+
+    assert b'<meta charset="windows-1252">' in regions.get_results_regions(webpage)
@@ -0,0 +1,244 @@
+import multiprocessing
+import sqlite3
+import time
+
+import pandas as pd
+import pytest
+
+import tournament_matches.scrape.queue_web_scrape as queue_scrape
+import tournament_matches.scrape.web_scrape as scrape
+from tournament_matches.scrape.matches_writer import MatchesWriter
+from tournament_matches.scrape.shards import ShardWriter, merge_shards
+from tournament_matches.scrape.work_queue import Task, WorkQueue
+
+from .test_async_web_scrape import MATCHES, SEASONS
+
+TASKS = [("name", "/soccer/c/name-2014/", 0.0), ("name", "/soccer/c/name-2013/", 0.0)]
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = WorkQueue(tmp_path / "queue.sqlite3", lease_seconds=60)
+    yield queue
+    queue.close()
+
+
+@pytest.fixture
+def fake_network(monkeypatch):
+    monkeypatch.setattr(
+        scrape, "get_path_to_desired_seasons", lambda path, *_: SEASONS[path]
+    )
+    monkeypatch.setattr(scrape, "web_scrape_matches_information", MATCHES.get)
+
+
+def test_put_is_idempotent(queue):
+    assert queue.put(TASKS) == 2
+    assert queue.put(TASKS) == 0
+    assert queue.counts() == {"done": 0, "leased": 0, "queued": 2}
+
+
+def test_claim_and_ack(queue):
+    queue.put(TASKS)
+
+    first = queue.claim("a")
+    second = queue.claim("b", count=5)
+
+    assert first == [Task(1, *TASKS[0][:2])]
+    assert second == [Task(2, *TASKS[1][:2])]
+    assert queue.start("a", first[0]) and queue.start("b", second[0])
+    assert queue.claim("c") == []
+
+    assert queue.ack("a", first[0])
+    assert queue.counts() == {"done": 1, "leased": 1, "queued": 0}
+
+
+def test_expired_leases_are_reclaimed(tmp_path):
+    queue = WorkQueue(tmp_path / "queue.sqlite3", lease_seconds=0.05)
+    queue.put(TASKS)
+
+    (task,) = queue.claim("dead worker")
+    time.sleep(0.1)
+
+    # the dead worker's task is handed to another worker before the next one
+    assert queue.claim("alive") == [task]
+    assert queue.stats.reclaimed == 1
+
+    # the dead worker finishing late does not hold the lease anymore
+    assert not queue.ack("dead worker", task)
+    queue.close()
+
+
+def test_queue_is_shared_by_connections(tmp_path):
+    first = WorkQueue(tmp_path / "queue.sqlite3", lease_seconds=60)
+    second = WorkQueue(tmp_path / "queue.sqlite3", lease_seconds=60)
+    first.put(TASKS)
+
+    assert second.claim("b") == [Task(1, *TASKS[0][:2])]
+    assert first.claim("a") == [Task(2, *TASKS[1][:2])]
+
+    first.close()
+    second.close()
+
+
+def test_tasks_are_claimed_by_priority(queue):
+    queue.put([("last", "/s/c/last/", 3), ("first", "/b/u/first/", 0)])
+    queue.put([("second", "/s/c/second/", 1), ("tie", "/s/c/tie/", 1)])
+
+    assert [task.name for task in queue.claim("a", count=4)] == [
+        "first",
+        "second",
+        "tie",
+        "last",
+    ]
+
+
+def test_idle_workers_steal_tasks_not_started(queue):
+    queue.put([("nba", "/b/u/nba/", 0), ("small", "/s/c/small/", 1)])
+
+    nba, small = queue.claim("busy", count=2)
+    assert queue.start("busy", nba)
+
+    # the started task stays with its worker, the other one is stolen
+    assert queue.claim("idle", count=2) == [small]
+    assert queue.start("idle", small)
+    assert not queue.start("busy", small)
+    assert queue.claim("idle") == []
+
+    assert queue.stats.stolen == 1
+    assert queue.stats.lost_to_thieves == 1
+
+
+def test_queues_without_priorities_are_upgraded(tmp_path):
+    path = tmp_path / "queue.sqlite3"
+
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            "CREATE TABLE tasks (seq INTEGER PRIMARY KEY, name TEXT NOT NULL,"
+            " season_path TEXT NOT NULL UNIQUE, worker TEXT, lease_expires REAL,"
+            " claims INTEGER NOT NULL DEFAULT 0, done INTEGER NOT NULL DEFAULT 0)"
+        )
+        connection.execute("INSERT INTO tasks (name, season_path) VALUES ('a', '/a/')")
+    connection.close()
+
+    queue = WorkQueue(path, lease_seconds=60)
+    queue.put([("b", "/b/", -1)])
+
+    assert [task.name for task in queue.claim("w", count=2)] == ["b", "a"]
+    queue.close()
+
+
+def _claim_all(path, worker, claimed):
+    queue = WorkQueue(path, lease_seconds=60)
+
+    while tasks := queue.claim(worker, count=3):
+        claimed.extend([task.seq for task in tasks if queue.start(worker, task)])
+
+    queue.close()
+
+
+def test_tasks_are_claimed_once_by_processes(tmp_path):
+    path = tmp_path / "queue.sqlite3"
+    queue = WorkQueue(path, lease_seconds=60)
+    queue.put((f"name{i}", f"/soccer/c/name-{i}/", -i % 7) for i in range(200))
+
+    with multiprocessing.Manager() as manager:
+        claimed = manager.list()
+        workers = [
+            multiprocessing.Process(target=_claim_all, args=(path, f"w{i}", claimed))
+            for i in range(4)
+        ]
+
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        assert sorted(claimed) == list(range(1, 201))
+
+    queue.close()
+
+
+def test_merge_shards_in_queue_order(tmp_path):
+    writer_a = ShardWriter(tmp_path / "a.jsonl")
+    writer_b = ShardWriter(tmp_path / "b.jsonl")
+
+    writer_a.write(3, "soccer", "third", [["C", "0:0", "03.01.2014", 1.0, 2.0]])
+    writer_b.write(2, "soccer", "second", [["B", "0:0", "02.01.2014", 1.0, 2.0]])
+    writer_a.write(1, "soccer", "first", [["A", "0:0", "01.01.2014", 1.0, 2.0]])
+    writer_b.write(3, "soccer", "third", [["C", "0:0", "03.01.2014", 1.0, 2.0]])
+    writer_a.close()
+    writer_b.close()
+
+    # a worker killed while writing leaves an incomplete line
+    with open(tmp_path / "b.jsonl", "a") as shard_file:
+        shard_file.write('{"seq": 4, "spo')
+
+    writer = MatchesWriter(tmp_path / "merged")
+    merged = merge_shards([tmp_path / "a.jsonl", tmp_path / "b.jsonl"], writer)
+    writer.close()
+
+    assert merged == 3
+    soccer = pd.read_csv(tmp_path / "merged" / "soccer.csv", index_col="id")
+    assert list(soccer.index) == ["first", "second", "third"]
+
+
+def test_workers_and_merge_match_sync(tmp_path, queue, fake_network):
+    paths = list(SEASONS)
+
+    scrape.save_web_scraped_matches(
+        scrape.web_scrape_from_provided_paths(paths, "first", "last"),
+        tmp_path / "sync",
+    )
+
+    assert queue_scrape.queue_season_paths(queue, paths, "first", "last") == 4
+
+    # seasons are split between workers
+    queue_scrape.web_scrape_from_queue(queue, "a", tmp_path / "shards")
+    queue.put([("late", "/soccer/country/n-2013/", 0.0)])  # already queued: ignored
+    assert queue_scrape.web_scrape_from_queue(queue, "b", tmp_path / "shards") == 0
+
+    assert queue_scrape.merge_scraped_shards(tmp_path / "shards", tmp_path / "merged")
+
+    for sport in ["soccer", "basketball"]:
+        pd.testing.assert_frame_equal(
+            pd.read_csv(tmp_path / "merged" / f"{sport}.csv"),
+            pd.read_csv(tmp_path / "sync" / f"{sport}.csv"),
+        )
+
+
+def test_coordinator_starts_a_new_run(tmp_path, queue, fake_network):
+    paths = list(SEASONS)
+    shards = tmp_path / "shards"
+
+    queue_scrape.queue_season_paths(
+        queue, paths, "first", "last", shard_directory=shards
+    )
+    queue_scrape.web_scrape_from_queue(queue, "a", shards)
+    merged = queue_scrape.merge_scraped_shards(shards, tmp_path / "first")
+
+    # seasons done by the previous run are queued (and scraped) again
+    assert (
+        queue_scrape.queue_season_paths(
+            queue, paths, "first", "last", shard_directory=shards
+        )
+        == 4
+    )
+    assert list(shards.glob("*")) == []
+
+    queue_scrape.web_scrape_from_queue(queue, "b", shards)
+    assert queue_scrape.merge_scraped_shards(shards, tmp_path / "second") == merged
+
+    for sport in ["soccer", "basketball"]:
+        pd.testing.assert_frame_equal(
+            pd.read_csv(tmp_path / "second" / f"{sport}.csv"),
+            pd.read_csv(tmp_path / "first" / f"{sport}.csv"),
+        )
+
+
+def test_clear(queue):
+    queue.put(TASKS)
+    queue.ack("a", queue.claim("a")[0])
+
+    assert queue.clear() == 1
+    assert queue.counts() == {"done": 0, "leased": 0, "queued": 0}
+    assert queue.put(TASKS) == 2
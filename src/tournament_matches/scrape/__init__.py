@@ -17,13 +17,73 @@
         ]
 """
 
+from .archive import ArchiveTransport, HtmlArchive
+from .async_web_scrape import async_web_scrape_from_provided_paths
+from .cache import ResponseCache
+from .circuit_breaker import HostCircuitBreaker
+from .client import ScrapeClient, get_client, set_client
+from .concurrency import AdaptiveConcurrencyLimiter
+from .dead_letters import DeadLetters, set_dead_letters
 from .homepage_paths import get_tournament_url_paths
+from .html_backend import set_parser_backend
+from .journal import ScrapeJournal
+from .main_queries import MainSectionQueries, set_main_section_queries
+from .matches_writer import MatchesWriter
+from .parse_pool import ParsePool
+from .pipeline_web_scrape import pipeline_web_scrape_from_provided_paths
+from .queue_web_scrape import (
+    merge_scraped_shards,
+    queue_season_paths,
+    web_scrape_from_queue,
+)
+from .rate_limit import HostRateLimiter, RetryBudget
+from .retry_web_scrape import web_scrape_failed_seasons
+from .scheduling import Deadline, set_deadline
+from .season_costs import SeasonCosts
+from .season_dropdowns import SeasonDropdowns, set_season_dropdowns
+from .season_index import SeasonIndex
+from .stream_parser import set_streaming
 from .validate_paths import validate_url_paths
 from .web_scrape import save_web_scraped_matches, web_scrape_from_provided_paths
+from .webpage_regions import set_partial_parsing
+from .work_queue import WorkQueue
 
 __all__ = [
+    "ResponseCache",
+    "HtmlArchive",
+    "ArchiveTransport",
+    "HostRateLimiter",
+    "RetryBudget",
+    "AdaptiveConcurrencyLimiter",
+    "HostCircuitBreaker",
+    "ScrapeJournal",
+    "DeadLetters",
+    "set_dead_letters",
+    "SeasonIndex",
+    "SeasonCosts",
+    "Deadline",
+    "set_deadline",
+    "MainSectionQueries",
+    "set_main_section_queries",
+    "SeasonDropdowns",
+    "set_season_dropdowns",
+    "set_parser_backend",
+    "set_partial_parsing",
+    "set_streaming",
+    "ScrapeClient",
+    "get_client",
+    "set_client",
     "get_tournament_url_paths",
     "validate_url_paths",
     "web_scrape_from_provided_paths",
+    "async_web_scrape_from_provided_paths",
+    "ParsePool",
+    "pipeline_web_scrape_from_provided_paths",
+    "MatchesWriter",
+    "WorkQueue",
+    "queue_season_paths",
+    "web_scrape_from_queue",
+    "merge_scraped_shards",
+    "web_scrape_failed_seasons",
     "save_web_scraped_matches",
 ]
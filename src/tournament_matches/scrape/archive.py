@@ -0,0 +1,295 @@
+import io
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+import requests
+from requests.adapters import BaseAdapter
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE: bool = True
+except ImportError:  # zstandard is optional, zlib is used instead
+    ZSTD_AVAILABLE = False
+
+# how each webpage is compressed
+ZLIB: str = "zlib"
+ZSTD: str = "zstd"  # with the shared dictionary, if it was already trained
+
+DEFAULT_LEVEL: int = 9
+DEFAULT_DICTIONARY_SIZE: int = 128 * 1024  # bytes
+DEFAULT_DICTIONARY_SAMPLES: int = 256  # webpages the dictionary is trained on
+
+OK_CODE: int = 200
+NOT_FOUND_CODE: int = 404
+
+
+@dataclass
+class ArchiveStats:
+    stored: int = 0
+    stored_bytes: int = 0  # before compression
+    compressed_bytes: int = 0
+    replayed: int = 0
+
+    def report(self) -> str:
+        ratio: float = (
+            self.stored_bytes / self.compressed_bytes if self.compressed_bytes else 0.0
+        )
+
+        return (
+            f"stored: {self.stored} ({self.stored_bytes / 2**20:.1f} MiB, "
+            f"compressed {ratio:.1f}x), replayed: {self.replayed}"
+        )
+
+
+class HtmlArchive:
+    """
+    Append-only archive of every webpage downloaded, keyed by url and
+    the time it was fetched. Webpages are never updated or removed, so
+    the extraction can be run again from the archive (see ArchiveTransport).
+
+    Webpages are compressed with zstd if zstandard is installed, otherwise
+    with zlib. betexplorer's webpages share most of their markup, so once
+    "dictionary_samples" webpages are stored, a zstd dictionary is trained
+    on them and used to compress (much better) every following webpage.
+
+    -----
+    Parameters:
+
+        path: Path
+            Archive file.
+
+        level: int
+            Compression level.
+
+        dictionary_size: int
+            Maximum size (in bytes) of the zstd dictionary.
+
+        dictionary_samples: int
+            Number of webpages the zstd dictionary is trained on.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        level: int = DEFAULT_LEVEL,
+        dictionary_size: int = DEFAULT_DICTIONARY_SIZE,
+        dictionary_samples: int = DEFAULT_DICTIONARY_SAMPLES,
+    ) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.level: int = level
+        self.dictionary_size: int = dictionary_size
+        self.dictionary_samples: int = dictionary_samples
+        self.stats: ArchiveStats = ArchiveStats()
+
+        # the same connection is used by all scraping threads
+        self._lock: threading.Lock = threading.Lock()
+        self._connection: sqlite3.Connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS dictionaries ("
+            " id INTEGER PRIMARY KEY,"
+            " data BLOB NOT NULL"
+            ")"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " url TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " codec TEXT NOT NULL,"
+            " dictionary_id INTEGER REFERENCES dictionaries (id),"
+            " content BLOB NOT NULL"
+            ")"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS pages_by_url ON pages (url, fetched_at)"
+        )
+
+        self._decompressors: dict[int, Any] = {}  # dictionary id -> decompressor
+        self._samples: list[bytes] = []
+        self._dictionary_id: Optional[int] = None
+        self._compressor: Optional[Any] = None
+
+        if ZSTD_AVAILABLE:
+            self._load_dictionary()
+
+    def _load_dictionary(self) -> None:
+        row: Optional[tuple[int, bytes]] = self._connection.execute(
+            "SELECT id, data FROM dictionaries ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+
+        if row is None:
+            self._compressor = zstandard.ZstdCompressor(level=self.level)
+            return
+
+        self._dictionary_id = row[0]
+        self._compressor = zstandard.ZstdCompressor(
+            level=self.level, dict_data=zstandard.ZstdCompressionDict(row[1])
+        )
+
+    def _train_dictionary(self) -> None:
+        try:
+            dictionary = zstandard.train_dictionary(
+                self.dictionary_size, self._samples, level=self.level
+            )
+        except zstandard.ZstdError as error:
+            logging.warning(f"Archive dictionary could not be trained: {error}")
+            return
+        finally:
+            self._samples = []
+
+        self._dictionary_id = self._connection.execute(
+            "INSERT INTO dictionaries (data) VALUES (?)", (dictionary.as_bytes(),)
+        ).lastrowid
+        self._compressor = zstandard.ZstdCompressor(
+            level=self.level, dict_data=dictionary
+        )
+
+        logging.info(f"Archive dictionary trained on {self.dictionary_samples} pages")
+
+    def _compress(self, content: bytes) -> tuple[str, Optional[int], bytes]:
+        if not ZSTD_AVAILABLE:
+            return ZLIB, None, zlib.compress(content, self.level)
+
+        if self._dictionary_id is None:
+            self._samples.append(content)
+
+            if len(self._samples) >= self.dictionary_samples:
+                self._train_dictionary()
+
+        return ZSTD, self._dictionary_id, self._compressor.compress(content)
+
+    def _get_decompressor(self, dictionary_id: Optional[int]) -> Any:
+        key: int = dictionary_id or 0
+
+        if key not in self._decompressors:
+            if dictionary_id is None:
+                self._decompressors[key] = zstandard.ZstdDecompressor()
+            else:
+                (data,) = self._connection.execute(
+                    "SELECT data FROM dictionaries WHERE id = ?", (dictionary_id,)
+                ).fetchone()
+                self._decompressors[key] = zstandard.ZstdDecompressor(
+                    dict_data=zstandard.ZstdCompressionDict(data)
+                )
+
+        return self._decompressors[key]
+
+    def _decompress(
+        self, codec: str, dictionary_id: Optional[int], content: bytes
+    ) -> bytes:
+        if codec == ZLIB:
+            return zlib.decompress(content)
+
+        if not ZSTD_AVAILABLE:
+            logging.error("zstandard is not installed.")
+            raise ValueError("Archived webpages require zstandard to be installed.")
+
+        return self._get_decompressor(dictionary_id).decompress(content)
+
+    def put(self, url: str, content: bytes) -> None:
+        """
+        Archive webpage "content", downloaded from "url".
+        """
+
+        with self._lock:
+            codec, dictionary_id, compressed = self._compress(content)
+
+            self._connection.execute(
+                "INSERT INTO pages (url, fetched_at, codec, dictionary_id, content)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (url, time.time(), codec, dictionary_id, compressed),
+            )
+
+            self.stats.stored += 1
+            self.stats.stored_bytes += len(content)
+            self.stats.compressed_bytes += len(compressed)
+
+    def has(self, url: str) -> bool:
+        """
+        Whether a webpage was archived for "url".
+        """
+
+        with self._lock:
+            row: Optional[tuple[int]] = self._connection.execute(
+                "SELECT 1 FROM pages WHERE url = ? LIMIT 1", (url,)
+            ).fetchone()
+
+        return row is not None
+
+    def get(self, url: str, fetched_before: Optional[float] = None) -> Optional[bytes]:
+        """
+        Latest webpage archived for "url" (before "fetched_before", if provided).
+
+        Returns None if there is none.
+        """
+
+        with self._lock:
+            row: Optional[tuple[str, Optional[int], bytes]] = self._connection.execute(
+                "SELECT codec, dictionary_id, content FROM pages"
+                " WHERE url = ? AND fetched_at < ?"
+                " ORDER BY fetched_at DESC LIMIT 1",
+                (url, float("inf") if fetched_before is None else fetched_before),
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            self.stats.replayed += 1
+
+            return self._decompress(*row)
+
+    def report(self) -> str:
+        return self.stats.report()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class ArchiveTransport(BaseAdapter):
+    """
+    Transport answering requests with archived webpages, without any
+    network access (replay). Urls that were not archived are answered
+    with 404.
+
+    -----
+    Parameters:
+
+        archive: HtmlArchive
+            Archive of downloaded webpages.
+
+        fetched_before: Optional[float]
+            If provided, webpages are replayed as they were at this time
+            (seconds since the epoch).
+    """
+
+    def __init__(
+        self, archive: HtmlArchive, fetched_before: Optional[float] = None
+    ) -> None:
+        super().__init__()
+        self.archive: HtmlArchive = archive
+        self.fetched_before: Optional[float] = fetched_before
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        content: Optional[bytes] = self.archive.get(request.url, self.fetched_before)
+
+        response = requests.Response()
+        response.status_code = NOT_FOUND_CODE if content is None else OK_CODE
+        response.raw = io.BytesIO(content or b"")
+        response.url = request.url
+        response.request = request
+
+        return response
+
+    def close(self) -> None:
+        pass
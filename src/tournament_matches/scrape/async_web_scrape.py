@@ -0,0 +1,193 @@
+import asyncio
+import functools
+import itertools
+import logging
+from collections import defaultdict
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, Iterator, Optional, ParamSpec, TypeVar
+
+import pandas as pd
+
+from logs import log
+
+from .journal import ScrapeJournal
+from .matches_builder import MatchesBuilder
+from .matches_writer import MatchesWriter
+from .scheduling import schedule_seasons
+from .scrape_matches import Matches
+from .season_costs import SeasonCosts
+from .season_index import SeasonIndex
+from .utils import get_sport, get_tournament_name
+from .web_scrape import (
+    _build_all_sports,
+    _get_path_to_desired_seasons,
+    _web_scrape_season_matches,
+)
+
+T = TypeVar("T")
+P = ParamSpec("P")
+
+SeasonsMatches = list[tuple[str, Optional[Matches]]]  # (id, matches) per season
+
+
+async def _run_in_executor(
+    executor: Executor, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs
+) -> T:
+    # scraping functions are blocking, so they are run in worker threads;
+    # the executor's number of workers is the maximum number of in-flight calls
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, functools.partial(func, *args, **kwargs)
+    )
+
+
+async def _web_scrape_all_tournaments(
+    paths: list[str],
+    first_season: tuple[str, str],
+    last_season: tuple[str, str],
+    max_in_flight: int,
+    journal: Optional[ScrapeJournal],
+    index: Optional[SeasonIndex],
+    writer: Optional[MatchesWriter],
+    costs: Optional[SeasonCosts],
+) -> list[SeasonsMatches]:
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        tournaments: list[list[str]] = await asyncio.gather(
+            *(
+                _run_in_executor(
+                    executor,
+                    _get_path_to_desired_seasons,
+                    path,
+                    first_season,
+                    last_season,
+                    journal,
+                )
+                for path in paths
+            )
+        )
+
+        # name is necessary because some tournaments had their names changed
+        seasons: list[tuple[str, str]] = [
+            (get_tournament_name(path), season_path)
+            for path, season_paths in zip(paths, tournaments)
+            for season_path in season_paths
+        ]
+        order: list[int] = schedule_seasons([path for _, path in seasons], index, costs)
+
+        # seasons are submitted in order and idle threads take the next one,
+        # so no thread waits while there are seasons left
+        scraped: list[tuple[str, Optional[Matches]]] = await asyncio.gather(
+            *(
+                _run_in_executor(
+                    executor,
+                    _web_scrape_season_matches,
+                    *seasons[i],
+                    journal,
+                    index,
+                    writer,
+                    costs,
+                )
+                for i in order
+            )
+        )
+
+    # back to the order of the seasons of each tournament
+    in_order: SeasonsMatches = [None] * len(seasons)
+    for i, season in zip(order, scraped):
+        in_order[i] = season
+
+    remaining: Iterator[tuple[str, Optional[Matches]]] = iter(in_order)
+
+    return [
+        list(itertools.islice(remaining, len(season_paths)))
+        for season_paths in tournaments
+    ]
+
+
+def _group_seasons_by_sport(
+    paths: list[str], tournaments: list[SeasonsMatches]
+) -> dict[str, pd.DataFrame]:
+    sport_to_builder: dict[str, MatchesBuilder] = defaultdict(MatchesBuilder)
+
+    for path, seasons in zip(paths, tournaments):
+        builder: MatchesBuilder = sport_to_builder[get_sport(path)]
+
+        for id, matches in seasons:
+            builder.add(id, matches)
+
+    return _build_all_sports(sport_to_builder)
+
+
+@log(logging.info)
+def async_web_scrape_from_provided_paths(
+    paths: list[str],
+    first_season: tuple[str, str],
+    last_season: tuple[str, str],
+    max_in_flight: int,
+    journal: Optional[ScrapeJournal] = None,
+    index: Optional[SeasonIndex] = None,
+    writer: Optional[MatchesWriter] = None,
+    costs: Optional[SeasonCosts] = None,
+) -> dict[str, pd.DataFrame]:
+    """
+    Concurrent version of web_scrape_from_provided_paths.
+
+    Season discovery and matches scraping for all tournaments are run
+    concurrently, with at most "max_in_flight" of them at the same time.
+
+    Once every tournament's seasons are known, they are scraped by freshness
+    and then from the most costly to the least costly, as estimated by
+    "costs" (see schedule_seasons).
+
+    Output is the same as web_scrape_from_provided_paths', including
+    the order of the matches.
+
+    --------
+    Parameters:
+
+        path: list[str]
+            String of the form /sports/country/name/
+
+        first_season: tuple[str, str]
+            First season to be considered.
+
+            Example: ("2015", "2013/2014")
+
+        last_season: tuple[str, str]
+            Last season to be considered.
+            It is similar to the first_season parameter.
+
+        max_in_flight: int
+            Maximum number of concurrent scraping calls.
+
+        journal: Optional[ScrapeJournal]
+        index: Optional[SeasonIndex]
+        writer: Optional[MatchesWriter]
+        costs: Optional[SeasonCosts]
+            See web_scrape_from_provided_paths.
+
+    --------
+    Returns:
+
+        dict[str, pd.DataFrame]:
+            Dictionary with the matches of desired tournaments.
+                Key: sport
+                Value: pd.DataFrame with matches' information for all tournaments
+
+            See web_scrape_from_provided_paths for the data frame format.
+    """
+
+    tournaments: list[SeasonsMatches] = asyncio.run(
+        _web_scrape_all_tournaments(
+            paths,
+            first_season,
+            last_season,
+            max_in_flight,
+            journal,
+            index,
+            writer,
+            costs,
+        )
+    )
+
+    return _group_seasons_by_sport(paths, tournaments)
@@ -0,0 +1,344 @@
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, Pattern
+from urllib.parse import urlparse
+
+from .utils import CURRENT_YEAR
+
+# season segment of a path ends with its year(s): name-2012 or name-2012-2013
+SEASON_YEARS_RE: Pattern[str] = re.compile(r"-(\d{4})(?:-(\d{4}))?$")
+
+CACHE_FILE_NAME: str = "responses.sqlite3"
+
+
+def _get_last_season_year(url: str) -> Optional[int]:
+    # url paths are of the form /sport/country/name-year/(results/)
+    segments: list[str] = urlparse(url).path.strip("/").split("/")
+
+    if len(segments) < 3:
+        return None
+
+    match = SEASON_YEARS_RE.search(segments[2])
+
+    if match is None:
+        return None
+
+    first_year, second_year = match.groups()
+    return int(second_year or first_year)
+
+
+def is_historic_season_url(url: str) -> bool:
+    """
+    Whether url points to a season that ended before the current year.
+
+    Those webpages are not expected to change anymore.
+    """
+
+    last_year: Optional[int] = _get_last_season_year(url)
+
+    return last_year is not None and last_year < int(CURRENT_YEAR)
+
+
+@dataclass
+class CachedResponse:
+    """
+    Stored webpage and the validators needed to revalidate it.
+    """
+
+    content: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    revalidated: int = 0
+    parses_skipped: int = 0
+    stores: int = 0
+    evictions: int = 0
+    bytes_served: int = 0
+
+    def report(self) -> str:
+        requests: int = self.hits + self.misses
+        hit_rate: float = self.hits / requests if requests else 0.0
+
+        return (
+            f"hits: {self.hits}, misses: {self.misses} "
+            f"(expired: {self.expired}), hit rate: {hit_rate:.1%}, "
+            f"not modified (304): {self.revalidated}, "
+            f"parses skipped: {self.parses_skipped}, "
+            f"stored: {self.stores}, evicted: {self.evictions}, "
+            f"served from disk: {self.bytes_served / 2**20:.1f} MiB"
+        )
+
+
+class ResponseCache:
+    """
+    Persistent (on-disk) cache of webpages, keyed by url.
+
+    Each entry has its own time to live:
+        - Historic seasons (see is_historic_season_url) never expire.
+        - Every other webpage (current season, default tournament pages, ...)
+          expires after "current_ttl" seconds.
+
+    When the cache grows bigger than "max_bytes", least recently used
+    entries are evicted.
+
+    Expired entries are kept along with their validators (ETag and
+    Last-Modified headers), so they can be revalidated with a conditional
+    request. Values extracted from a webpage may also be stored, so that
+    an unchanged webpage does not have to be parsed again.
+
+    -----
+    Parameters:
+
+        directory: Path
+            Folder where the cache is stored.
+
+        max_bytes: int
+            Maximum size (sum of all webpages' sizes) of the cache.
+
+        current_ttl: float
+            Time to live, in seconds, of webpages that may still change.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int, current_ttl: float) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+
+        self.max_bytes: int = max_bytes
+        self.current_ttl: float = current_ttl
+        self.stats: CacheStats = CacheStats()
+
+        # the same connection is used by all scraping threads
+        self._lock: threading.Lock = threading.Lock()
+        self._connection: sqlite3.Connection = sqlite3.connect(
+            directory / CACHE_FILE_NAME, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " url TEXT PRIMARY KEY,"
+            " content BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " stored_at REAL NOT NULL,"
+            " expires_at REAL,"  # NULL: never expires
+            " last_access REAL NOT NULL,"
+            " etag TEXT,"
+            " last_modified TEXT"
+            ")"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS lru ON responses (last_access)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS parsed ("
+            " url TEXT NOT NULL,"
+            " parser TEXT NOT NULL,"
+            " value TEXT NOT NULL,"  # json
+            " PRIMARY KEY (url, parser)"
+            ")"
+        )
+        self._add_validator_columns()
+
+        (total,) = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        self._total_bytes: int = total
+
+    def _add_validator_columns(self) -> None:
+        # caches created before validators were stored lack these columns
+        columns: set[str] = {
+            row[1] for row in self._connection.execute("PRAGMA table_info(responses)")
+        }
+
+        for column in ["etag", "last_modified"]:
+            if column not in columns:
+                self._connection.execute(
+                    f"ALTER TABLE responses ADD COLUMN {column} TEXT"
+                )
+
+    def _expires_at(self, url: str, now: float) -> Optional[float]:
+        ttl: Optional[float] = self.ttl_for(url)
+        return None if ttl is None else now + ttl
+
+    def ttl_for(self, url: str) -> Optional[float]:
+        """
+        Time to live (in seconds) for url. None means it never expires.
+        """
+
+        return None if is_historic_season_url(url) else self.current_ttl
+
+    def get(self, url: str) -> Optional[bytes]:
+        """
+        Returns the cached webpage for url, if there is a fresh one.
+        """
+
+        now: float = time.time()
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT content, expires_at FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+
+            if row is None:
+                self.stats.misses += 1
+                return None
+
+            content, expires_at = row
+
+            if expires_at is not None and expires_at <= now:
+                self.stats.misses += 1
+                self.stats.expired += 1
+                return None
+
+            self._connection.execute(
+                "UPDATE responses SET last_access = ? WHERE url = ?", (now, url)
+            )
+
+            self.stats.hits += 1
+            self.stats.bytes_served += len(content)
+
+        return content
+
+    def get_stale(self, url: str) -> Optional[CachedResponse]:
+        """
+        Returns the cached webpage for url, even if it has expired.
+
+        Meant for conditional requests, so it does not count as a hit or miss.
+        """
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT content, etag, last_modified FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+
+        return None if row is None else CachedResponse(*row)
+
+    def refresh(self, url: str) -> None:
+        """
+        Mark cached webpage for url as fresh, i.e. its server answered
+        "304 Not Modified" to a conditional request.
+        """
+
+        now: float = time.time()
+
+        with self._lock:
+            self._connection.execute(
+                "UPDATE responses SET expires_at = ?, last_access = ? WHERE url = ?",
+                (self._expires_at(url, now), now, url),
+            )
+            self.stats.revalidated += 1
+
+    def put(
+        self,
+        url: str,
+        content: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """
+        Store webpage for url (and its validators), replacing any previous one.
+
+        Values extracted from the previous webpage are discarded.
+        """
+
+        now: float = time.time()
+
+        with self._lock:
+            previous = self._connection.execute(
+                "SELECT size FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses"
+                " (url, content, size, stored_at, expires_at, last_access,"
+                " etag, last_modified)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    content,
+                    len(content),
+                    now,
+                    self._expires_at(url, now),
+                    now,
+                    etag,
+                    last_modified,
+                ),
+            )
+            self._connection.execute("DELETE FROM parsed WHERE url = ?", (url,))
+
+            self._total_bytes += len(content) - (previous[0] if previous else 0)
+            self.stats.stores += 1
+
+            self._evict_least_recently_used()
+
+    def _evict_least_recently_used(self) -> None:
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        rows = self._connection.execute(
+            "SELECT url, size FROM responses ORDER BY last_access"
+        )
+
+        to_evict: list[str] = []
+        for url, size in rows:
+            if self._total_bytes <= self.max_bytes:
+                break
+
+            to_evict.append(url)
+            self._total_bytes -= size
+
+        for table in ["responses", "parsed"]:
+            self._connection.executemany(
+                f"DELETE FROM {table} WHERE url = ?", ((url,) for url in to_evict)
+            )
+
+        self.stats.evictions += len(to_evict)
+        logging.info(f"Evicted {len(to_evict)} webpages from cache.")
+
+    def get_parsed(self, url: str, parser: str) -> Optional[Any]:
+        """
+        Returns the value "parser" extracted from the cached webpage for url.
+        """
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM parsed WHERE url = ? AND parser = ?", (url, parser)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            self.stats.parses_skipped += 1
+
+        return json.loads(row[0])
+
+    def put_parsed(self, url: str, parser: str, value: Any) -> None:
+        """
+        Store the (json serializable) value "parser" extracted from the
+        cached webpage for url.
+        """
+
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO parsed (url, parser, value) VALUES (?, ?, ?)",
+                (url, parser, json.dumps(value)),
+            )
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
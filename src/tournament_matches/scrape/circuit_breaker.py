@@ -0,0 +1,291 @@
+import contextlib
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Iterator, Optional
+from urllib.parse import urlparse
+
+from .concurrency import Observation, Outcome, classify_outcome
+
+# probes are given the number of the half-open period they were sent in
+# (requests sent while the circuit is closed are given None)
+Permit = Optional[int]
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"  # requests are sent
+    OPEN = "open"  # requests wait for the cool-down to end
+    HALF_OPEN = "half-open"  # only probe requests are sent
+
+
+@dataclass
+class CircuitTransition:
+    at: float  # time.monotonic()
+    host: str
+    state: CircuitState
+    reason: str
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for the requests to one host:
+
+        - Closed: requests are sent. Once at least "min_requests" of the last
+          "window" requests finished and at least "failure_rate" of them
+          failed (errors, 429 and 5xx responses), it opens.
+
+        - Open: requests are held (their threads wait, without sending
+          anything) for "cooldown" seconds. Then, it is half-open.
+
+        - Half-open: at most "probes" requests are sent at a time, the rest
+          keep waiting. If "probes" of them succeed in a row, it closes.
+          If one of them fails, it opens again.
+
+    Only probes count while it is not closed (requests sent before it opened
+    may still be finishing). Every transition is recorded in "history".
+    """
+
+    def __init__(
+        self,
+        host: str,
+        failure_rate: float,
+        window: int,
+        min_requests: int,
+        cooldown: float,
+        probes: int = 1,
+    ) -> None:
+        self.host: str = host
+        self.failure_rate: float = failure_rate
+        self.min_requests: int = min_requests
+        self.cooldown: float = cooldown
+        self.probes: int = probes
+
+        self.state: CircuitState = CircuitState.CLOSED
+        self.history: list[CircuitTransition] = []
+        self.held: int = 0  # requests that waited for the circuit
+        self.held_seconds: float = 0.0
+
+        self._outcomes: deque[bool] = deque(maxlen=window)  # True if failed
+        self._opened_at: float = 0.0
+        self._openings: int = 0
+        self._probes_in_flight: int = 0
+        self._probes_succeeded: int = 0
+        self._condition: threading.Condition = threading.Condition()
+
+    def _transition(self, state: CircuitState, reason: str) -> None:
+        self.state = state
+        self.history.append(
+            CircuitTransition(time.monotonic(), self.host, state, reason)
+        )
+
+        message: str = f"Circuit of {self.host} {state.value} ({reason})."
+
+        if state == CircuitState.OPEN:
+            logging.warning(message)
+        else:
+            logging.info(message)
+
+    def _open(self, reason: str) -> None:
+        self._outcomes.clear()
+        self._opened_at = time.monotonic()
+        self._openings += 1
+        self._probes_in_flight = 0
+        self._probes_succeeded = 0
+
+        self._transition(CircuitState.OPEN, reason)
+        self._condition.notify_all()
+
+    def _try_acquire(self) -> tuple[bool, Permit]:
+        # returns whether the request is allowed (and its permit)
+        if self.state == CircuitState.OPEN:
+            if time.monotonic() < self._opened_at + self.cooldown:
+                return False, None
+
+            self._transition(CircuitState.HALF_OPEN, "cool-down over")
+
+        if self.state == CircuitState.CLOSED:
+            return True, None
+
+        if self._probes_in_flight >= self.probes:
+            return False, None
+
+        self._probes_in_flight += 1
+        return True, self._openings
+
+    def _get_wait(self) -> Optional[float]:
+        # half-open circuits wait for probes to finish (notified)
+        if self.state != CircuitState.OPEN:
+            return None
+
+        return max(0.0, self._opened_at + self.cooldown - time.monotonic())
+
+    def acquire(self) -> Permit:
+        """
+        Wait until a request is allowed. Returns its permit (for release).
+        """
+
+        with self._condition:
+            allowed, permit = self._try_acquire()
+
+            if allowed:
+                return permit
+
+            start: float = time.monotonic()
+
+            while not allowed:
+                self._condition.wait(self._get_wait())
+                allowed, permit = self._try_acquire()
+
+            self.held += 1
+            self.held_seconds += time.monotonic() - start
+
+            return permit
+
+    def release(self, permit: Permit, failed: bool) -> None:
+        """
+        Report a finished request, with the permit returned by acquire.
+        """
+
+        with self._condition:
+            if permit is not None:
+                self._release_probe(permit, failed)
+            elif self.state == CircuitState.CLOSED:
+                self._record(failed)
+
+    def _release_probe(self, permit: int, failed: bool) -> None:
+        if self.state != CircuitState.HALF_OPEN or permit != self._openings:
+            # another probe already decided the state of the circuit
+            return
+
+        self._probes_in_flight -= 1
+
+        if failed:
+            self._open("probe failed")
+            return
+
+        self._probes_succeeded += 1
+
+        if self._probes_succeeded >= self.probes:
+            self._transition(CircuitState.CLOSED, "probes succeeded")
+
+        self._condition.notify_all()
+
+    def _record(self, failed: bool) -> None:
+        self._outcomes.append(failed)
+
+        if len(self._outcomes) < self.min_requests:
+            return
+
+        failure_rate: float = sum(self._outcomes) / len(self._outcomes)
+
+        if failure_rate >= self.failure_rate:
+            self._open(f"failure rate {failure_rate:.0%}")
+
+    @contextlib.contextmanager
+    def request(self) -> Iterator[Observation]:
+        """
+        Context manager around one request, like
+        AdaptiveConcurrencyLimiter.slot.
+        """
+
+        observation: Observation = Observation()
+        error: Optional[BaseException] = None
+
+        permit: Permit = self.acquire()
+
+        try:
+            yield observation
+        except BaseException as exception:
+            error = exception
+            raise
+        finally:
+            outcome: Outcome = classify_outcome(observation.status_code, error)
+            self.release(permit, outcome != Outcome.OK)
+
+
+class HostCircuitBreaker:
+    """
+    One circuit breaker per host, all of them with the same parameters
+    (see CircuitBreaker).
+    """
+
+    def __init__(
+        self,
+        failure_rate: float,
+        window: int,
+        min_requests: int,
+        cooldown: float,
+        probes: int = 1,
+    ) -> None:
+        self.failure_rate: float = failure_rate
+        self.window: int = window
+        self.min_requests: int = min_requests
+        self.cooldown: float = cooldown
+        self.probes: int = probes
+
+        self._start: float = time.monotonic()
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def get_breaker(self, url: str) -> CircuitBreaker:
+        host: str = urlparse(url).netloc
+
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(
+                    host,
+                    self.failure_rate,
+                    self.window,
+                    self.min_requests,
+                    self.cooldown,
+                    self.probes,
+                )
+
+            return self._breakers[host]
+
+    def is_holding(self, url: str) -> bool:
+        """
+        Whether requests to url's host are held (its circuit is not closed).
+        """
+
+        return self.get_breaker(url).state != CircuitState.CLOSED
+
+    def request(self, url: str) -> contextlib.AbstractContextManager[Observation]:
+        """
+        Context manager around one request to url's host (see
+        CircuitBreaker.request). It waits while the host's circuit is open.
+        """
+
+        return self.get_breaker(url).request()
+
+    def report(self, last_transitions: int = 10) -> str:
+        """
+        State of each host's circuit and the latest transitions.
+        """
+
+        with self._lock:
+            breakers: list[CircuitBreaker] = list(self._breakers.values())
+
+        history: list[CircuitTransition] = sorted(
+            (transition for breaker in breakers for transition in breaker.history),
+            key=lambda transition: transition.at,
+        )
+        states: str = ", ".join(
+            f"{breaker.host} {breaker.state.value}" for breaker in breakers
+        )
+        held: int = sum(breaker.held for breaker in breakers)
+        held_seconds: float = sum(breaker.held_seconds for breaker in breakers)
+        transitions: str = ", ".join(
+            f"{transition.at - self._start:.0f}s: {transition.host} "
+            f"{transition.state.value} ({transition.reason})"
+            for transition in history[-last_transitions:]
+        )
+
+        return (
+            f"{states or 'no requests'}; requests held: {held} "
+            f"({held_seconds:.0f}s); {len(history)} transitions"
+            + (f"; latest: {transitions}" if transitions else "")
+        )
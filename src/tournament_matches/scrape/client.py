@@ -0,0 +1,665 @@
+import contextlib
+import dataclasses
+import functools
+import hashlib
+import importlib
+import inspect
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any, Callable, ContextManager, Optional, Protocol, TypeVar
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3.util import make_headers
+
+from .archive import HtmlArchive
+from .cache import CachedResponse, ResponseCache
+from .circuit_breaker import HostCircuitBreaker
+from .concurrency import AdaptiveConcurrencyLimiter, Observation
+from .html_backend import get_parser_backend
+from .parse_pool import ParsePool
+from .rate_limit import HostRateLimiter, RetryBudget, get_backoff_delay
+from .webpage_regions import is_partial_parsing_enabled
+
+T = TypeVar("T")
+
+# urllib3 only advertises "br" when a brotli decoder is installed
+ACCEPT_ENCODING: str = make_headers(accept_encoding=True)["accept-encoding"]
+
+Timeout = float | tuple[float, float]
+
+DEFAULT_TIMEOUT: tuple[float, float] = (10, 60)  # (connect, read) in seconds
+DEFAULT_POOL_SIZE: int = 16
+DEFAULT_MAX_RETRIES: int = 4
+DEFAULT_BACKOFF_BASE: float = 1.0
+DEFAULT_BACKOFF_MAX: float = 60.0
+STREAM_CHUNK_SIZE: int = 64 * 1024  # bytes
+
+OK_CODE: int = 200
+NOT_MODIFIED_CODE: int = 304
+TOO_MANY_REQUESTS_CODE: int = 429
+
+# modules that extract information for parsers (see _get_parser_version)
+EXTRACTION_MODULES: tuple[str, ...] = (
+    "html_backend",
+    "stream_parser",
+    "webpage_regions",
+)
+
+# only transient problems are worth retrying
+RETRYABLE_EXCEPTIONS: tuple[type[requests.RequestException], ...] = (
+    requests.Timeout,
+    requests.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+def _is_retryable_status(status_code: int) -> bool:
+    return status_code == TOO_MANY_REQUESTS_CODE or 500 <= status_code < 600
+
+
+def _get_retry_after(response: requests.Response) -> float:
+    # "Retry-After" may also be an http date, which is ignored
+    retry_after: str = response.headers.get("Retry-After", "")
+    return float(retry_after) if retry_after.isdigit() else 0.0
+
+
+@dataclass
+class Page:
+    """
+    Response to a GET request made by ScrapeClient.
+    """
+
+    url: str
+    status_code: int
+    content: bytes
+    from_cache: bool = False  # also True if revalidated ("304 Not Modified")
+    streamed: bool = False  # content was already handed over chunk by chunk
+
+
+class StreamParser(Protocol[T]):
+    """
+    Parser fed with a webpage chunk by chunk (see ScrapeClient.parse_stream).
+    """
+
+    def feed(self, chunk: bytes) -> None:
+        ...
+
+    def finish(self) -> T:
+        ...
+
+
+@functools.cache
+def _get_parser_version(parser: Callable[[bytes], Any]) -> str:
+    # values extracted by an outdated version of the parser must not be reused,
+    # so the version changes whenever the parser's module (or a module doing
+    # the extraction for it) changes
+    modules: list[ModuleType] = [sys.modules[parser.__module__]] + [
+        importlib.import_module(f".{name}", __package__) for name in EXTRACTION_MODULES
+    ]
+    sources: str = "".join(inspect.getsource(module) for module in modules)
+
+    return hashlib.sha1(sources.encode()).hexdigest()[:12]
+
+
+def _get_parser_key(parser: Callable[[bytes], Any]) -> str:
+    # the backend and partial parsing may also change the extracted values
+    settings: str = (
+        f"{get_parser_backend()},partial={int(is_partial_parsing_enabled())}"
+    )
+
+    return (
+        f"{parser.__module__}.{parser.__qualname__}"
+        f"@{_get_parser_version(parser)}[{settings}]"
+    )
+
+
+def _as_not_streamed(page: Page) -> Page:
+    # only the request that downloaded a page had its chunks handed over
+    return dataclasses.replace(page, streamed=False) if page.streamed else page
+
+
+def _read_body(
+    response: requests.Response, on_chunk: Optional[Callable[[bytes], None]]
+) -> tuple[Optional[bytes], Optional[Exception]]:
+    # (streamed body, exception raised by on_chunk): a parser's failure is
+    # returned rather than raised, since it is not a failure of the request
+    if on_chunk is None or response.status_code == NOT_MODIFIED_CODE:
+        return None, None
+
+    chunks: list[bytes] = []
+
+    with response:
+        for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+            try:
+                on_chunk(chunk)
+            except Exception as error:
+                return None, error
+
+            chunks.append(chunk)
+
+    return b"".join(chunks), None
+
+
+def _get_conditional_headers(cached: CachedResponse) -> dict[str, str]:
+    headers: dict[str, str] = {}
+
+    if cached.etag:
+        headers["If-None-Match"] = cached.etag
+
+    if cached.last_modified:
+        headers["If-Modified-Since"] = cached.last_modified
+
+    return headers
+
+
+class ScrapeClient:
+    """
+    HTTP client shared by every request of the scrape package.
+
+    All requests go through one requests.Session, so connections to
+    www.betexplorer.com are pooled and kept alive between requests.
+
+    -----
+    Parameters:
+
+        timeout: float | tuple[float, float]
+            Timeout (in seconds) for each request.
+            A tuple is interpreted as (connect timeout, read timeout).
+
+        pool_size: int
+            Maximum number of connections kept alive per host.
+            It should be at least the number of concurrent requests.
+
+        transport: Optional[requests.adapters.BaseAdapter]
+            Adapter used to send requests. By default, a pooled HTTPAdapter.
+
+            Tests and benchmarks may provide their own (local) transport.
+
+        cache: Optional[ResponseCache]
+            On-disk cache of webpages. If None, every request uses the network.
+
+        rate_limiter: Optional[HostRateLimiter]
+            Limits how many requests per second are sent to each host.
+            If None, requests are not limited.
+
+        max_retries: int
+            Maximum number of retries of a single request.
+
+            Only timeouts, connection errors, 429 and 5xx responses are retried,
+            with exponential backoff and jitter (see get_backoff_delay).
+
+        retry_budget: Optional[RetryBudget]
+            Maximum number of retries for all requests. If None, there is no limit.
+
+        backoff_base: float
+        backoff_max: float
+            Parameters (in seconds) of the exponential backoff between retries.
+
+        concurrency: Optional[AdaptiveConcurrencyLimiter]
+            Limits (and tunes) how many requests are in flight at the same time,
+            based on their latencies and errors. If None, there is no limit.
+
+        parse_pool: Optional[ParsePool]
+            Worker processes that parse webpages (see parse).
+            If None, webpages are parsed by the thread that fetched them.
+
+        archive: Optional[HtmlArchive]
+            Archive where every webpage downloaded (successfully)
+            is stored, as well as webpages from the cache that are not
+            archived yet. If None, webpages are not archived.
+
+        circuit_breaker: Optional[HostCircuitBreaker]
+            Holds requests to a host while it keeps failing, instead of
+            sending (and retrying) them. Retries held by it neither spend
+            the retry budget nor back off. If None, requests are never held.
+    """
+
+    def __init__(
+        self,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        transport: Optional[BaseAdapter] = None,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[HostRateLimiter] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        retry_budget: Optional[RetryBudget] = None,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+        concurrency: Optional[AdaptiveConcurrencyLimiter] = None,
+        parse_pool: Optional[ParsePool] = None,
+        archive: Optional[HtmlArchive] = None,
+        circuit_breaker: Optional[HostCircuitBreaker] = None,
+    ) -> None:
+        self.timeout: Timeout = timeout
+        self.cache: Optional[ResponseCache] = cache
+        self.rate_limiter: Optional[HostRateLimiter] = rate_limiter
+        self.max_retries: int = max_retries
+        self.retry_budget: Optional[RetryBudget] = retry_budget
+        self.backoff_base: float = backoff_base
+        self.backoff_max: float = backoff_max
+        self.concurrency: Optional[AdaptiveConcurrencyLimiter] = concurrency
+        self.parse_pool: Optional[ParsePool] = parse_pool
+        self.archive: Optional[HtmlArchive] = archive
+        self.circuit_breaker: Optional[HostCircuitBreaker] = circuit_breaker
+        self.retries: int = 0
+        self.coalesced: int = 0  # requests answered by another in-flight request
+        self.reused: int = 0  # requests answered by a kept page
+        self._stats_lock: threading.Lock = threading.Lock()
+
+        # bytes downloaded by each thread (see downloaded_bytes)
+        self._thread_stats: threading.local = threading.local()
+
+        # single flight: concurrent requests for the same url share one response
+        self._flights: dict[str, Future[Page]] = {}
+        self._kept: dict[str, Page] = {}
+        self._flights_lock: threading.Lock = threading.Lock()
+
+        if transport is None:
+            transport = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+
+        self.session: requests.Session = requests.Session()
+        self.session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        self.session.mount("https://", transport)
+        self.session.mount("http://", transport)
+
+    def _observe(self) -> ContextManager[Observation]:
+        if self.concurrency is None:
+            return contextlib.nullcontext(Observation())
+
+        return self.concurrency.slot()
+
+    def _guard(self, url: str) -> ContextManager[Observation]:
+        if self.circuit_breaker is None:
+            return contextlib.nullcontext(Observation())
+
+        return self.circuit_breaker.request(url)
+
+    def _is_held(self, url: str) -> bool:
+        return self.circuit_breaker is not None and self.circuit_breaker.is_holding(url)
+
+    def _should_retry(self, attempt: int, held: bool) -> bool:
+        if attempt >= self.max_retries:
+            return False
+
+        # a held retry is not sent until the host recovers (see _guard),
+        # so it does not spend the budget
+        if (
+            not held
+            and self.retry_budget is not None
+            and not self.retry_budget.try_spend()
+        ):
+            logging.warning("Retry budget exhausted.")
+            return False
+
+        with self._stats_lock:
+            self.retries += 1
+
+        return True
+
+    def _send(
+        self,
+        url: str,
+        headers: dict[str, str],
+        on_chunk: Optional[Callable[[bytes], None]] = None,
+    ) -> tuple[requests.Response, Optional[bytes]]:
+        # body is None if it was not streamed (then it is response.content)
+        attempt: int = 0
+
+        while True:
+            retry_after: float = 0.0
+            reading_body: bool = False
+            held: bool = False  # whether the retry waits for the circuit breaker
+
+            try:
+                # held requests wait before taking a rate limiter token
+                with self._guard(url) as guard:
+                    if self.rate_limiter is not None:
+                        self.rate_limiter.acquire(url)
+
+                    # the slot is held until the body is read, so its download
+                    # counts for the latency, errors and requests in flight
+                    with self._observe() as observation:
+                        response = self.session.get(
+                            url,
+                            headers=headers,
+                            timeout=self.timeout,
+                            stream=on_chunk is not None,
+                        )
+                        observation.status_code = response.status_code
+                        guard.status_code = response.status_code
+
+                        if not _is_retryable_status(response.status_code):
+                            reading_body = True
+                            body, chunk_error = _read_body(response, on_chunk)
+            except RETRYABLE_EXCEPTIONS as error:
+                held = self._is_held(url)
+
+                # a connection lost halfway is not retried, part of the body
+                # was already handed over
+                if reading_body or not self._should_retry(attempt, held):
+                    raise
+
+                logging.warning(f"Retrying {url} after {error!r}")
+            else:
+                if reading_body:
+                    if chunk_error is not None:
+                        raise chunk_error
+
+                    return response, body
+
+                held = self._is_held(url)
+
+                if not self._should_retry(attempt, held):
+                    raise requests.HTTPError(
+                        f"{response.status_code} for {url}", response=response
+                    )
+
+                logging.warning(f"Retrying {url} after {response.status_code}")
+                retry_after = _get_retry_after(response)
+                response.close()  # a streamed body is discarded
+
+            # held retries wait for the circuit's cool-down instead
+            if not held:
+                # only the thread making this request sleeps, other requests go on
+                delay: float = get_backoff_delay(
+                    attempt, self.backoff_base, self.backoff_max
+                )
+                time.sleep(max(delay, retry_after))
+
+            attempt += 1
+
+    def get(
+        self,
+        url: str,
+        keep: bool = False,
+        on_chunk: Optional[Callable[[bytes], None]] = None,
+    ) -> Page:
+        """
+        Send a GET request to "url".
+
+        Successful responses are stored in (and served from) the cache.
+        Expired webpages are revalidated with a conditional request.
+
+        Concurrent requests for the same url are coalesced: only one of them
+        is sent and all of them get its response.
+
+        If "keep" is True, the page is kept in memory and handed to the next
+        request for the same url, which is then not sent (for instance,
+        a default tournament page validated and then parsed).
+
+        If "on_chunk" is provided, the body of a webpage downloaded by this
+        request is handed to it chunk by chunk, as it arrives, and the page
+        is marked as streamed. Webpages from the cache, kept or coalesced
+        are not streamed.
+
+        Raises requests.RequestException if the request could not be made,
+        even after retrying it.
+        """
+
+        with self._flights_lock:
+            page: Optional[Page] = self._kept.pop(url, None)
+            flight: Optional[Future[Page]] = self._flights.get(url)
+
+            is_leader: bool = page is None and flight is None
+            if is_leader:
+                flight = self._flights[url] = Future()
+
+        if page is not None:
+            with self._stats_lock:
+                self.reused += 1
+
+            page = _as_not_streamed(page)
+        elif not is_leader:
+            with self._stats_lock:
+                self.coalesced += 1
+
+            # raises the leader's exception, if any
+            page = _as_not_streamed(flight.result())
+        else:
+            try:
+                page = self._get(url, on_chunk)
+                self._count_downloaded(page)
+                self._archive(page)
+                flight.set_result(page)
+            except BaseException as error:
+                flight.set_exception(error)
+                raise
+            finally:
+                with self._flights_lock:
+                    del self._flights[url]
+
+        if keep:
+            with self._flights_lock:
+                self._kept[url] = page
+
+        return page
+
+    def release(self, url: str) -> None:
+        """
+        Forget the kept page of "url", if any (it is not needed anymore).
+        """
+
+        with self._flights_lock:
+            self._kept.pop(url, None)
+
+    def _count_downloaded(self, page: Page) -> None:
+        if not page.from_cache:
+            self._thread_stats.downloaded = self.downloaded_bytes() + len(page.content)
+
+    def downloaded_bytes(self) -> int:
+        """
+        Number of bytes downloaded so far by requests of the calling thread.
+
+        Webpages from the cache, kept or coalesced are not counted.
+        """
+
+        return getattr(self._thread_stats, "downloaded", 0)
+
+    def _archive(self, page: Page) -> None:
+        if self.archive is None or page.status_code != OK_CODE:
+            return
+
+        # webpages from the cache are archived too (unless they already are),
+        # so that a run served from the cache can be replayed
+        if page.from_cache and self.archive.has(page.url):
+            return
+
+        self.archive.put(page.url, page.content)
+
+    def _get(
+        self, url: str, on_chunk: Optional[Callable[[bytes], None]] = None
+    ) -> Page:
+        if self.cache is None:
+            response, body = self._send(url, {}, on_chunk)
+
+            if body is None:
+                return Page(url, response.status_code, response.content)
+
+            return Page(url, response.status_code, body, streamed=True)
+
+        content: Optional[bytes] = self.cache.get(url)
+
+        if content is not None:
+            return Page(url, OK_CODE, content, from_cache=True)
+
+        stale: Optional[CachedResponse] = self.cache.get_stale(url)
+        headers: dict[str, str] = (
+            {} if stale is None else _get_conditional_headers(stale)
+        )
+
+        response, body = self._send(url, headers, on_chunk)
+
+        if stale is not None and response.status_code == NOT_MODIFIED_CODE:
+            self.cache.refresh(url)
+            return Page(url, OK_CODE, stale.content, from_cache=True)
+
+        content: bytes = response.content if body is None else body
+
+        if response.status_code == OK_CODE:
+            self.cache.put(
+                url,
+                content,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+
+        return Page(url, response.status_code, content, streamed=body is not None)
+
+    def _parse(self, parser: Callable[[bytes], T], webpage: bytes) -> T:
+        if self.parse_pool is None:
+            return parser(webpage)
+
+        return self.parse_pool.parse(parser, webpage)
+
+    def parse(self, url: str, parser: Callable[[bytes], T]) -> T:
+        """
+        Get webpage for url and extract information from it with "parser".
+
+        If the webpage did not change since it was last parsed (it came from
+        the cache), the stored value is returned and parsing is skipped.
+        Therefore, "parser"'s output must be json serializable
+        (tuples are returned as lists).
+
+        If the client has a parse pool, parsing happens in a worker process,
+        so "parser" must be a module-level function.
+        """
+
+        page: Page = self.get(url)
+
+        if self.cache is None:
+            return self._parse(parser, page.content)
+
+        parser_key: str = _get_parser_key(parser)
+
+        if page.from_cache:
+            value: Optional[T] = self.cache.get_parsed(url, parser_key)
+
+            if value is not None:
+                return value
+
+        value = self._parse(parser, page.content)
+
+        if page.status_code == OK_CODE:
+            self.cache.put_parsed(url, parser_key, value)
+
+        return value
+
+    def _finish_stream(self, stream_parser: StreamParser[T], page: Page) -> T:
+        if not page.streamed:
+            stream_parser.feed(page.content)
+
+        return stream_parser.finish()
+
+    def parse_stream(
+        self, url: str, parser_factory: Callable[[], StreamParser[T]]
+    ) -> T:
+        """
+        Same as parse, but the webpage is parsed while it is downloaded:
+        "parser_factory" creates a parser that is fed each chunk of the body
+        as soon as it arrives, so downloading and parsing overlap and
+        the whole parse tree is never built.
+
+        Webpages that were not downloaded (cache, coalesced requests)
+        are fed all at once.
+
+        The parser is not run in the parse pool, since chunks arrive
+        in the thread making the request.
+        """
+
+        stream_parser: StreamParser[T] = parser_factory()
+        page: Page = self.get(url, on_chunk=stream_parser.feed)
+
+        if self.cache is None:
+            return self._finish_stream(stream_parser, page)
+
+        parser_key: str = _get_parser_key(parser_factory)
+
+        if page.from_cache:
+            value: Optional[T] = self.cache.get_parsed(url, parser_key)
+
+            if value is not None:
+                return value
+
+        value = self._finish_stream(stream_parser, page)
+
+        if page.status_code == OK_CODE:
+            self.cache.put_parsed(url, parser_key, value)
+
+        return value
+
+    def report(self) -> str:
+        """
+        Summary of what the client did during the run.
+        """
+
+        budget: str = (
+            ""
+            if self.retry_budget is None
+            else f" (budget left: {self.retry_budget.remaining})"
+        )
+        cache: str = "disabled" if self.cache is None else self.cache.stats.report()
+        concurrency: str = (
+            "not limited" if self.concurrency is None else self.concurrency.report()
+        )
+
+        archive: str = "disabled" if self.archive is None else self.archive.report()
+        circuit_breaker: str = (
+            "disabled"
+            if self.circuit_breaker is None
+            else self.circuit_breaker.report()
+        )
+
+        return (
+            f"retries: {self.retries}{budget}\n"
+            f"requests coalesced: {self.coalesced}, pages reused: {self.reused}\n"
+            f"cache: {cache}\n"
+            f"archive: {archive}\n"
+            f"concurrency: {concurrency}\n"
+            f"circuit breaker: {circuit_breaker}"
+        )
+
+    def close(self) -> None:
+        self.session.close()
+
+        if self.cache is not None:
+            self.cache.close()
+
+        if self.archive is not None:
+            self.archive.close()
+
+
+_client: Optional[ScrapeClient] = None
+
+
+def get_client() -> ScrapeClient:
+    """
+    Returns the client used by the scrape package.
+
+    If none was set, a client with default parameters is created.
+    """
+
+    global _client
+
+    if _client is None:
+        _client = ScrapeClient()
+
+    return _client
+
+
+def set_client(client: ScrapeClient) -> None:
+    """
+    Replace the client used by the scrape package.
+    """
+
+    global _client
+
+    if _client is not None and _client is not client:
+        _client.close()
+
+    _client = client
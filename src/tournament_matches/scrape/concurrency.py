@@ -0,0 +1,216 @@
+import contextlib
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Iterator, Optional
+
+import requests
+
+# responses meaning the server wants us to slow down
+CONGESTION_CODES: set[int] = {429, 503}
+
+
+class Outcome(Enum):
+    OK = "ok"
+    ERROR = "error"
+    CONGESTION = "congestion"
+
+
+@dataclass
+class Observation:
+    """
+    What happened to one request. Filled in by whoever sends it.
+    """
+
+    status_code: Optional[int] = None
+
+
+@dataclass
+class LimitChange:
+    elapsed: float  # seconds since the limiter was created
+    limit: int
+    reason: str
+
+
+def classify_outcome(
+    status_code: Optional[int], error: Optional[BaseException]
+) -> Outcome:
+    """
+    Outcome of a request, from its status code or the exception it raised.
+    """
+
+    if isinstance(error, requests.Timeout):
+        return Outcome.CONGESTION
+
+    if error is not None:
+        return Outcome.ERROR
+
+    if status_code in CONGESTION_CODES:
+        return Outcome.CONGESTION
+
+    if status_code is not None and status_code >= 500:
+        return Outcome.ERROR
+
+    return Outcome.OK
+
+
+def _get_percentile(values: list[float], percentile: float) -> float:
+    ordered: list[float] = sorted(values)
+    index: int = max(0, math.ceil(percentile * len(ordered)) - 1)
+
+    return ordered[index]
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limits how many requests are in flight at the same time and tunes that
+    limit with an AIMD (additive increase, multiplicative decrease) rule:
+
+        - After every "window" requests, if their p95 latency is at most
+          "latency_target" and their error rate at most "max_error_rate",
+          the limit increases by one. Otherwise, it is multiplied by
+          "decrease_factor".
+
+        - A 429, a 503 or a timeout multiplies the limit by "decrease_factor"
+          right away (at most once per "limit" requests, so that requests
+          that failed together only count once).
+
+    The limit is always between "minimum" and "maximum".
+    Every change is recorded in "history".
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int,
+        maximum: int,
+        latency_target: float,
+        max_error_rate: float,
+        window: int = 20,
+        decrease_factor: float = 0.5,
+    ) -> None:
+        self.minimum: int = minimum
+        self.maximum: int = maximum
+        self.latency_target: float = latency_target
+        self.max_error_rate: float = max_error_rate
+        self.window: int = window
+        self.decrease_factor: float = decrease_factor
+
+        self.limit: int = min(maximum, max(minimum, initial))
+        self.history: list[LimitChange] = [LimitChange(0.0, self.limit, "initial")]
+
+        self._start: float = time.monotonic()
+        self._in_flight: int = 0
+        self._latencies: list[float] = []
+        self._errors: int = 0
+        # the first congestion signal always decreases the limit
+        self._since_decrease: int = self.limit
+        self._condition: threading.Condition = threading.Condition()
+
+    def acquire(self) -> None:
+        """
+        Wait until there is room for another request in flight.
+        """
+
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+
+            self._in_flight += 1
+
+    def release(self, latency: float, outcome: Outcome) -> None:
+        """
+        Report a finished request and free its slot.
+        """
+
+        with self._condition:
+            self._in_flight -= 1
+            self._record(latency, outcome)
+            self._condition.notify_all()
+
+    @contextlib.contextmanager
+    def slot(self) -> Iterator[Observation]:
+        """
+        Context manager holding a slot for one request.
+
+        The caller should set the observation's status_code; exceptions
+        (timeouts, connection errors, ...) are classified automatically.
+        """
+
+        observation: Observation = Observation()
+        error: Optional[BaseException] = None
+
+        self.acquire()
+        start: float = time.monotonic()
+
+        try:
+            yield observation
+        except BaseException as exception:
+            error = exception
+            raise
+        finally:
+            outcome: Outcome = classify_outcome(observation.status_code, error)
+            self.release(time.monotonic() - start, outcome)
+
+    def _set_limit(self, limit: int, reason: str) -> None:
+        limit = min(self.maximum, max(self.minimum, limit))
+
+        if limit == self.limit:
+            return
+
+        self.limit = limit
+        self.history.append(LimitChange(time.monotonic() - self._start, limit, reason))
+        logging.info(f"Concurrency limit set to {limit} ({reason}).")
+
+    def _decrease(self, reason: str) -> None:
+        # observations made with the previous limit are discarded
+        self._since_decrease = 0
+        self._latencies = []
+        self._errors = 0
+
+        self._set_limit(math.floor(self.limit * self.decrease_factor), reason)
+
+    def _record(self, latency: float, outcome: Outcome) -> None:
+        self._latencies.append(latency)
+        self._errors += outcome != Outcome.OK
+        self._since_decrease += 1
+
+        if outcome == Outcome.CONGESTION and self._since_decrease >= self.limit:
+            self._decrease("throttled")
+            return
+
+        if len(self._latencies) < self.window:
+            return
+
+        p95: float = _get_percentile(self._latencies, 0.95)
+        error_rate: float = self._errors / len(self._latencies)
+
+        self._latencies = []
+        self._errors = 0
+
+        if p95 > self.latency_target:
+            self._decrease(f"p95 latency {p95:.2f}s")
+        elif error_rate > self.max_error_rate:
+            self._decrease(f"error rate {error_rate:.0%}")
+        else:
+            self._set_limit(self.limit + 1, "healthy")
+
+    def report(self, last_changes: int = 10) -> str:
+        """
+        Current limit and its latest changes.
+        """
+
+        with self._condition:
+            peak: int = max(change.limit for change in self.history)
+            changes: str = ", ".join(
+                f"{change.elapsed:.0f}s: {change.limit} ({change.reason})"
+                for change in self.history[-last_changes:]
+            )
+
+            return (
+                f"limit {self.limit} (peak {peak}, "
+                f"{len(self.history) - 1} changes); latest: {changes}"
+            )
@@ -0,0 +1,243 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+DeadLetterEntry = dict[str, Any]
+
+
+@dataclass
+class DeadLetter:
+    """
+    Work that failed: "function" could not get anything from "path".
+    """
+
+    path: str  # /sport/country/name/ or /sport/country/name-year/
+    function: str
+    error: str  # class of the exception
+    message: str
+    failures: int  # times it failed, in this and previous runs
+    failed_at: float
+    # default path (/sport/country/current_name/) of its tournament, if known
+    tournament: Optional[str] = None
+
+
+@dataclass
+class DeadLetterStats:
+    recorded: int = 0
+    resolved: int = 0
+
+    def report(self) -> str:
+        return f"failures recorded: {self.recorded}, resolved: {self.resolved}"
+
+
+def _read_entries(path: Path) -> list[DeadLetterEntry]:
+    if not path.exists():
+        return []
+
+    entries: list[DeadLetterEntry] = []
+
+    with open(path, "r") as dead_letters_file:
+        for line in dead_letters_file:
+            if not line.strip():
+                continue
+
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                # last line may be incomplete if the run was interrupted
+                logging.warning(f"Ignoring corrupted dead letter line: {line!r}")
+
+    return entries
+
+
+class DeadLetters:
+    """
+    Append-only record of scraping work that failed (requests that failed
+    even after retrying, or webpages that could not be parsed), one json
+    per line:
+
+        {"path": ..., "function": ..., "error": ..., "message": ..., "failed_at": ...}
+            "function" failed for "path" with an exception of class "error".
+
+        {"path": ..., "tournament": ...}
+            Failed work for "path" belongs to the tournament whose default
+            path is "tournament" (seasons are retried with its current name).
+
+        {"path": ..., "resolved": true}
+            Work for "path" succeeded when it was retried.
+
+    Failed work is skipped (its result is empty), so the run goes on.
+    Pending entries are retried later (see web_scrape_failed_seasons).
+
+    Several processes (queue workers) may record to the same file.
+
+    -----
+    Parameters:
+
+        path: Path
+            Dead letters file. Entries of previous runs are kept.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.stats: DeadLetterStats = DeadLetterStats()
+        self._pending: dict[str, DeadLetter] = {}
+
+        for entry in _read_entries(path):
+            self._apply(entry)
+
+        logging.info(f"Dead letters {path}: {len(self._pending)} pending.")
+
+        self._lock: threading.Lock = threading.Lock()
+        self._file = open(path, "a")
+
+        # an incomplete last line must not be glued to the next entry
+        if self._file.tell() > 0:
+            self._file.write("\n")
+
+    def _apply(self, entry: DeadLetterEntry) -> None:
+        path: str = entry["path"]
+
+        if entry.get("resolved"):
+            self._pending.pop(path, None)
+            return
+
+        previous: Optional[DeadLetter] = self._pending.get(path)
+
+        if "function" not in entry:  # tournament of a pending failure
+            if previous is not None:
+                previous.tournament = entry["tournament"]
+
+            return
+
+        self._pending[path] = DeadLetter(
+            path,
+            entry["function"],
+            entry["error"],
+            entry["message"],
+            1 if previous is None else previous.failures + 1,
+            entry["failed_at"],
+            None if previous is None else previous.tournament,
+        )
+
+    def _append(self, entry: DeadLetterEntry) -> None:
+        line: str = json.dumps(entry) + "\n"
+
+        with self._lock:
+            self._apply(entry)
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def record(self, path: str, function: str, error: BaseException) -> None:
+        """
+        Record that "function" failed for "path" with "error".
+        """
+
+        self._append(
+            {
+                "path": path,
+                "function": function,
+                "error": type(error).__name__,
+                "message": str(error),
+                "failed_at": time.time(),
+            }
+        )
+
+        with self._lock:
+            self.stats.recorded += 1
+
+    def set_tournament(self, path: str, tournament: str) -> None:
+        """
+        Record the default path of the tournament of "path", if its work
+        failed (so it can be retried without finding every tournament's
+        seasons again).
+        """
+
+        with self._lock:
+            dead_letter: Optional[DeadLetter] = self._pending.get(path)
+
+        if dead_letter is None or dead_letter.tournament == tournament:
+            return
+
+        self._append({"path": path, "tournament": tournament})
+
+    def resolve(self, path: str) -> None:
+        """
+        Record that work for "path" succeeded, if it had failed.
+        """
+
+        if path not in self._pending:
+            return
+
+        self._append({"path": path, "resolved": True})
+
+        with self._lock:
+            self.stats.resolved += 1
+
+    def get_failures(self, path: str) -> int:
+        """
+        Number of times work for "path" failed (0 if it is not pending).
+        """
+
+        with self._lock:
+            dead_letter: Optional[DeadLetter] = self._pending.get(path)
+
+        return 0 if dead_letter is None else dead_letter.failures
+
+    def pending(self) -> list[DeadLetter]:
+        """
+        Work that failed and was not resolved yet.
+        """
+
+        with self._lock:
+            return list(self._pending.values())
+
+    def report(self) -> str:
+        errors: Counter[str] = Counter(letter.error for letter in self.pending())
+        by_error: str = ", ".join(
+            f"{error}: {count}" for error, count in errors.items()
+        )
+
+        return (
+            f"{sum(errors.values())} pending ({by_error or 'none'}); "
+            f"{self.stats.report()}"
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+_dead_letters: Optional[DeadLetters] = None
+
+
+def get_dead_letters() -> Optional[DeadLetters]:
+    """
+    Returns the dead letters of the scrape package, if any.
+    """
+
+    return _dead_letters
+
+
+def set_dead_letters(dead_letters: Optional[DeadLetters]) -> None:
+    """
+    Replace the dead letters of the scrape package.
+
+    If None, failed requests are only logged and webpages that can not be
+    parsed stop the run.
+    """
+
+    global _dead_letters
+
+    if _dead_letters is not None and _dead_letters is not dead_letters:
+        _dead_letters.close()
+
+    _dead_letters = dead_letters
@@ -1,10 +1,10 @@
 import logging
 
-import requests
 from bs4 import BeautifulSoup, ResultSet, Tag
 
 from logs import log
 
+from .client import get_client
 from .utils import HOMEPAGE, get_sport
 
 
@@ -64,7 +64,7 @@ def get_tournament_url_paths(sports: set[str]) -> list[str]:
                 /sports/country/tournament_name/
     """
 
-    bet_content: bytes = requests.get(HOMEPAGE).content
+    bet_content: bytes = get_client().get(HOMEPAGE).content
     bet_soup: BeautifulSoup = BeautifulSoup(bet_content, "html.parser")
 
     paths: list[str] = _get_tournament_url_paths_from_homepage(bet_soup, sports)
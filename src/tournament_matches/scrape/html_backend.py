@@ -0,0 +1,139 @@
+import logging
+from typing import Any, Optional
+
+from bs4 import UnicodeDammit
+
+try:
+    import lxml.etree
+    import lxml.html
+
+    LXML_AVAILABLE: bool = True
+except ImportError:  # lxml is optional, BeautifulSoup is used instead
+    LXML_AVAILABLE = False
+
+# "bs4" (BeautifulSoup with html.parser) is the reference implementation
+BACKENDS: list[str] = ["bs4", "lxml"]
+
+Element = Any  # lxml.html.HtmlElement
+RawRow = tuple[list[str], list[str]]  # (text inside each "td", "data-odd" values)
+
+# same elements BeautifulSoup finds in scrape_matches.py and season_years.py
+SUBMENU_LINKS: str = (
+    '//ul[normalize-space(@class)="list-tabs list-tabs--secondary"]' "//a"
+)
+MATCH_TABLE: str = '(//div[@id="js-leagueresults-all"])[1]'
+GROUP_HEADERS: str = (
+    './/th[contains(concat(" ", normalize-space(@class), " "), " h-text-left ")]'
+)
+MATCH_ROWS: str = ".//tr[not(.//th)]"
+ODDS: str = ".//*[@data-odd]/@data-odd"
+SEASON_OPTIONS: str = (
+    '(//div[contains(concat(" ", normalize-space(@class), " "),'
+    ' " wrap-section__header__select ")])[1]//option[@value]'
+)
+
+if LXML_AVAILABLE:
+    # selectors are compiled only once
+    SELECTORS: dict[str, Any] = {
+        selector: lxml.etree.XPath(selector)
+        for selector in [
+            SUBMENU_LINKS,
+            MATCH_TABLE,
+            GROUP_HEADERS,
+            MATCH_ROWS,
+            ODDS,
+            SEASON_OPTIONS,
+        ]
+    }
+
+_backend: str = "lxml" if LXML_AVAILABLE else "bs4"
+
+
+def get_parser_backend() -> str:
+    return _backend
+
+
+def set_parser_backend(backend: str) -> None:
+    """
+    Select which backend parses webpages: "bs4" or "lxml".
+
+    Both of them extract exactly the same information, but lxml is faster.
+    """
+
+    global _backend
+
+    if backend not in BACKENDS:
+        logging.error(f"Invalid parser backend: {backend}")
+        raise ValueError(f"Only valid parser backends are: {BACKENDS}.")
+
+    if backend == "lxml" and not LXML_AVAILABLE:
+        logging.error("lxml is not installed.")
+        raise ValueError("Parser backend 'lxml' requires lxml to be installed.")
+
+    _backend = backend
+
+
+def parse_html(webpage: bytes) -> Element:
+    # encoding is detected the same way BeautifulSoup does it
+    markup: str = UnicodeDammit(webpage, is_html=True).unicode_markup
+
+    try:
+        return lxml.html.document_fromstring(markup)
+    except lxml.etree.ParserError:  # empty webpage
+        return lxml.html.Element("html")
+
+
+def _get_text(element: Element) -> str:
+    return element.text_content().strip()
+
+
+def _select(element: Element, selector: str) -> list[Any]:
+    return SELECTORS[selector](element)
+
+
+def get_main_section_query(tree: Element) -> str:
+    """
+    See scrape_matches._get_main_section_query.
+    """
+
+    for option in _select(tree, SUBMENU_LINKS):
+        if _get_text(option).lower() == "main":
+            return option.attrib["href"] + "&month=all"
+
+    return ""
+
+
+def _get_raw_row(row: Element) -> RawRow:
+    return [_get_text(column) for column in row.iter("td")], _select(row, ODDS)
+
+
+def get_match_rows(tree: Element) -> Optional[list[RawRow]]:
+    """
+    Text inside each column and odds of each match (as strings).
+
+    Returns None if the season should be ignored
+    (see scrape_matches._should_ignore_tournament).
+    """
+
+    match_tables: list[Element] = _select(tree, MATCH_TABLE)
+
+    if not match_tables:
+        return None
+
+    group_headers: list[Element] = _select(match_tables[0], GROUP_HEADERS)
+    if any("group" in th.text_content().lower() for th in group_headers):
+        return None
+
+    return [_get_raw_row(row) for row in _select(match_tables[0], MATCH_ROWS)]
+
+
+def get_season_options(tree: Element) -> list[tuple[str, str, bool]]:
+    """
+    Value, text and whether it is selected, for each option
+    of the season dropdown menu.
+    """
+
+    return [
+        (option.attrib["value"], _get_text(option), "selected" in option.attrib)
+        for option in _select(tree, SEASON_OPTIONS)
+    ]
@@ -0,0 +1,149 @@
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from .scrape_matches import Matches
+
+JournalEntry = dict[str, Any]
+SeasonsKey = tuple[str, tuple[str, ...], tuple[str, ...]]
+
+
+def _get_seasons_key(
+    path: str, first_season: Iterable[str], last_season: Iterable[str]
+) -> SeasonsKey:
+    # json turns tuples into lists, so both are converted to tuples
+    return path, tuple(first_season), tuple(last_season)
+
+
+def _read_entries(path: Path) -> list[JournalEntry]:
+    if not path.exists():
+        return []
+
+    entries: list[JournalEntry] = []
+
+    with open(path, "r") as journal_file:
+        for line in journal_file:
+            if not line.strip():
+                continue
+
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                # last line may be incomplete if the run was interrupted
+                logging.warning(f"Ignoring corrupted journal line: {line!r}")
+
+    return entries
+
+
+class ScrapeJournal:
+    """
+    Append-only journal of completed scraping work, one json per line:
+
+        {"path": ..., "first": ..., "last": ..., "season_paths": [...]}
+            Desired seasons of a tournament (/sport/country/name/).
+
+        {"season_path": ..., "matches": [...] | null}
+            Matches of a season (/sport/country/name-year/).
+
+    Every entry is flushed to disk as soon as it is recorded, so
+    an interrupted run can be resumed from where it stopped.
+
+    Only non-empty results are recorded: empty ones may have been
+    caused by failed requests, so they are scraped again when resuming.
+
+    -----
+    Parameters:
+
+        path: Path
+            Journal file.
+
+        resume: bool
+            If True, entries of a previous run are kept and can be reused.
+            Otherwise, the journal starts empty.
+    """
+
+    def __init__(self, path: Path, resume: bool) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        entries: list[JournalEntry] = _read_entries(path) if resume else []
+
+        self._season_paths: dict[SeasonsKey, list[str]] = {}
+        self._matches: dict[str, Optional[Matches]] = {}
+
+        for entry in entries:
+            if "path" in entry:
+                key = _get_seasons_key(entry["path"], entry["first"], entry["last"])
+                self._season_paths[key] = entry["season_paths"]
+            else:
+                self._matches[entry["season_path"]] = entry["matches"]
+
+        logging.info(
+            f"Journal {path}: {len(self._season_paths)} tournaments and "
+            f"{len(self._matches)} seasons recorded."
+        )
+
+        self._lock: threading.Lock = threading.Lock()
+        self._file = open(path, "a" if resume else "w")
+
+        # an incomplete last line must not be glued to the next entry
+        if self._file.tell() > 0:
+            self._file.write("\n")
+
+    def _append(self, entry: JournalEntry) -> None:
+        line: str = json.dumps(entry) + "\n"
+
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def get_season_paths(
+        self, path: str, first_season: Iterable[str], last_season: Iterable[str]
+    ) -> Optional[list[str]]:
+        """
+        Recorded desired seasons of a tournament, if there are any.
+        """
+
+        return self._season_paths.get(_get_seasons_key(path, first_season, last_season))
+
+    def record_season_paths(
+        self,
+        path: str,
+        first_season: Iterable[str],
+        last_season: Iterable[str],
+        season_paths: list[str],
+    ) -> None:
+        if not season_paths:
+            return
+
+        key: SeasonsKey = _get_seasons_key(path, first_season, last_season)
+        self._season_paths[key] = season_paths
+        self._append(
+            {
+                "path": path,
+                "first": list(key[1]),
+                "last": list(key[2]),
+                "season_paths": season_paths,
+            }
+        )
+
+    def has_matches(self, season_path: str) -> bool:
+        return season_path in self._matches
+
+    def get_matches(self, season_path: str) -> Optional[Matches]:
+        return self._matches[season_path]
+
+    def record_matches(self, season_path: str, matches: Optional[Matches]) -> None:
+        # None means the season was ignored (see web_scrape_matches_information)
+        if matches is not None and not matches:
+            return
+
+        self._matches[season_path] = matches
+        self._append({"season_path": season_path, "matches": matches})
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
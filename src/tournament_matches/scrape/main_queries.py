@@ -0,0 +1,197 @@
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from .cache import SEASON_YEARS_RE
+
+
+def get_tournament_path(season_path: str) -> str:
+    """
+    Default path of a season's tournament.
+
+    Example: /soccer/england/premier-league-2012-2013/
+        -> /soccer/england/premier-league/
+    """
+
+    return SEASON_YEARS_RE.sub("", season_path.rstrip("/")) + "/"
+
+
+@dataclass
+class QueryStats:
+    known: int = 0  # seasons whose query was already recorded
+    guessed: int = 0
+    wrong_guesses: int = 0
+    learned: int = 0
+
+    def report(self) -> str:
+        return (
+            f"known: {self.known}, guessed: {self.guessed} "
+            f"(wrong: {self.wrong_guesses}), learned: {self.learned}"
+        )
+
+
+class MainSectionQueries:
+    """
+    Persistent record of the "main" section query of each season
+    ("" if the season's results are all in its /results/ webpage).
+
+    Tournaments like "nba" split their results in sections, so their /results/
+    webpage only has the query to the "main" section (see _get_main_section_query).
+    Once the query of a season is known, its main section can be requested
+    right away, without downloading and parsing /results/ first.
+
+    If all recorded seasons of a tournament (at least two of them) share the
+    same query, it is guessed for the tournament's other seasons as well.
+    Once a guess is wrong (queries of its seasons differ, such as
+    season-specific stages), the tournament is never guessed again.
+
+    -----
+    Parameters:
+
+        path: Path
+            File where the queries are stored.
+
+        read_only: bool
+            If True, queries are neither recorded nor guessed (replay: only
+            the webpages requested by previous runs were archived).
+    """
+
+    def __init__(self, path: Path, read_only: bool = False) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.read_only: bool = read_only
+        self.stats: QueryStats = QueryStats()
+
+        # the same connection is used by all scraping threads
+        self._lock: threading.Lock = threading.Lock()
+        self._connection: sqlite3.Connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS queries ("
+            " season_path TEXT PRIMARY KEY,"
+            " tournament_path TEXT NOT NULL,"
+            " query TEXT NOT NULL"
+            ")"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS tournament ON queries (tournament_path)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS wrong_guesses ("
+            " tournament_path TEXT PRIMARY KEY"
+            ")"
+        )
+
+    def get(self, season_path: str) -> Optional[str]:
+        """
+        Recorded query of season_path, if there is one.
+        """
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT query FROM queries WHERE season_path = ?", (season_path,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            self.stats.known += 1
+
+        return row[0]
+
+    def guess(self, season_path: str) -> Optional[str]:
+        """
+        Query shared by all recorded seasons of season_path's tournament,
+        if there are at least two of them, they need a main section and
+        no guess was wrong for the tournament.
+        """
+
+        if self.read_only:
+            return None
+
+        tournament_path: str = get_tournament_path(season_path)
+
+        with self._lock:
+            if self._connection.execute(
+                "SELECT 1 FROM wrong_guesses WHERE tournament_path = ?",
+                (tournament_path,),
+            ).fetchone():
+                return None
+
+            queries: set[str] = set()
+            seasons: int = 0
+
+            for (query,) in self._connection.execute(
+                "SELECT query FROM queries WHERE tournament_path = ?",
+                (tournament_path,),
+            ):
+                queries.add(query)
+                seasons += 1
+
+            if seasons < 2 or len(queries) != 1 or "" in queries:
+                return None
+
+            self.stats.guessed += 1
+
+        return queries.pop()
+
+    def record_wrong_guess(self, season_path: str) -> None:
+        """
+        Record that the query guessed for season_path was wrong, so its
+        tournament is not guessed anymore.
+        """
+
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO wrong_guesses (tournament_path) VALUES (?)",
+                (get_tournament_path(season_path),),
+            )
+            self.stats.wrong_guesses += 1
+
+    def record(self, season_path: str, query: str) -> None:
+        if self.read_only:
+            return
+
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO queries (season_path, tournament_path, query)"
+                " VALUES (?, ?, ?)",
+                (season_path, get_tournament_path(season_path), query),
+            )
+            self.stats.learned += 1
+
+    def report(self) -> str:
+        return self.stats.report()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+_queries: Optional[MainSectionQueries] = None
+
+
+def get_main_section_queries() -> Optional[MainSectionQueries]:
+    """
+    Returns the main section queries used by the scrape package, if any.
+    """
+
+    return _queries
+
+
+def set_main_section_queries(queries: Optional[MainSectionQueries]) -> None:
+    """
+    Replace the main section queries used by the scrape package.
+
+    If None, every season's /results/ webpage is downloaded first.
+    """
+
+    global _queries
+
+    if _queries is not None and _queries is not queries:
+        _queries.close()
+
+    _queries = queries
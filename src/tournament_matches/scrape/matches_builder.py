@@ -0,0 +1,89 @@
+from array import array
+
+import numpy as np
+import pandas as pd
+
+from .scrape_matches import Matches
+
+# odds are stored with single precision: they have at most two decimal places
+ODDS_DTYPE: type = np.float32
+ODDS_TYPECODE: str = "f"  # array.array's code for float32
+
+MATCH_COLUMNS: list[str] = ["teams", "result", "date"]
+
+# some sports don't have ties and because of it they only have two odds
+ODDS_COLUMNS: dict[int, list[str]] = {
+    2: ["odds home", "odds away"],
+    3: ["odds home", "odds tie", "odds away"],
+}
+
+
+class MatchesBuilder:
+    """
+    Columnar accumulator of matches.
+
+    Each column of the matches is appended to its own list (teams, result
+    and date) or array (odds, as float32), and the id of a season is stored
+    only once, with its number of matches. The data frame is only created
+    in "build", so matches are copied once instead of once per season.
+
+    Seasons with fewer odds than others have their missing odds set to NaN.
+    """
+
+    def __init__(self) -> None:
+        self._ids: list[str] = []
+        self._counts: list[int] = []  # number of matches of each id
+
+        self._columns: list[list[str]] = [[] for _ in MATCH_COLUMNS]
+        self._odds: list[array] = []  # one array per odds column
+
+    def __len__(self) -> int:
+        return len(self._columns[0])
+
+    def _add_odds_column(self) -> None:
+        # matches added before the new column do not have those odds
+        self._odds.append(array(ODDS_TYPECODE, [np.nan]) * len(self))
+
+    def add(self, id: str, matches: Matches) -> None:
+        """
+        Append matches of season "id".
+        """
+
+        if not matches:
+            return
+
+        self._ids.append(id)
+        self._counts.append(len(matches))
+
+        for match in matches:
+            odds: list[float] = match[len(MATCH_COLUMNS) :]
+
+            while len(self._odds) < len(odds):
+                self._add_odds_column()
+
+            for column, value in zip(self._columns, match):
+                column.append(value)
+
+            for position, column in enumerate(self._odds):
+                column.append(odds[position] if position < len(odds) else np.nan)
+
+    def build(self) -> pd.DataFrame:
+        """
+        Data frame with all matches added, in the same format as
+        web_scrape_from_provided_paths' output.
+        """
+
+        index: pd.Index = pd.Index(
+            np.repeat(np.array(self._ids, dtype=object), self._counts), name="id"
+        )
+
+        data: dict[str, object] = dict(zip(MATCH_COLUMNS, self._columns))
+        data.update(
+            zip(
+                ODDS_COLUMNS[len(self._odds)],
+                (np.frombuffer(column, dtype=ODDS_DTYPE) for column in self._odds),
+            )
+        )
+
+        # copied, so that the builder's arrays can still grow
+        return pd.DataFrame(data, index=index, copy=True)
@@ -0,0 +1,159 @@
+import csv
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import IO, Optional
+
+from .matches_builder import MATCH_COLUMNS, ODDS_COLUMNS
+from .scrape_matches import Match, Matches
+
+PARTIAL_SUFFIX: str = ".partial"  # rows written so far, without header
+TEMPORARY_SUFFIX: str = ".tmp"  # final file, before it is renamed
+
+# a match is identified by its season id, teams and date (see SeasonIndex)
+MatchKey = tuple[str, str, str]
+
+_TEAMS: int = 1 + MATCH_COLUMNS.index("teams")  # position in a csv row
+_DATE: int = 1 + MATCH_COLUMNS.index("date")
+
+
+def get_match_key(id: str, match: Match) -> MatchKey:
+    return id, str(match[_TEAMS - 1]), str(match[_DATE - 1])
+
+
+def copy_unreplaced_matches(
+    previous_file: IO[str], output_file: IO[str], replaced: set[MatchKey]
+) -> None:
+    """
+    Copy a csv file of matches (header included), except the matches that
+    are replaced by newer versions (incremental mode appends changed matches).
+    """
+
+    writer = csv.writer(output_file, lineterminator="\n")
+
+    for i, row in enumerate(csv.reader(previous_file)):
+        if i == 0 or (row[0], row[_TEAMS], row[_DATE]) not in replaced:
+            writer.writerow(row)
+
+
+class _SportFile:
+    # rows of one sport, appended to "{sport}.csv.partial" as they arrive
+    def __init__(self, file_path: Path, append: bool) -> None:
+        self.file_path: Path = file_path
+        self.partial_path: Path = file_path.with_name(file_path.name + PARTIAL_SUFFIX)
+        self.append: bool = append
+
+        self._file: IO[str] = open(self.partial_path, "w", newline="")
+        self._writer = csv.writer(self._file, lineterminator="\n")
+
+        self.num_odds: int = 0
+        # appended matches replace their previous versions (only deltas are kept)
+        self.keys: set[MatchKey] = set()
+
+    def write(self, id: str, matches: Matches) -> None:
+        for match in matches:
+            self._writer.writerow([id, *match])
+
+            if self.append:
+                self.keys.add(get_match_key(id, match))
+
+        # odds count of the header is only known when all seasons are written
+        self.num_odds = max(
+            self.num_odds, *(len(match) - len(MATCH_COLUMNS) for match in matches)
+        )
+        self._file.flush()
+
+    def finalize(self) -> None:
+        self._file.close()
+
+        temporary_path: Path = self.file_path.with_name(
+            self.file_path.name + TEMPORARY_SUFFIX
+        )
+
+        with open(temporary_path, "w", newline="") as temporary_file:
+            if self.append and self.file_path.exists():
+                with open(self.file_path, "r", newline="") as previous_file:
+                    copy_unreplaced_matches(previous_file, temporary_file, self.keys)
+            else:
+                header: list[str] = ["id", *MATCH_COLUMNS, *ODDS_COLUMNS[self.num_odds]]
+                csv.writer(temporary_file, lineterminator="\n").writerow(header)
+
+            with open(self.partial_path, "r", newline="") as partial_file:
+                shutil.copyfileobj(partial_file, temporary_file)
+
+        # a reader never sees a half-written file
+        os.replace(temporary_path, self.file_path)
+        self.partial_path.unlink()
+
+
+class MatchesWriter:
+    """
+    Writes the matches of each season to "{sport}.csv" as soon as they
+    are scraped, instead of keeping all of them in memory.
+
+    Rows are appended to "{sport}.csv.partial", so what was scraped is
+    always on disk. When closed, each sport's header and rows are written
+    to a temporary file, which then replaces "{sport}.csv" atomically:
+    if the run is interrupted, previous files are left untouched.
+
+    Files have the same format as save_web_scraped_matches'. Odds missing
+    from some seasons (fewer odds than others) are read as NaN.
+
+    It is thread safe, so seasons scraped concurrently are written in the
+    order they are done.
+
+    -----
+    Parameters:
+
+        directory_path: Path
+            Path to the folder where files are saved.
+
+        append: bool
+            If True, matches are appended to existing files (incremental mode):
+            previous versions of the appended matches (same season, teams and
+            date) are removed. Otherwise, files are rewritten.
+    """
+
+    def __init__(self, directory_path: Path, append: bool = False) -> None:
+        directory_path.mkdir(parents=True, exist_ok=True)
+
+        self.directory_path: Path = directory_path
+        self.append: bool = append
+
+        self.written: dict[str, int] = {}  # number of matches per sport
+
+        self._files: dict[str, _SportFile] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def write(self, sport: str, id: str, matches: Optional[Matches]) -> None:
+        """
+        Write matches of season "id".
+        """
+
+        if not matches:
+            return
+
+        with self._lock:
+            if sport not in self._files:
+                self._files[sport] = _SportFile(
+                    self.directory_path / f"{sport}.csv", self.append
+                )
+                self.written[sport] = 0
+
+            self._files[sport].write(id, matches)
+            self.written[sport] += len(matches)
+
+    def report(self) -> str:
+        return f"matches written per sport: {self.written}"
+
+    def close(self) -> None:
+        """
+        Finalize every sport's file.
+        """
+
+        with self._lock:
+            for sport_file in self._files.values():
+                sport_file.finalize()
+
+            self._files.clear()
@@ -0,0 +1,115 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional, TypeVar
+
+from .html_backend import get_parser_backend, set_parser_backend
+from .webpage_regions import is_partial_parsing_enabled, set_partial_parsing
+
+T = TypeVar("T")
+
+# workers are started lazily, by fetcher threads that may hold locks (sqlite
+# connections, the client's): they must not be forked from them
+START_METHOD: str = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+def _initialize_worker(parser_backend: str, partial_parsing: bool) -> None:
+    # worker processes parse webpages the same way the main process does
+    set_parser_backend(parser_backend)
+    set_partial_parsing(partial_parsing)
+
+
+@dataclass
+class ParseStats:
+    parsed: int = 0
+    peak_pending: int = 0  # webpages being parsed or waiting for a worker
+    blocked: float = 0.0  # seconds fetchers waited for room in the queue
+
+    def report(self) -> str:
+        return (
+            f"parsed: {self.parsed}, peak pending: {self.peak_pending}, "
+            f"fetchers blocked for {self.blocked:.1f}s"
+        )
+
+
+class ParsePool:
+    """
+    Pool of worker processes that parse webpages, so that parsing
+    (CPU-bound) does not compete with fetching for the GIL.
+
+    At most "workers + queue_size" webpages are pending (being parsed or
+    waiting for a worker). When the queue is full, whoever fetched a webpage
+    waits before handing it over, so no more webpages are fetched until
+    the workers catch up (backpressure) and memory stays bounded.
+
+    -----
+    Parameters:
+
+        workers: Optional[int]
+            Number of worker processes. If None, one per core.
+
+        queue_size: int
+            Maximum number of webpages waiting for a worker.
+    """
+
+    def __init__(self, workers: Optional[int], queue_size: int) -> None:
+        self.workers: int = workers or os.cpu_count() or 1
+        self.queue_size: int = queue_size
+        self.stats: ParseStats = ParseStats()
+
+        self._executor: ProcessPoolExecutor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(START_METHOD),
+            initializer=_initialize_worker,
+            initargs=(get_parser_backend(), is_partial_parsing_enabled()),
+        )
+        self._slots: threading.BoundedSemaphore = threading.BoundedSemaphore(
+            self.capacity
+        )
+        self._pending: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.queue_size
+
+    def _acquire(self) -> None:
+        start: float = time.monotonic()
+        self._slots.acquire()
+
+        with self._lock:
+            self._pending += 1
+            self.stats.peak_pending = max(self.stats.peak_pending, self._pending)
+            self.stats.blocked += time.monotonic() - start
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+            self.stats.parsed += 1
+
+        self._slots.release()
+
+    def parse(self, parser: Callable[[bytes], T], webpage: bytes) -> T:
+        """
+        Parse webpage with "parser" in a worker process and wait for the result.
+
+        "parser" must be a module-level function (it is pickled).
+        """
+
+        self._acquire()
+
+        try:
+            return self._executor.submit(parser, webpage).result()
+        finally:
+            self._release()
+
+    def report(self) -> str:
+        return f"{self.workers} workers; {self.stats.report()}"
+
+    def close(self) -> None:
+        self._executor.shutdown()
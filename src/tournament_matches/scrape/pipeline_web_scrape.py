@@ -0,0 +1,78 @@
+import logging
+from typing import Optional
+
+import pandas as pd
+
+from logs import log
+
+from .async_web_scrape import async_web_scrape_from_provided_paths
+from .client import ScrapeClient, get_client
+from .journal import ScrapeJournal
+from .matches_writer import MatchesWriter
+from .parse_pool import ParsePool
+from .season_costs import SeasonCosts
+from .season_index import SeasonIndex
+
+
+@log(logging.info)
+def pipeline_web_scrape_from_provided_paths(
+    paths: list[str],
+    first_season: tuple[str, str],
+    last_season: tuple[str, str],
+    fetch_workers: int,
+    parse_pool: ParsePool,
+    journal: Optional[ScrapeJournal] = None,
+    index: Optional[SeasonIndex] = None,
+    writer: Optional[MatchesWriter] = None,
+    costs: Optional[SeasonCosts] = None,
+) -> dict[str, pd.DataFrame]:
+    """
+    Version of async_web_scrape_from_provided_paths split in two stages:
+
+        - Fetching: worker threads download webpages.
+        - Parsing: "parse_pool"'s worker processes extract information
+          from the downloaded webpages.
+
+    Threads waiting for (or holding) a parse slot are not fetching, so there
+    are "fetch_workers" threads on top of the parse pool's capacity.
+    When the parse pool is full, fetching stops until it catches up.
+
+    Output is the same as web_scrape_from_provided_paths'.
+
+    --------
+    Parameters:
+
+        path: list[str]
+        first_season: tuple[str, str]
+        last_season: tuple[str, str]
+        journal: Optional[ScrapeJournal]
+        index: Optional[SeasonIndex]
+        writer: Optional[MatchesWriter]
+        costs: Optional[SeasonCosts]
+            See async_web_scrape_from_provided_paths.
+
+        fetch_workers: int
+            Number of threads fetching webpages.
+
+        parse_pool: ParsePool
+            Worker processes parsing webpages.
+    """
+
+    client: ScrapeClient = get_client()
+    previous_pool: Optional[ParsePool] = client.parse_pool
+    client.parse_pool = parse_pool
+
+    try:
+        return async_web_scrape_from_provided_paths(
+            paths,
+            first_season,
+            last_season,
+            fetch_workers + parse_pool.capacity,
+            journal,
+            index,
+            writer,
+            costs,
+        )
+    finally:
+        client.parse_pool = previous_pool
+        logging.info(f"Parse pool: {parse_pool.report()}")
@@ -0,0 +1,198 @@
+import logging
+from pathlib import Path
+from typing import Optional
+
+from logs import log
+
+from .journal import ScrapeJournal
+from .matches_writer import MatchesWriter
+from .scheduling import is_past_deadline, schedule_seasons
+from .season_costs import SeasonCosts
+from .season_index import SeasonIndex
+from .shards import SHARD_SUFFIX, ShardWriter, merge_shards, remove_shards
+from .utils import get_sport, get_tournament_name
+from .web_scrape import _get_path_to_desired_seasons, _web_scrape_season_matches
+from .work_queue import Task, WorkQueue
+
+
+@log(logging.info)
+def queue_season_paths(
+    queue: WorkQueue,
+    paths: list[str],
+    first_season: tuple[str, str],
+    last_season: tuple[str, str],
+    journal: Optional[ScrapeJournal] = None,
+    index: Optional[SeasonIndex] = None,
+    costs: Optional[SeasonCosts] = None,
+    shard_directory: Optional[Path] = None,
+) -> int:
+    """
+    Coordinator: find the desired seasons of each tournament and queue them,
+    so that workers (see web_scrape_from_queue) can scrape them.
+
+    Every call starts a new run: the tasks of the previous run are removed
+    from the queue (so seasons done before are scraped again) and so are
+    its shards, which must have been merged already.
+
+    Seasons are queued in order, and workers claim them in the order given by
+    schedule_seasons: by freshness, then the most costly first.
+
+    Returns the number of seasons queued.
+
+    --------
+    Parameters:
+
+        queue: WorkQueue
+            Queue shared by the coordinator and all workers.
+
+        path: list[str]
+        first_season: tuple[str, str]
+        last_season: tuple[str, str]
+        journal: Optional[ScrapeJournal]
+        index: Optional[SeasonIndex]
+        costs: Optional[SeasonCosts]
+            See web_scrape_from_provided_paths.
+
+        shard_directory: Optional[Path]
+            Folder with the shards of all workers (see web_scrape_from_queue).
+    """
+
+    pending: int = queue.clear()
+
+    if pending:
+        logging.warning(f"{pending} seasons of the previous run were not scraped.")
+
+    if shard_directory is not None:
+        remove_shards(shard_directory)
+
+    seasons: list[tuple[str, str]] = []  # (name, season_path) of every tournament
+
+    for path in paths:  # path: /sport/country/current_name/
+        name: str = get_tournament_name(path)
+        season_paths: list[str] = _get_path_to_desired_seasons(
+            path, first_season, last_season, journal
+        )
+
+        seasons.extend((name, season_path) for season_path in season_paths)
+
+    priorities: list[int] = [0] * len(seasons)
+    order: list[int] = schedule_seasons([path for _, path in seasons], index, costs)
+
+    for priority, i in enumerate(order):
+        priorities[i] = priority
+
+    return queue.put(
+        (name, season_path, priority)
+        for (name, season_path), priority in zip(seasons, priorities)
+    )
+
+
+def _scrape_task(
+    task: Task,
+    shard: ShardWriter,
+    index: Optional[SeasonIndex],
+    costs: Optional[SeasonCosts],
+) -> None:
+    id, matches = _web_scrape_season_matches(
+        task.name, task.season_path, None, index, None, costs
+    )
+    shard.write(task.seq, get_sport(task.season_path), id, matches)
+
+
+@log(logging.info)
+def web_scrape_from_queue(
+    queue: WorkQueue,
+    worker: str,
+    shard_directory: Path,
+    batch_size: int = 1,
+    index: Optional[SeasonIndex] = None,
+    costs: Optional[SeasonCosts] = None,
+) -> int:
+    """
+    Worker: claim seasons from the queue until there are none left,
+    and write their matches to the worker's shard
+    ("{shard_directory}/{worker}.jsonl").
+
+    Many workers may run at the same time, on the same queue. Seasons are
+    acknowledged only after they are written, so seasons of a worker that
+    dies are claimed again by others once their leases expire.
+
+    Claimed seasons are started one by one: those stolen in the meantime
+    by idle workers (see WorkQueue) are skipped.
+
+    Once the deadline of the scrape package (see set_deadline) is over,
+    no more seasons are started: they stay queued for a later run.
+
+    Returns the number of seasons scraped.
+
+    --------
+    Parameters:
+
+        queue: WorkQueue
+            Queue shared by the coordinator and all workers.
+
+        worker: str
+            Name of the worker. It must be unique.
+
+        shard_directory: Path
+            Folder with the shards of all workers.
+
+        batch_size: int
+            Number of seasons claimed at once.
+
+        index: Optional[SeasonIndex]
+        costs: Optional[SeasonCosts]
+            See web_scrape_from_provided_paths.
+    """
+
+    shard: ShardWriter = ShardWriter(shard_directory / f"{worker}{SHARD_SUFFIX}")
+    scraped: int = 0
+
+    try:
+        while tasks := queue.claim(worker, batch_size):
+            for task in tasks:
+                if is_past_deadline():
+                    return scraped
+
+                if not queue.start(worker, task):
+                    continue
+
+                _scrape_task(task, shard, index, costs)
+                queue.ack(worker, task)
+                scraped += 1
+    finally:
+        shard.close()
+
+    return scraped
+
+
+@log(logging.info)
+def merge_scraped_shards(
+    shard_directory: Path, directory_path: Path, append: bool = False
+) -> int:
+    """
+    Merge the shards of all workers into one file per sport, in the same
+    format (and order) as save_web_scraped_matches'.
+
+    Returns the number of seasons merged.
+
+    --------
+    Parameters:
+
+        shard_directory: Path
+            Folder with the shards of all workers.
+
+        directory_path: Path
+        append: bool
+            See MatchesWriter.
+    """
+
+    shard_paths: list[Path] = sorted(shard_directory.glob(f"*{SHARD_SUFFIX}"))
+    writer: MatchesWriter = MatchesWriter(directory_path, append)
+
+    merged: int = merge_shards(shard_paths, writer)
+    writer.close()
+
+    logging.info(f"{len(shard_paths)} shards merged: {writer.report()}")
+
+    return merged
@@ -0,0 +1,111 @@
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens are added at "rate" tokens per second, up to "burst" tokens.
+    Each call to acquire consumes one token, waiting for it if necessary.
+
+    Waiting happens outside the lock, so callers only wait for their own
+    token (waits are reserved in arrival order).
+    """
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate: float = rate
+        self.burst: float = burst
+
+        self._tokens: float = burst
+        self._last_update: float = time.monotonic()
+        self._lock: threading.Lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        # returns for how long the caller has to wait for its token
+        with self._lock:
+            now: float = time.monotonic()
+            elapsed: float = now - self._last_update
+
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._last_update = now
+
+            # negative tokens are tokens reserved by callers still waiting
+            self._tokens -= 1
+
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        wait: float = self._reserve()
+
+        if wait > 0:
+            time.sleep(wait)
+
+
+class HostRateLimiter:
+    """
+    One token bucket per host, all of them with the same rate and burst.
+    """
+
+    def __init__(self, requests_per_second: float, burst: float) -> None:
+        self.requests_per_second: float = requests_per_second
+        self.burst: float = burst
+
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def _get_bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.requests_per_second, self.burst)
+
+            return self._buckets[host]
+
+    def acquire(self, url: str) -> None:
+        """
+        Wait until a request to url's host is allowed.
+        """
+
+        self._get_bucket(urlparse(url).netloc).acquire()
+
+
+class RetryBudget:
+    """
+    Maximum number of retries for the whole run (shared by all requests).
+    """
+
+    def __init__(self, max_retries: int) -> None:
+        self.max_retries: int = max_retries
+        self.spent: int = 0
+
+        self._lock: threading.Lock = threading.Lock()
+
+    def try_spend(self) -> bool:
+        """
+        Spend one retry, if there is any left.
+        """
+
+        with self._lock:
+            if self.spent >= self.max_retries:
+                return False
+
+            self.spent += 1
+            return True
+
+    @property
+    def remaining(self) -> int:
+        return self.max_retries - self.spent
+
+
+def get_backoff_delay(attempt: int, base: float, maximum: float) -> float:
+    """
+    Exponential backoff with "full jitter": a random delay between zero
+    and base * 2**attempt seconds (capped at "maximum").
+
+    Jitter prevents concurrent requests that failed together from being
+    retried together.
+    """
+
+    return random.uniform(0, min(maximum, base * 2**attempt))
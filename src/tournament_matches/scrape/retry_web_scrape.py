@@ -0,0 +1,139 @@
+import logging
+from collections import defaultdict
+from typing import Callable, Optional, ParamSpec, TypeVar
+
+import pandas as pd
+
+from logs import log
+
+from .dead_letters import DeadLetters
+from .matches_builder import MatchesBuilder
+from .matches_writer import MatchesWriter
+from .season_costs import SeasonCosts
+from .season_index import SeasonIndex
+from .utils import get_sport, get_tournament_name
+from .web_scrape import (
+    _build_all_sports,
+    _get_path_to_desired_seasons,
+    _web_scrape_season_matches,
+)
+
+T = TypeVar("T")
+P = ParamSpec("P")
+
+
+def _retry(
+    dead_letters: DeadLetters,
+    path: str,
+    func: Callable[P, T],
+    *args: P.args,
+    **kwargs: P.kwargs,
+) -> T:
+    # scraping functions record (and resolve) their own failures, but work
+    # done without them (such as matches of a season the index closed)
+    # is resolved here
+    failures: int = dead_letters.get_failures(path)
+    value: T = func(*args, **kwargs)
+
+    if dead_letters.get_failures(path) == failures:
+        dead_letters.resolve(path)
+
+    return value
+
+
+def _get_failed_work(dead_letters: DeadLetters) -> dict[str, list[str]]:
+    # default path of each tournament -> its failed paths (the default path
+    # itself if its seasons could not be found), in the order they failed
+    tournament_to_paths: dict[str, list[str]] = defaultdict(list)
+
+    for dead_letter in dead_letters.pending():
+        if dead_letter.tournament is None:
+            # recorded before dead letters had tournaments
+            logging.warning(f"Unknown tournament, not retried: {dead_letter.path}")
+            continue
+
+        tournament_to_paths[dead_letter.tournament].append(dead_letter.path)
+
+    return tournament_to_paths
+
+
+@log(logging.info)
+def web_scrape_failed_seasons(
+    first_season: tuple[str, str],
+    last_season: tuple[str, str],
+    dead_letters: DeadLetters,
+    index: Optional[SeasonIndex] = None,
+    writer: Optional[MatchesWriter] = None,
+    costs: Optional[SeasonCosts] = None,
+) -> dict[str, pd.DataFrame]:
+    """
+    Retry pass: scrape again only the work recorded in "dead_letters",
+    that is, seasons whose matches could not be scraped and every season of
+    tournaments whose seasons could not be found.
+
+    Only the tournaments of failed work are requested: seasons of other
+    tournaments are not found again.
+
+    Work that succeeds is resolved in "dead_letters", work that fails again
+    stays pending (with one more failure).
+
+    Output has the same format as web_scrape_from_provided_paths', with the
+    matches of retried seasons only, so it should be appended to the output
+    of the run where they failed.
+
+    --------
+    Parameters:
+
+        first_season: tuple[str, str]
+        last_season: tuple[str, str]
+            Same as in the run where work failed.
+
+        dead_letters: DeadLetters
+            Work that failed.
+
+        index: Optional[SeasonIndex]
+        writer: Optional[MatchesWriter]
+        costs: Optional[SeasonCosts]
+            See web_scrape_from_provided_paths.
+    """
+
+    tournament_to_paths: dict[str, list[str]] = _get_failed_work(dead_letters)
+    sport_to_builder: dict[str, MatchesBuilder] = defaultdict(MatchesBuilder)
+
+    for path, failed in tournament_to_paths.items():
+        # path: /sport/country/current_name/
+        # name is necessary because some tournaments had their names changed
+        name: str = get_tournament_name(path)
+        builder: MatchesBuilder = sport_to_builder[get_sport(path)]
+
+        # failed seasons (season_path: /sport/country/name-year/)
+        season_paths: list[str] = [season for season in failed if season != path]
+
+        if path in failed:
+            season_paths = _retry(
+                dead_letters,
+                path,
+                _get_path_to_desired_seasons,
+                path,
+                first_season,
+                last_season,
+                None,
+            )
+
+        for season_path in season_paths:
+            id, matches = _retry(
+                dead_letters,
+                season_path,
+                _web_scrape_season_matches,
+                name,
+                season_path,
+                None,
+                index,
+                writer,
+                costs,
+            )
+            builder.add(id, matches)
+
+    logging.info(f"Dead letters after retrying: {dead_letters.report()}")
+
+    return _build_all_sports(sport_to_builder)
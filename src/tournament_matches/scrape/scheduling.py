@@ -0,0 +1,154 @@
+import threading
+import time
+from enum import IntEnum
+from typing import Optional
+
+from .cache import is_historic_season_url
+from .season_costs import SeasonCost, SeasonCosts
+from .season_index import SeasonIndex, SeasonStatus
+
+SchedulingKey = tuple[int, float, float]
+
+
+class Freshness(IntEnum):
+    """
+    How urgently a season should be scraped (lowest first).
+    """
+
+    FAILED = 0  # last scrape failed (its requests or parsing)
+    IN_PROGRESS = 1  # current season or whose last match is recent
+    NEW = 2  # never scraped
+    HISTORICAL = 3  # scraped before, neither in progress nor closed
+    CLOSED = 4  # closed in the season index: its stored matches are used
+
+
+def get_freshness(
+    season_path: str, index: Optional[SeasonIndex], costs: Optional[SeasonCosts]
+) -> Freshness:
+    """
+    Freshness of season_path, from its last match date (stored in "index")
+    and its last scrape (stored in "costs").
+    """
+
+    status: Optional[SeasonStatus] = (
+        None if index is None else index.get_status(season_path)
+    )
+    history: Optional[SeasonCost] = (
+        None if costs is None else costs.get_history(season_path)
+    )
+
+    if status is not None and status[0]:
+        return Freshness.CLOSED
+
+    if history is not None and history.failed:
+        return Freshness.FAILED
+
+    if not is_historic_season_url(season_path):
+        return Freshness.IN_PROGRESS
+
+    # stored seasons whose last match is recent are still being played
+    # (postponed matches); if it is old, they only need one last scrape to be
+    # closed, so they are historical
+    if status is not None and not index.is_closed(status[1]):
+        return Freshness.IN_PROGRESS
+
+    if history is None and status is None:
+        return Freshness.NEW
+
+    return Freshness.HISTORICAL
+
+
+def _get_scheduling_key(
+    season_path: str, index: Optional[SeasonIndex], costs: Optional[SeasonCosts]
+) -> SchedulingKey:
+    freshness: Freshness = get_freshness(season_path, index, costs)
+
+    if costs is None:
+        return freshness, 0.0, 0.0
+
+    history: Optional[SeasonCost] = costs.get_history(season_path)
+
+    # historical seasons scraped the longest time ago are refreshed first
+    scraped_at: float = (
+        history.scraped_at
+        if freshness is Freshness.HISTORICAL and history is not None
+        else 0.0
+    )
+
+    # then, the most costly seasons first (longest processing time first),
+    # so the last ones left running are short
+    return freshness, scraped_at, -costs.estimate(season_path)
+
+
+def schedule_seasons(
+    season_paths: list[str],
+    index: Optional[SeasonIndex] = None,
+    costs: Optional[SeasonCosts] = None,
+) -> list[int]:
+    """
+    Positions of season_paths in the order they should be scraped:
+    by freshness (see Freshness) and then by estimated cost, the most
+    costly first. Seasons with the same key keep their order.
+    """
+
+    keys: list[SchedulingKey] = [
+        _get_scheduling_key(season_path, index, costs) for season_path in season_paths
+    ]
+
+    return sorted(range(len(season_paths)), key=keys.__getitem__)
+
+
+class Deadline:
+    """
+    Time budget of a run. Once it is over, no more seasons are scraped:
+    their stored matches (see SeasonIndex), if any, are used instead.
+    Since they are not journaled, "--resume" scrapes them later.
+
+    -----
+    Parameters:
+
+        seconds: float
+            Time budget, from now.
+    """
+
+    def __init__(self, seconds: float) -> None:
+        self.expires_at: float = time.time() + seconds
+        self.skipped: int = 0  # seasons not scraped because of the deadline
+        self._lock: threading.Lock = threading.Lock()
+
+    def is_over(self) -> bool:
+        return time.time() >= self.expires_at
+
+    def skip(self) -> None:
+        with self._lock:
+            self.skipped += 1
+
+    def report(self) -> str:
+        state: str = "over" if self.is_over() else "not over"
+        return f"{state}, seasons skipped: {self.skipped}"
+
+
+_deadline: Optional[Deadline] = None
+
+
+def get_deadline() -> Optional[Deadline]:
+    """
+    Returns the deadline of the scrape package, if any.
+    """
+
+    return _deadline
+
+
+def set_deadline(deadline: Optional[Deadline]) -> None:
+    """
+    Replace the deadline of the scrape package.
+
+    If None, every season is scraped.
+    """
+
+    global _deadline
+    _deadline = deadline
+
+
+def is_past_deadline() -> bool:
+    return _deadline is not None and _deadline.is_over()
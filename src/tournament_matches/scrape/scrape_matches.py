@@ -1,25 +1,34 @@
 import logging
 import re
-from typing import Optional, Pattern, Union
+from typing import Callable, Optional, Pattern, TypeVar, Union
 
-import requests
 from bs4 import BeautifulSoup, ResultSet, Tag
 
 from logs import log
 
+from . import html_backend
+from .client import ScrapeClient, StreamParser, get_client
+from .html_backend import RawRow, get_parser_backend
+from .main_queries import MainSectionQueries, get_main_section_queries
+from .stream_parser import WebpageStreamParser, is_streaming_enabled
 from .utils import (
     CURRENT_YEAR,
     TODAY,
     YESTERDAY,
     concatenate_homepage_url_to_path,
-    run_three_times,
+    empty_on_request_failure,
 )
+from .webpage_regions import get_results_regions, is_partial_parsing_enabled
 
 Odds = list[float]
 TeamsResultName = list[str]
 Match = list[Union[float, int]]
 Matches = list[Match]
 
+Webpage = Union[BeautifulSoup, html_backend.Element]
+
+T = TypeVar("T")
+
 
 def _concatenate_results_slash(path: str):
     return path + "results/"
@@ -43,24 +52,6 @@ def _get_main_section_query(default_soup: BeautifulSoup) -> str:
     return ""
 
 
-def _get_soup_to_all_results(results_url: str) -> BeautifulSoup:
-    webpage = requests.get(results_url).content
-    results_soup = BeautifulSoup(webpage, "html.parser")
-
-    # some tournaments require another request to get all results
-
-    # it is possible to get the full path for all urls, but it would
-    # require some redundant queries when there is no "main" section,
-    # so I decided to solve it with a simple if statement
-    query = _get_main_section_query(results_soup)
-
-    if query:
-        webpage = requests.get(results_url + query).content
-        results_soup = BeautifulSoup(webpage, "html.parser")
-
-    return results_soup
-
-
 def _has_groups(match_table: Tag) -> bool:
     # "th" tags are the place where "group" can be found
     th_headers: ResultSet = match_table.find_all("th", attrs={"class": "h-text-left"})
@@ -137,8 +128,182 @@ def _web_scrape_matches_information_from_soup(
     return [_extract_teams_result_date_odds(match_row) for match_row in match_rows]
 
 
+def _convert_raw_row_to_match(raw_row: RawRow) -> Match:
+    # same as _extract_teams_result_date_odds, for rows extracted by lxml
+    row_text, data_odds = raw_row
+    teams, result, *_, date = row_text
+
+    return [teams, result, _format_date_correctly(date)] + [
+        float(odd.strip()) for odd in data_odds
+    ]
+
+
+def _parse_webpage(webpage: bytes) -> Webpage:
+    if is_partial_parsing_enabled():
+        # if regions are not found, the whole webpage is parsed
+        webpage = get_results_regions(webpage) or webpage
+
+    if get_parser_backend() == "lxml":
+        return html_backend.parse_html(webpage)
+
+    return BeautifulSoup(webpage, "html.parser")
+
+
+def _get_main_section_query_from_webpage(parsed_webpage: Webpage) -> str:
+    if isinstance(parsed_webpage, BeautifulSoup):
+        return _get_main_section_query(parsed_webpage)
+
+    return html_backend.get_main_section_query(parsed_webpage)
+
+
+def _convert_raw_rows_to_matches(
+    raw_rows: Optional[list[RawRow]],
+) -> Optional[Matches]:
+    if raw_rows is None:
+        logging.warning("Season ignored.")
+        return None
+
+    return [_convert_raw_row_to_match(raw_row) for raw_row in raw_rows]
+
+
+def _get_matches_from_webpage(parsed_webpage: Webpage) -> Optional[Matches]:
+    if isinstance(parsed_webpage, BeautifulSoup):
+        return _web_scrape_matches_information_from_soup(parsed_webpage)
+
+    return _convert_raw_rows_to_matches(html_backend.get_match_rows(parsed_webpage))
+
+
+def _scrape_results_webpage(webpage: bytes) -> tuple[str, Optional[Matches]]:
+    parsed_webpage: Webpage = _parse_webpage(webpage)
+
+    # some tournaments require another request to get all results
+
+    # it is possible to get the full path for all urls, but it would
+    # require some redundant queries when there is no "main" section,
+    # so I decided to solve it with a simple if statement
+    query = _get_main_section_query_from_webpage(parsed_webpage)
+
+    if query:
+        return query, None
+
+    return query, _get_matches_from_webpage(parsed_webpage)
+
+
+def _scrape_main_section_webpage(webpage: bytes) -> Optional[Matches]:
+    return _get_matches_from_webpage(_parse_webpage(webpage))
+
+
+def _scrape_guessed_main_section_webpage(
+    webpage: bytes,
+) -> tuple[str, Optional[Matches]]:
+    # a main section webpage also has the submenu with its own query,
+    # which tells whether the guessed query was the right one
+    parsed_webpage: Webpage = _parse_webpage(webpage)
+
+    return (
+        _get_main_section_query_from_webpage(parsed_webpage),
+        _get_matches_from_webpage(parsed_webpage),
+    )
+
+
+class _ResultsStreamParser(WebpageStreamParser):
+    # streaming version of _scrape_results_webpage
+    def finish(self) -> tuple[str, Optional[Matches]]:
+        self.close()
+
+        if self.query:
+            return self.query, None
+
+        return self.query, _convert_raw_rows_to_matches(self.get_match_rows())
+
+
+class _MainSectionStreamParser(WebpageStreamParser):
+    # streaming version of _scrape_main_section_webpage
+    def finish(self) -> Optional[Matches]:
+        self.close()
+        return _convert_raw_rows_to_matches(self.get_match_rows())
+
+
+class _GuessedMainSectionStreamParser(WebpageStreamParser):
+    # streaming version of _scrape_guessed_main_section_webpage
+    def finish(self) -> tuple[str, Optional[Matches]]:
+        self.close()
+        return self.query, _convert_raw_rows_to_matches(self.get_match_rows())
+
+
+def _parse(
+    url: str,
+    parser: Callable[[bytes], T],
+    stream_parser: Callable[[], StreamParser[T]],
+) -> T:
+    client: ScrapeClient = get_client()
+
+    # chunks arrive in the fetching thread, so a parse pool disables streaming
+    if is_streaming_enabled() and client.parse_pool is None:
+        return client.parse_stream(url, stream_parser)
+
+    return client.parse(url, parser)
+
+
+def _web_scrape_all_results_in_two_steps(
+    path: str, results_url: str, queries: Optional[MainSectionQueries]
+) -> Optional[Matches]:
+    # webpages that did not change since the last run are not parsed again
+    query, matches = _parse(results_url, _scrape_results_webpage, _ResultsStreamParser)
+
+    if queries is not None:
+        queries.record(path, query)
+
+    if query:
+        matches = _parse(
+            results_url + query,
+            _scrape_main_section_webpage,
+            _MainSectionStreamParser,
+        )
+
+    return matches
+
+
+def _web_scrape_all_results(path: str, results_url: str) -> Optional[Matches]:
+    queries: Optional[MainSectionQueries] = get_main_section_queries()
+
+    if queries is None:
+        return _web_scrape_all_results_in_two_steps(path, results_url, queries)
+
+    # query of a season whose main section was already found
+    query: Optional[str] = queries.get(path)
+
+    if query:
+        return _parse(
+            results_url + query,
+            _scrape_main_section_webpage,
+            _MainSectionStreamParser,
+        )
+
+    if query is not None:  # results were all in /results/
+        return _web_scrape_all_results_in_two_steps(path, results_url, queries)
+
+    guessed_query: Optional[str] = queries.guess(path)
+
+    if guessed_query is not None:
+        query, matches = _parse(
+            results_url + guessed_query,
+            _scrape_guessed_main_section_webpage,
+            _GuessedMainSectionStreamParser,
+        )
+
+        if query == guessed_query:
+            queries.record(path, query)
+            return matches
+
+        queries.record_wrong_guess(path)
+        logging.warning(f"Wrong main section query guessed for {path}.")
+
+    return _web_scrape_all_results_in_two_steps(path, results_url, queries)
+
+
 @log(logging.info)
-@run_three_times
+@empty_on_request_failure
 def web_scrape_matches_information(path: str) -> Optional[Matches]:
     """
     Given a path to a bet_explorer-webpage containing all matches
@@ -160,6 +325,4 @@ def web_scrape_matches_information(path: str) -> Optional[Matches]:
 
     # unfortunately www.betexplorer.com/sport/country/name-year/results/
     # isn't always enough to get all matches, so it might be needed to do more
-    results_soup: BeautifulSoup = _get_soup_to_all_results(results_url)
-
-    return _web_scrape_matches_information_from_soup(results_soup)
+    return _web_scrape_all_results(path, results_url)
@@ -0,0 +1,240 @@
+import sqlite3
+import statistics
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from .cache import SEASON_YEARS_RE
+
+# estimated cost (in seconds) of any season when there is no history at all
+DEFAULT_COST: float = 1.0
+
+
+def get_tournament_key(season_path: str) -> str:
+    """
+    Season path without its years: /sport/country/name-year/ -> /sport/country/name
+    """
+
+    return SEASON_YEARS_RE.sub("", season_path.rstrip("/"))
+
+
+@dataclass
+class SeasonCost:
+    rows: int
+    bytes: int  # downloaded the last time the season was downloaded
+    seconds: Optional[float]  # None if it was never downloaded
+    scraped_at: float  # last time the season was scraped
+    failed: bool = False  # whether its last scrape failed (see DeadLetters)
+
+
+@dataclass
+class CostStats:
+    recorded: int = 0
+    known: int = 0  # seasons estimated from their own history
+    from_tournament: int = 0  # from other seasons of the same tournament
+    unknown: int = 0
+
+    def report(self) -> str:
+        return (
+            f"seasons recorded: {self.recorded}, estimated from: "
+            f"their history: {self.known}, their tournament: "
+            f"{self.from_tournament}, nothing: {self.unknown}"
+        )
+
+
+class SeasonCosts:
+    """
+    Persistent history of how costly scraping each season was: its number of
+    rows, the bytes downloaded for it, how long it took and when it was done.
+
+    Estimates are used to schedule the most costly seasons first (longest
+    processing time first), so that a huge season (such as a whole nba
+    season behind "&month=all") is not the last one left running.
+
+    A season's cost is its scraping time. If it was never downloaded (its
+    webpages came from the cache), its time is estimated from its number of
+    rows. Seasons without history are estimated from the other seasons of
+    their tournament and, if there are none, from every season's median.
+
+    Failed scrapes are recorded as such (so they are scraped again first),
+    but they keep the season's previous rows, bytes and time.
+
+    Estimates are based on the history of previous runs, which is loaded
+    once, so they do not change during a run.
+
+    -----
+    Parameters:
+
+        path: Path
+            File where the history is stored.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.stats: CostStats = CostStats()
+
+        # the same connection is used by all scraping threads
+        self._lock: threading.Lock = threading.Lock()
+        self._connection: sqlite3.Connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS costs ("
+            " season_path TEXT PRIMARY KEY,"
+            " rows INTEGER NOT NULL,"
+            " bytes INTEGER NOT NULL,"
+            " seconds REAL,"
+            " scraped_at REAL NOT NULL DEFAULT 0,"
+            " failed INTEGER NOT NULL DEFAULT 0"
+            ")"
+        )
+        self._add_missing_columns()
+
+        self._history: dict[str, SeasonCost] = {
+            season_path: SeasonCost(rows, bytes, seconds, scraped_at, bool(failed))
+            for season_path, rows, bytes, seconds, scraped_at, failed in (
+                self._connection.execute(
+                    "SELECT season_path, rows, bytes, seconds, scraped_at, failed"
+                    " FROM costs"
+                )
+            )
+        }
+
+        downloaded: list[SeasonCost] = [
+            cost for cost in self._history.values() if cost.seconds is not None
+        ]
+        rows: int = sum(cost.rows for cost in downloaded)
+
+        self._seconds_per_row: Optional[float] = (
+            sum(cost.seconds for cost in downloaded) / rows if rows else None
+        )
+
+        self._tournament_costs: dict[str, list[float]] = {}
+
+        for season_path, cost in self._history.items():
+            self._tournament_costs.setdefault(
+                get_tournament_key(season_path), []
+            ).append(self._get_cost(cost))
+
+        all_costs: list[float] = [
+            cost for costs in self._tournament_costs.values() for cost in costs
+        ]
+        self._default_cost: float = (
+            statistics.median(all_costs) if all_costs else DEFAULT_COST
+        )
+
+    def _add_missing_columns(self) -> None:
+        # histories created before scrape times (or failures) were stored
+        # lack these columns
+        columns: set[str] = {
+            row[1] for row in self._connection.execute("PRAGMA table_info(costs)")
+        }
+
+        for column, definition in [
+            ("scraped_at", "REAL NOT NULL DEFAULT 0"),
+            ("failed", "INTEGER NOT NULL DEFAULT 0"),
+        ]:
+            if column not in columns:
+                self._connection.execute(
+                    f"ALTER TABLE costs ADD COLUMN {column} {definition}"
+                )
+
+    def get_history(self, season_path: str) -> Optional[SeasonCost]:
+        """
+        Cost of the last scrape of season_path before this run, if any.
+        """
+
+        return self._history.get(season_path)
+
+    def _get_cost(self, cost: SeasonCost) -> float:
+        if cost.seconds is not None:
+            return cost.seconds
+
+        return cost.rows * (self._seconds_per_row or 0.0)
+
+    def estimate(self, season_path: str) -> float:
+        """
+        Estimated cost (in seconds) of scraping season_path.
+        """
+
+        cost: Optional[SeasonCost] = self._history.get(season_path)
+        tournament_costs: Optional[list[float]] = self._tournament_costs.get(
+            get_tournament_key(season_path)
+        )
+
+        with self._lock:
+            if cost is not None:
+                self.stats.known += 1
+                return self._get_cost(cost)
+
+            if tournament_costs:
+                self.stats.from_tournament += 1
+                return statistics.mean(tournament_costs)
+
+            self.stats.unknown += 1
+
+        return self._default_cost
+
+    def record(
+        self,
+        season_path: str,
+        rows: int,
+        downloaded: int,
+        seconds: float,
+        failed: bool = False,
+    ) -> None:
+        """
+        Store the cost of scraping season_path: number of rows,
+        downloaded bytes and elapsed seconds.
+
+        If nothing was downloaded (webpages came from the cache), elapsed time
+        says nothing about the network, so the previous one is kept.
+
+        If the scrape "failed", only the failure is stored: its rows, bytes
+        and time say nothing about the season.
+        """
+
+        if failed:
+            rows, downloaded = 0, 0
+
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO costs"
+                " (season_path, rows, bytes, seconds, scraped_at, failed)"
+                " VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (season_path) DO UPDATE SET"
+                " rows = IIF(excluded.failed, rows, excluded.rows),"
+                " bytes = IIF(excluded.bytes > 0, excluded.bytes, bytes),"
+                " seconds = IIF(excluded.bytes > 0, excluded.seconds, seconds),"
+                " scraped_at = excluded.scraped_at,"
+                " failed = excluded.failed",
+                (
+                    season_path,
+                    rows,
+                    downloaded,
+                    seconds if downloaded else None,
+                    time.time(),
+                    failed,
+                ),
+            )
+
+            self.stats.recorded += 1
+
+    def report(self) -> str:
+        with self._lock:
+            seasons, downloaded = self._connection.execute(
+                "SELECT COUNT(*), COUNT(seconds) FROM costs"
+            ).fetchone()
+
+        return (
+            f"{seasons} seasons ({downloaded} with download times); "
+            f"{self.stats.report()}"
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,161 @@
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from .cache import SEASON_YEARS_RE
+from .utils import CURRENT_YEAR
+
+SECONDS_PER_DAY: int = 24 * 60 * 60
+
+
+def has_current_season(season_paths: list[str]) -> bool:
+    """
+    Whether any season (/sport/country/name-year/) includes the current year.
+    """
+
+    for season_path in season_paths:
+        match = SEASON_YEARS_RE.search(season_path.rstrip("/"))
+
+        if match is not None and CURRENT_YEAR in match.groups():
+            return True
+
+    return False
+
+
+@dataclass
+class DropdownStats:
+    hits: int = 0
+    refreshes: int = 0  # stored dropdowns that were outdated
+
+    def report(self) -> str:
+        return f"hits: {self.hits}, refreshed: {self.refreshes}"
+
+
+class SeasonDropdowns:
+    """
+    Persistent record of every season path in each tournament's dropdown
+    (see _get_path_seasons_from_webpage), keyed by default path.
+
+    All seasons are stored, not only the desired ones, so changing the
+    desired seasons does not require downloading the default webpages again.
+
+    A stored dropdown is outdated (and has to be downloaded again) if none of
+    its seasons includes the current year or if it is older than "max_age" days.
+
+    -----
+    Parameters:
+
+        path: Path
+            File where the dropdowns are stored.
+
+        max_age: float
+            Number of days after which a stored dropdown is outdated.
+    """
+
+    def __init__(self, path: Path, max_age: float) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.max_age: float = max_age
+        self.stats: DropdownStats = DropdownStats()
+
+        # the same connection is used by all scraping threads
+        self._lock: threading.Lock = threading.Lock()
+        self._connection: sqlite3.Connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS dropdowns ("
+            " default_path TEXT PRIMARY KEY,"
+            " season_paths TEXT NOT NULL,"  # json
+            " stored_at REAL NOT NULL"
+            ")"
+        )
+
+    def _get(self, default_path: str) -> tuple[Optional[list[str]], bool]:
+        # (season paths if they are up to date, whether they are stored)
+        row = self._connection.execute(
+            "SELECT season_paths, stored_at FROM dropdowns WHERE default_path = ?",
+            (default_path,),
+        ).fetchone()
+
+        if row is None:
+            return None, False
+
+        season_paths: list[str] = json.loads(row[0])
+        age: float = (time.time() - row[1]) / SECONDS_PER_DAY
+
+        if age > self.max_age or not has_current_season(season_paths):
+            return None, True
+
+        return season_paths, True
+
+    def get(self, default_path: str) -> Optional[list[str]]:
+        """
+        Stored season paths of default_path's dropdown, if they are up to date.
+        """
+
+        with self._lock:
+            season_paths, stored = self._get(default_path)
+
+            if season_paths is not None:
+                self.stats.hits += 1
+            elif stored:
+                self.stats.refreshes += 1
+
+        return season_paths
+
+    def has(self, default_path: str) -> bool:
+        """
+        Whether default_path's dropdown is stored and up to date
+        (without counting it as a hit).
+        """
+
+        with self._lock:
+            season_paths, _ = self._get(default_path)
+
+        return season_paths is not None
+
+    def put(self, default_path: str, season_paths: list[str]) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO dropdowns"
+                " (default_path, season_paths, stored_at) VALUES (?, ?, ?)",
+                (default_path, json.dumps(season_paths), time.time()),
+            )
+
+    def report(self) -> str:
+        return self.stats.report()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+_dropdowns: Optional[SeasonDropdowns] = None
+
+
+def get_season_dropdowns() -> Optional[SeasonDropdowns]:
+    """
+    Returns the season dropdowns used by the scrape package, if any.
+    """
+
+    return _dropdowns
+
+
+def set_season_dropdowns(dropdowns: Optional[SeasonDropdowns]) -> None:
+    """
+    Replace the season dropdowns used by the scrape package.
+
+    If None, default webpages are always downloaded.
+    """
+
+    global _dropdowns
+
+    if _dropdowns is not None and _dropdowns is not dropdowns:
+        _dropdowns.close()
+
+    _dropdowns = dropdowns
@@ -0,0 +1,234 @@
+import json
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+from .scrape_matches import Match, Matches
+from .utils import TODAY_DATETIME
+
+DATE_FORMAT: str = "%d.%m.%Y"
+
+MatchKey = tuple[str, str]  # (teams, date)
+SeasonStatus = tuple[bool, Optional[datetime]]  # (closed, last match)
+
+
+def _parse_date(date: str) -> Optional[datetime]:
+    try:
+        return datetime.strptime(date, DATE_FORMAT)
+    except ValueError:
+        return None
+
+
+def get_last_match_date(matches: Matches) -> Optional[datetime]:
+    """
+    Latest date among matches (date is the third column: day.month.year).
+    """
+
+    dates: list[datetime] = [
+        date for match in matches if (date := _parse_date(match[2])) is not None
+    ]
+
+    return max(dates, default=None)
+
+
+def _get_match_key(match: Match) -> MatchKey:
+    teams, _, date, *_ = match
+    return teams, date
+
+
+def get_new_or_changed_matches(stored: Matches, scraped: Matches) -> Matches:
+    """
+    Scraped matches that are not among the stored ones.
+
+    Matches are identified by their teams and date, so a match whose
+    result or odds changed is also returned.
+    """
+
+    key_to_stored: dict[MatchKey, Match] = {
+        _get_match_key(match): match for match in stored
+    }
+
+    return [
+        match for match in scraped if key_to_stored.get(_get_match_key(match)) != match
+    ]
+
+
+@dataclass
+class IndexStats:
+    reused: int = 0  # closed seasons that were not scraped again
+    recorded: int = 0
+    closed: int = 0  # seasons that were closed in this run
+    new_matches: int = 0  # new or changed matches (incremental mode)
+
+    def report(self) -> str:
+        return (
+            f"closed seasons reused: {self.reused}, "
+            f"seasons recorded: {self.recorded} (newly closed: {self.closed}), "
+            f"new or changed matches: {self.new_matches}"
+        )
+
+
+class SeasonIndex:
+    """
+    Persistent index of scraped seasons (/sport/country/name-year/).
+
+    Each entry has the season's matches, its number of rows, the date of its
+    last match and whether it is closed, that is, whether its last match
+    happened more than "closed_after_days" days before today.
+
+    Closed seasons are not expected to change anymore, so their stored
+    matches can be used instead of scraping them again.
+
+    In incremental mode, only matches that are not stored yet (new or changed
+    ones, see get_new_or_changed_matches) are emitted, so that previously
+    saved files can be appended to instead of rewritten.
+
+    -----
+    Parameters:
+
+        path: Path
+            File where the index is stored.
+
+        closed_after_days: int
+            Number of days without matches after which a season is closed.
+
+        incremental: bool
+            Whether only new or changed matches should be emitted.
+    """
+
+    def __init__(
+        self, path: Path, closed_after_days: int, incremental: bool = False
+    ) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.closed_after_days: int = closed_after_days
+        self.incremental: bool = incremental
+        self.stats: IndexStats = IndexStats()
+
+        # the same connection is used by all scraping threads
+        self._lock: threading.Lock = threading.Lock()
+        self._connection: sqlite3.Connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS seasons ("
+            " season_path TEXT PRIMARY KEY,"
+            " rows INTEGER NOT NULL,"
+            " last_match TEXT,"  # day.month.year
+            " closed INTEGER NOT NULL,"
+            " matches TEXT NOT NULL"  # json
+            ")"
+        )
+
+    def is_closed(self, last_match: Optional[datetime]) -> bool:
+        """
+        Whether a season whose last match happened on "last_match" is closed.
+        """
+
+        if last_match is None:
+            return False
+
+        return last_match < TODAY_DATETIME - timedelta(days=self.closed_after_days)
+
+    def get_status(self, season_path: str) -> Optional[SeasonStatus]:
+        """
+        Whether stored season_path is closed and the date of its last match
+        (None if it is not stored).
+        """
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT closed, last_match FROM seasons WHERE season_path = ?",
+                (season_path,),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        closed, last_match = row
+
+        return bool(closed), None if last_match is None else _parse_date(last_match)
+
+    def get_closed_matches(self, season_path: str) -> Optional[Matches]:
+        """
+        Stored matches of season_path, if it is closed.
+        """
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT matches FROM seasons WHERE season_path = ? AND closed",
+                (season_path,),
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            self.stats.reused += 1
+
+        return json.loads(row[0])
+
+    def get_matches(self, season_path: str) -> Matches:
+        """
+        Stored matches of season_path (empty if there are none).
+        """
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT matches FROM seasons WHERE season_path = ?", (season_path,)
+            ).fetchone()
+
+        return [] if row is None else json.loads(row[0])
+
+    def count_new_matches(self, new_matches: Matches) -> None:
+        with self._lock:
+            self.stats.new_matches += len(new_matches)
+
+    def record(self, season_path: str, matches: Optional[Matches]) -> None:
+        """
+        Store scraped matches of season_path and whether it is closed.
+
+        Empty (or ignored) seasons are not stored, so they are always scraped.
+        """
+
+        if not matches:
+            return
+
+        last_match: Optional[datetime] = get_last_match_date(matches)
+        closed: bool = self.is_closed(last_match)
+
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO seasons"
+                " (season_path, rows, last_match, closed, matches)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (
+                    season_path,
+                    len(matches),
+                    None if last_match is None else last_match.strftime(DATE_FORMAT),
+                    closed,
+                    json.dumps(matches),
+                ),
+            )
+
+            self.stats.recorded += 1
+            self.stats.closed += closed
+
+        if closed:
+            logging.info(f"Season closed: {season_path}")
+
+    def report(self) -> str:
+        with self._lock:
+            seasons, closed = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(closed), 0) FROM seasons"
+            ).fetchone()
+
+        return f"{seasons} seasons ({closed} closed); {self.stats.report()}"
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -2,22 +2,30 @@ import logging
 import re
 from typing import Optional, Pattern
 
-import requests
 from bs4 import BeautifulSoup, ResultSet, Tag
 
 from logs import log
 
-from .utils import concatenate_homepage_url_to_path, run_three_times
+from . import html_backend
+from .client import get_client
+from .html_backend import get_parser_backend
+from .season_dropdowns import SeasonDropdowns, get_season_dropdowns
+from .utils import concatenate_homepage_url_to_path, empty_on_request_failure
+from .webpage_regions import get_seasons_region, is_partial_parsing_enabled
 
 
-def _create_default_path_with_year(season: Tag):
-    # default season["value"] is like /sport/country/name/
-    path_no_last_slash: str = season["value"][:-1]
-    season_year: str = season.text.strip().replace("/", "-")
+def _add_year_to_default_path(default_path: str, season_text: str) -> str:
+    # default_path is like /sport/country/name/
+    path_no_last_slash: str = default_path[:-1]
+    season_year: str = season_text.strip().replace("/", "-")
 
     return path_no_last_slash + "-" + season_year + "/"
 
 
+def _create_default_path_with_year(season: Tag):
+    return _add_year_to_default_path(season["value"], season.text)
+
+
 def _extract_path_season_from_dropdown_options(
     dropdown_options: ResultSet,
 ) -> list[str]:
@@ -49,6 +57,24 @@ def _get_path_seasons_from_webpage(tourney_soup: BeautifulSoup) -> list[str]:
     return _extract_path_season_from_dropdown_options(dropdown_options)
 
 
+def _scrape_seasons_webpage(webpage: bytes) -> list[str]:
+    if is_partial_parsing_enabled():
+        # if the dropdown menu is not found, the whole webpage is parsed
+        webpage = get_seasons_region(webpage) or webpage
+
+    if get_parser_backend() == "lxml":
+        tree: html_backend.Element = html_backend.parse_html(webpage)
+
+        # same as _extract_path_season_from_dropdown_options
+        return [
+            value if not selected else _add_year_to_default_path(value, text)
+            for value, text, selected in html_backend.get_season_options(tree)
+        ]
+
+    default_soup: BeautifulSoup = BeautifulSoup(webpage, "html.parser")
+    return _get_path_seasons_from_webpage(default_soup)
+
+
 def _create_all_desired_seasons_one_year(
     first_season: str, last_season: str
 ) -> list[str]:
@@ -157,8 +183,29 @@ def _get_path_to_desired_seasons_from_soup(
     return desired_seasons
 
 
+def _get_all_seasons(default_path: str) -> list[str]:
+    dropdowns: Optional[SeasonDropdowns] = get_season_dropdowns()
+
+    if dropdowns is not None:
+        stored_seasons: Optional[list[str]] = dropdowns.get(default_path)
+
+        if stored_seasons is not None:
+            return stored_seasons
+
+    default_url: str = concatenate_homepage_url_to_path(default_path)
+
+    # all seasons are stored, so changing the desired seasons does not
+    # require parsing the webpage again if it did not change
+    all_seasons: list[str] = get_client().parse(default_url, _scrape_seasons_webpage)
+
+    if dropdowns is not None and all_seasons:
+        dropdowns.put(default_path, all_seasons)
+
+    return all_seasons
+
+
 @log(logging.info)
-@run_three_times
+@empty_on_request_failure
 def get_path_to_desired_seasons(
     default_path: str, first_season: tuple[str, str], last_season: tuple[str, str]
 ) -> list[str]:
@@ -167,8 +214,8 @@ def get_path_to_desired_seasons(
     path to all desired seasons, that is, seasons between
     first and last (both included).
 
-    By default, this procedure will be attempted three times to
-    mitigate possible connection problems.
+    Failed requests are retried by the scrape client to mitigate
+    possible connection problems.
 
     --------
     Parameters:
@@ -202,11 +249,6 @@ def get_path_to_desired_seasons(
 
     """
 
-    default_url: str = concatenate_homepage_url_to_path(default_path)
+    all_seasons: list[str] = _get_all_seasons(default_path)
 
-    webpage: bytes = requests.get(default_url).content
-    default_soup: BeautifulSoup = BeautifulSoup(webpage, "html.parser")
-
-    return _get_path_to_desired_seasons_from_soup(
-        default_soup, first_season, last_season
-    )
+    return _filter_season_between_first_and_last(all_seasons, first_season, last_season)
@@ -0,0 +1,124 @@
+import heapq
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from .matches_writer import MatchesWriter
+from .scrape_matches import Matches
+
+ShardEntry = dict[str, Any]
+
+SHARD_SUFFIX: str = ".jsonl"
+
+
+class ShardWriter:
+    """
+    Append-only file with the matches scraped by one worker, one json
+    per season (in the order the worker scraped them):
+
+        {"seq": ..., "sport": ..., "id": ..., "matches": [...]}
+
+    Every season is flushed to disk before it is acknowledged,
+    so nothing acknowledged is lost if the worker dies.
+
+    -----
+    Parameters:
+
+        path: Path
+            Shard file. If it exists, seasons are appended to it.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.path: Path = path
+        self._file = open(path, "a")
+
+        # an incomplete last line must not be glued to the next entry
+        if self._file.tell() > 0:
+            self._file.write("\n")
+
+    def write(self, seq: int, sport: str, id: str, matches: Optional[Matches]) -> None:
+        if not matches:
+            return
+
+        entry: ShardEntry = {"seq": seq, "sport": sport, "id": id, "matches": matches}
+
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def remove_shards(shard_directory: Path) -> int:
+    """
+    Remove the shards of all workers. Returns the number of shards removed.
+    """
+
+    shard_paths: list[Path] = list(shard_directory.glob(f"*{SHARD_SUFFIX}"))
+
+    for path in shard_paths:
+        path.unlink()
+
+    return len(shard_paths)
+
+
+def _index_shard(path: Path) -> list[tuple[int, int]]:
+    # (seq, offset) of each season in the shard, sorted by seq
+    offsets: list[tuple[int, int]] = []
+
+    with open(path, "rb") as shard_file:
+        offset: int = 0
+
+        for line in shard_file:
+            try:
+                offsets.append((json.loads(line)["seq"], offset))
+            except (json.JSONDecodeError, KeyError):
+                # last line may be incomplete if the worker was killed
+                if line.strip():
+                    logging.warning(f"Ignoring corrupted line of shard {path}")
+
+            offset += len(line)
+
+    return sorted(offsets)
+
+
+def _read_shard_in_order(path: Path) -> Iterator[tuple[int, ShardEntry]]:
+    # seasons are read one at a time, so memory does not grow with the shard
+    with open(path, "rb") as shard_file:
+        for seq, offset in _index_shard(path):
+            shard_file.seek(offset)
+            yield seq, json.loads(shard_file.readline())
+
+
+def merge_shards(shard_paths: list[Path], writer: MatchesWriter) -> int:
+    """
+    Merge seasons of every shard, in queue order (k-way merge on "seq"),
+    and write them with "writer".
+
+    Seasons scraped by more than one worker (their lease expired)
+    are only written once.
+
+    Returns the number of seasons written.
+    """
+
+    shards: list[Iterator[tuple[int, ShardEntry]]] = [
+        _read_shard_in_order(path) for path in shard_paths
+    ]
+
+    last_seq: Optional[int] = None
+    written: int = 0
+
+    for seq, entry in heapq.merge(*shards, key=lambda seq_entry: seq_entry[0]):
+        if seq == last_seq:
+            continue
+
+        writer.write(entry["sport"], entry["id"], entry["matches"])
+        last_seq = seq
+        written += 1
+
+    return written
@@ -0,0 +1,189 @@
+import logging
+from typing import Any, Optional
+
+from bs4.dammit import EncodingDetector
+
+from .html_backend import LXML_AVAILABLE, RawRow
+
+if LXML_AVAILABLE:
+    import lxml.etree
+    import lxml.html
+
+Element = Any  # lxml.html.HtmlElement
+
+DEFAULT_ENCODING: str = "utf-8"
+
+_enabled: bool = False
+
+
+def is_streaming_enabled() -> bool:
+    return _enabled
+
+
+def set_streaming(enabled: bool) -> None:
+    """
+    If enabled, results webpages are parsed while they are downloaded
+    (see WebpageStreamParser).
+    """
+
+    global _enabled
+
+    if enabled and not LXML_AVAILABLE:
+        logging.error("lxml is not installed.")
+        raise ValueError("Streaming requires lxml to be installed.")
+
+    _enabled = enabled
+
+
+def _get_text(element: Element) -> str:
+    return element.text_content().strip()
+
+
+def _get_classes(element: Element) -> list[str]:
+    return element.get("class", "").split()
+
+
+def _remove_element(element: Element) -> None:
+    # frees an element that was already scraped and the ones before it
+    element.clear()
+
+    parent: Optional[Element] = element.getparent()
+
+    while parent is not None and element.getprevious() is not None:
+        del parent[0]
+
+
+class WebpageStreamParser:
+    """
+    Incremental version of html_backend's get_main_section_query and
+    get_match_rows: chunks of a webpage are fed as they are downloaded,
+    and each match row is extracted as soon as its "tr" is closed.
+
+    Elements are removed from the tree as soon as they are scraped,
+    so memory does not grow with the size of the webpage.
+    """
+
+    def __init__(self) -> None:
+        self._parser: Optional[lxml.etree.HTMLPullParser] = None
+
+        self.query: str = ""
+        self.raw_rows: list[RawRow] = []
+        self.has_groups: bool = False
+        self.has_match_table: bool = False
+
+        self._match_table: Optional[Element] = None
+        self._submenus: int = 0  # open submenus
+        self._rows: int = 0  # open rows inside the match table
+
+    def _create_parser(self, first_chunk: bytes) -> lxml.etree.HTMLPullParser:
+        encoding: Optional[str] = EncodingDetector.find_declared_encoding(
+            first_chunk, is_html=True
+        )
+
+        parser = lxml.etree.HTMLPullParser(
+            events=("start", "end"), encoding=encoding or DEFAULT_ENCODING
+        )
+        parser.set_element_class_lookup(lxml.html.HtmlElementClassLookup())
+
+        return parser
+
+    def feed(self, chunk: bytes) -> None:
+        if not chunk:
+            return
+
+        if self._parser is None:
+            self._parser = self._create_parser(chunk)
+
+        self._parser.feed(chunk)
+        self._read_events()
+
+    def close(self) -> None:
+        """
+        Parse whatever is left after the last chunk.
+        """
+
+        if self._parser is None:
+            return
+
+        try:
+            self._parser.close()
+        except lxml.etree.XMLSyntaxError:  # empty webpage
+            pass
+
+        self._read_events()
+
+    def _read_events(self) -> None:
+        for event, element in self._parser.read_events():
+            if event == "start":
+                self._start(element)
+            else:
+                self._end(element)
+
+    def _is_submenu(self, element: Element) -> bool:
+        return element.tag == "ul" and " ".join(_get_classes(element)) == (
+            "list-tabs list-tabs--secondary"
+        )
+
+    def _start(self, element: Element) -> None:
+        if self._is_submenu(element):
+            self._submenus += 1
+
+        elif self._match_table is not None:
+            self._rows += element.tag == "tr"
+
+        elif (
+            not self.has_match_table
+            and element.tag == "div"
+            and element.get("id") == "js-leagueresults-all"
+        ):
+            self._match_table = element
+            self.has_match_table = True
+
+    def _end(self, element: Element) -> None:
+        if self._submenus:
+            self._end_inside_submenu(element)
+        elif self._match_table is not None:
+            self._end_inside_match_table(element)
+        else:
+            _remove_element(element)
+
+    def _end_inside_submenu(self, element: Element) -> None:
+        if element.tag == "a" and not self.query:
+            if _get_text(element).lower() == "main":
+                self.query = element.attrib["href"] + "&month=all"
+
+        if self._is_submenu(element):
+            self._submenus -= 1
+
+    def _end_inside_match_table(self, element: Element) -> None:
+        if element.tag == "th" and "h-text-left" in _get_classes(element):
+            self.has_groups |= "group" in element.text_content().lower()
+
+        elif element.tag == "tr":
+            self._rows -= 1
+
+            if element.find(".//th") is None:
+                odds: list[str] = [
+                    tag.attrib["data-odd"]
+                    for tag in element.iterdescendants()
+                    if "data-odd" in tag.attrib
+                ]
+                self.raw_rows.append(
+                    ([_get_text(column) for column in element.iter("td")], odds)
+                )
+
+            if not self._rows:  # rows inside other rows are freed with them
+                _remove_element(element)
+
+        elif element is self._match_table:
+            self._match_table = None
+
+    def get_match_rows(self) -> Optional[list[RawRow]]:
+        """
+        Same as html_backend.get_match_rows.
+        """
+
+        if not self.has_match_table or self.has_groups:
+            return None
+
+        return self.raw_rows
@@ -1,10 +1,13 @@
+import functools
 import logging
-import random
-import time
 from datetime import datetime, timedelta
-from typing import Callable, Literal, ParamSpec, TypeVar
+from typing import Callable, Literal, Optional, ParamSpec, TypeVar
 from urllib.parse import urljoin
 
+import requests
+
+from .dead_letters import DeadLetters, get_dead_letters
+
 T = TypeVar("T")
 P = ParamSpec("P")
 
@@ -48,24 +51,49 @@ def get_tournament_name(path: str) -> str:
     return name
 
 
-def run_three_times(func: Callable[P, T]) -> Callable[P, T]:
-    """
-    Decorator for trying to run a function more than once.
+def empty_on_request_failure(func: Callable[P, T]) -> Callable[P, T]:
     """
+    Decorator for functions that scrape webpages (their first argument must
+    be the path being scraped).
 
-    def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-        for _ in range(3):
-            result = func(*args, **kwargs)
+    Failed requests are already retried by the scrape client, so if a request
+    still fails, it is logged and an empty list is returned instead.
 
-            if result:  # if function's output is as expected
-                return result
+    If the scrape package has dead letters (see set_dead_letters), the failure
+    is recorded in them, so it can be retried later. Then, webpages that can
+    not be parsed are also recorded (and skipped) instead of stopping the run.
+    A success resolves the previous failures of the same path.
 
-            time.sleep(random.uniform(6, 12))
+    Empty results (such as a season without matches) are not failures,
+    so they are returned right away.
+    """
 
-        logging.warning("No results even after attempting three times.")
-        logging.warning(f"args: {args}\n" + f"kwargs: {kwargs}")
-        return []
+    @functools.wraps(func)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        dead_letters: Optional[DeadLetters] = get_dead_letters()
+
+        try:
+            value: T = func(*args, **kwargs)
+        except requests.RequestException as error:
+            logging.warning(f"Request failed even after retrying: {error!r}")
+            logging.warning(f"args: {args}\n" + f"kwargs: {kwargs}")
+            failure: Exception = error
+        except Exception as error:
+            if dead_letters is None:
+                raise
+
+            logging.exception(f"Webpage could not be parsed: {args}")
+            failure = error
+        else:
+            # work that failed in a previous run and succeeds now is done
+            if dead_letters is not None:
+                dead_letters.resolve(args[0])
+
+            return value
+
+        if dead_letters is not None:
+            dead_letters.record(args[0], func.__name__, failure)
 
-    wrapper.__name__ = func.__name__
+        return []
 
     return wrapper
@@ -1,7 +1,8 @@
 import logging
+from typing import Optional
 
-import requests
-
+from .client import Page, get_client
+from .season_dropdowns import SeasonDropdowns, get_season_dropdowns
 from .utils import CURRENT_YEAR, concatenate_homepage_url_to_path
 
 NOT_FOUND_CODE = 404
@@ -15,9 +16,15 @@ class InvalidPaths(Exception):
 def _is_path_invalid(path: str) -> bool:
 
     url = concatenate_homepage_url_to_path(path)
-    request = requests.get(url)
 
-    return request.status_code == NOT_FOUND_CODE
+    # the same webpage is parsed later on to find the tournament's seasons,
+    # unless they are taken from its stored dropdown (then, it is not kept)
+    dropdowns: Optional[SeasonDropdowns] = get_season_dropdowns()
+    keep: bool = dropdowns is None or not dropdowns.has(path)
+
+    page: Page = get_client().get(url, keep=keep)
+
+    return page.status_code == NOT_FOUND_CODE
 
 
 def validate_url_paths(paths: list[str]) -> None:
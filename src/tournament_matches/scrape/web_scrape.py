@@ -1,4 +1,6 @@
 import logging
+import os
+import time
 from collections import defaultdict
 from pathlib import Path
 from typing import Optional
@@ -7,85 +9,254 @@ import pandas as pd
 
 from logs import log
 
+from .client import get_client
+from .dead_letters import DeadLetters, get_dead_letters
+from .journal import ScrapeJournal
+from .matches_builder import MatchesBuilder
+from .matches_writer import (
+    TEMPORARY_SUFFIX,
+    MatchesWriter,
+    MatchKey,
+    copy_unreplaced_matches,
+)
+from .scheduling import get_deadline, is_past_deadline, schedule_seasons
 from .scrape_matches import Matches, web_scrape_matches_information
+from .season_costs import SeasonCosts
+from .season_index import SeasonIndex, get_new_or_changed_matches
 from .season_years import get_path_to_desired_seasons
-from .utils import get_sport, get_tournament_name
+from .utils import concatenate_homepage_url_to_path, get_sport, get_tournament_name
 
 
 def _create_tournament_id(name: str, season_path: str) -> str:
     return name + "@" + season_path
 
 
-def _convert_matches_list_to_data_frame(
-    id: str, matches: list[Matches]
-) -> pd.DataFrame:
-    df_matches: pd.DataFrame = pd.DataFrame(matches)
+def _get_default_path(name: str, season_path: str) -> str:
+    # /sport/country/name-year/ -> /sport/country/current_name/
+    _, sport, country, *_ = season_path.split("/")
 
-    df_matches.loc[:, "id"] = id
-    return df_matches.set_index("id")
+    return f"/{sport}/{country}/{name}/"
 
 
-def _rename_columns(df_matches: pd.DataFrame) -> pd.DataFrame:
-    # some sports don't have ties and because of it they only contain five columns
-    COLUMN_NAMES: dict[int, list[str]] = {
-        5: ["teams", "result", "date", "odds home", "odds away"],
-        6: ["teams", "result", "date", "odds home", "odds tie", "odds away"],
-    }
+def _set_tournament(path: str, default_path: str) -> None:
+    # failed work is retried from its dead letter alone (see retry_web_scrape)
+    dead_letters: Optional[DeadLetters] = get_dead_letters()
 
-    columns: list[str] = COLUMN_NAMES[df_matches.shape[1]]
-    return df_matches.set_axis(columns, axis="columns")
+    if dead_letters is not None:
+        dead_letters.set_tournament(path, default_path)
 
 
-def _rename_columns_all_sports(
-    sport_to_df_matches: dict[str, pd.DataFrame]
+def _build_all_sports(
+    sport_to_builder: dict[str, MatchesBuilder]
 ) -> dict[str, pd.DataFrame]:
     return {
-        sport: _rename_columns(df_matches)
-        for sport, df_matches in sport_to_df_matches.items()
+        sport: builder.build()
+        for sport, builder in sport_to_builder.items()
+        if len(builder)
     }
 
 
+def _get_path_to_desired_seasons(
+    path: str,
+    first_season: tuple[str, str],
+    last_season: tuple[str, str],
+    journal: Optional[ScrapeJournal],
+) -> list[str]:
+    season_paths: Optional[list[str]] = None
+
+    try:
+        if journal is not None:
+            season_paths = journal.get_season_paths(path, first_season, last_season)
+
+        if season_paths is None:
+            season_paths = get_path_to_desired_seasons(path, first_season, last_season)
+            _set_tournament(path, path)
+
+            if journal is not None:
+                journal.record_season_paths(
+                    path, first_season, last_season, season_paths
+                )
+    finally:
+        # the default page kept by validate_url_paths is not requested anymore
+        # (seasons found in the journal or in the stored dropdown skip it)
+        get_client().release(concatenate_homepage_url_to_path(path))
+
+    return season_paths
+
+
+def _emit_matches(
+    season_path: str,
+    matches: Optional[Matches],
+    journal: Optional[ScrapeJournal],
+    index: Optional[SeasonIndex],
+) -> Optional[Matches]:
+    if index is not None:
+        # in incremental mode, only matches that are not in the index are emitted
+        stored: Matches = index.get_matches(season_path) if index.incremental else []
+        index.record(season_path, matches)
+
+        if index.incremental and matches:
+            matches = get_new_or_changed_matches(stored, matches)
+            index.count_new_matches(matches)
+
+    # emitted matches are journaled, so a resumed run emits them again
+    if journal is not None:
+        journal.record_matches(season_path, matches)
+
+    return matches
+
+
+def _web_scrape_and_record_cost(
+    season_path: str, costs: Optional[SeasonCosts]
+) -> Optional[Matches]:
+    if costs is None:
+        return web_scrape_matches_information(season_path)
+
+    # failures are only known from the dead letters they leave
+    dead_letters: Optional[DeadLetters] = get_dead_letters()
+    failures: int = (
+        0 if dead_letters is None else dead_letters.get_failures(season_path)
+    )
+
+    # a season is scraped by a single thread, so its downloads are counted apart
+    downloaded: int = get_client().downloaded_bytes()
+    start: float = time.perf_counter()
+
+    matches: Optional[Matches] = web_scrape_matches_information(season_path)
+
+    # ignored seasons are neither costly nor failed
+    if matches is not None:
+        costs.record(
+            season_path,
+            len(matches),
+            get_client().downloaded_bytes() - downloaded,
+            time.perf_counter() - start,
+            failed=(
+                dead_letters is not None
+                and dead_letters.get_failures(season_path) > failures
+            ),
+        )
+
+    return matches
+
+
+def _get_stale_matches(
+    season_path: str, index: Optional[SeasonIndex]
+) -> Optional[Matches]:
+    get_deadline().skip()
+
+    # stored matches are not journaled: a resumed run scrapes the season.
+    # Without an index, the season is missing from the output (so scrape.py
+    # refuses a deadline without one)
+    if index is None:
+        return None
+
+    # in incremental mode, they were emitted when they were scraped
+    return [] if index.incremental else index.get_matches(season_path)
+
+
+def _get_matches(
+    season_path: str,
+    journal: Optional[ScrapeJournal],
+    index: Optional[SeasonIndex],
+    costs: Optional[SeasonCosts],
+) -> Optional[Matches]:
+    if index is not None:
+        closed_matches: Optional[Matches] = index.get_closed_matches(season_path)
+
+        if closed_matches is not None:
+            # in incremental mode, they were emitted when they were scraped
+            return [] if index.incremental else closed_matches
+
+    if journal is not None and journal.has_matches(season_path):
+        return journal.get_matches(season_path)
+
+    if is_past_deadline():
+        return _get_stale_matches(season_path, index)
+
+    matches: Optional[Matches] = _web_scrape_and_record_cost(season_path, costs)
+
+    return _emit_matches(season_path, matches, journal, index)
+
+
+def _web_scrape_season_matches(
+    name: str,
+    season_path: str,
+    journal: Optional[ScrapeJournal] = None,
+    index: Optional[SeasonIndex] = None,
+    writer: Optional[MatchesWriter] = None,
+    costs: Optional[SeasonCosts] = None,
+) -> tuple[str, Optional[Matches]]:
+    # id for data_frame: f"{current_name}@{season_path}"
+    id: str = _create_tournament_id(name, season_path)
+
+    matches: Optional[Matches] = _get_matches(season_path, journal, index, costs)
+    _set_tournament(season_path, _get_default_path(name, season_path))
+
+    if writer is None:
+        return id, matches
+
+    # written matches are not kept in memory
+    writer.write(get_sport(season_path), id, matches)
+    return id, None
+
+
 def _web_scrape_from_paths(
-    paths: list[str], first_season: tuple[str, str], last_season: tuple[str, str]
+    paths: list[str],
+    first_season: tuple[str, str],
+    last_season: tuple[str, str],
+    journal: Optional[ScrapeJournal] = None,
+    index: Optional[SeasonIndex] = None,
+    writer: Optional[MatchesWriter] = None,
+    costs: Optional[SeasonCosts] = None,
 ) -> dict[str, pd.DataFrame]:
-    sport_to_matches: dict[str, pd.DataFrame] = defaultdict(pd.DataFrame)
+    seasons: list[tuple[str, str]] = []  # (name, season_path) of every tournament
 
     for path in paths:  # path: /sport/country/current_name/
         # name is necessary because some tournaments had their names changed
         name: str = get_tournament_name(path)
-        sport: str = get_sport(path)
 
-        season_paths: list[str] = get_path_to_desired_seasons(
-            path, first_season, last_season
+        season_paths: list[str] = _get_path_to_desired_seasons(
+            path, first_season, last_season, journal
         )
+        seasons.extend((name, season_path) for season_path in season_paths)
 
-        for season_path in season_paths:  # season_path: /sport/country/name-year/
-            # id for data_frame: f"{current_name}@{season_path}"
-            id: str = _create_tournament_id(name, season_path)
+    # season_path: /sport/country/name-year/
+    scraped: list[tuple[str, Optional[Matches]]] = [None] * len(seasons)
 
-            matches: Optional[Matches] = web_scrape_matches_information(season_path)
-
-            if not matches:
-                continue
+    for i in schedule_seasons([path for _, path in seasons], index, costs):
+        scraped[i] = _web_scrape_season_matches(
+            *seasons[i], journal, index, writer, costs
+        )
 
-            df_matches: pd.DataFrame = _convert_matches_list_to_data_frame(id, matches)
-            sport_to_matches[sport] = pd.concat([sport_to_matches[sport], df_matches])
+    # matches are copied into a data frame only once per sport, at the end
+    sport_to_builder: dict[str, MatchesBuilder] = defaultdict(MatchesBuilder)
 
-    stm_right_columns: dict[str, pd.DataFrame] = _rename_columns_all_sports(
-        sport_to_matches
-    )
+    for (_, season_path), (id, matches) in zip(seasons, scraped):
+        sport_to_builder[get_sport(season_path)].add(id, matches)
 
-    return stm_right_columns
+    return _build_all_sports(sport_to_builder)
 
 
 @log(logging.info)
 def web_scrape_from_provided_paths(
-    paths: list[str], first_season: tuple[str, str], last_season: tuple[str, str]
+    paths: list[str],
+    first_season: tuple[str, str],
+    last_season: tuple[str, str],
+    journal: Optional[ScrapeJournal] = None,
+    index: Optional[SeasonIndex] = None,
+    writer: Optional[MatchesWriter] = None,
+    costs: Optional[SeasonCosts] = None,
 ) -> dict[str, Matches]:
     """
     Given a list of default betexplorer.com paths and an interval of seasons,
     returns a dictionary with matches to all seasons grouped by sport.
 
+    Seasons are scraped by freshness: failed and in-progress seasons first,
+    closed ones last (see schedule_seasons). If the deadline of the scrape
+    package (see set_deadline) is over, remaining seasons are not scraped:
+    their stored matches in "index", if any, are used instead.
+
     --------
     Parameters:
 
@@ -105,6 +276,25 @@ def web_scrape_from_provided_paths(
             Last season to be considered.
             It is similar to the first_season parameter.
 
+        journal: Optional[ScrapeJournal]
+            Journal where completed work is recorded as soon as it is done.
+            Work already recorded in it is not done again.
+
+        index: Optional[SeasonIndex]
+            Index of scraped seasons. Closed seasons (see SeasonIndex)
+            are not scraped again: their stored matches are used instead.
+
+            In incremental mode, only new or changed matches are returned.
+
+        writer: Optional[MatchesWriter]
+            If provided, matches of each season are written to disk as soon
+            as they are scraped, and are not returned.
+
+        costs: Optional[SeasonCosts]
+            History where the cost of every scraped season is recorded,
+            so later runs can schedule the most costly seasons first
+            and refresh the least recently scraped ones first.
+
     --------
     Returns:
 
@@ -129,12 +319,16 @@ def web_scrape_from_provided_paths(
                 Value: pd.DataFrame with matches' information for all tournaments
     """
 
-    return _web_scrape_from_paths(paths, first_season, last_season)
+    return _web_scrape_from_paths(
+        paths, first_season, last_season, journal, index, writer, costs
+    )
 
 
 @log(logging.info)
 def save_web_scraped_matches(
-    sport_to_matches: dict[str, pd.DataFrame], directory_path: Path
+    sport_to_matches: dict[str, pd.DataFrame],
+    directory_path: Path,
+    append: bool = False,
 ) -> None:
     """
     Save all web scraped matches inside "directory_path" per sport, that is,
@@ -163,10 +357,34 @@ def save_web_scraped_matches(
 
         directory_path: Path
             Path to the folder where it will be saved on.
+
+        append: bool
+            If True, matches are appended to existing files (incremental mode),
+            replacing their previous versions (see MatchesWriter).
+            Otherwise, files are rewritten.
     """
 
     directory_path.mkdir(parents=True, exist_ok=True)
 
     for sport, df_matches in sport_to_matches.items():
         file_path: Path = directory_path / f"{sport}.csv"
-        df_matches.to_csv(file_path)
+
+        if not (append and file_path.exists()):
+            df_matches.to_csv(file_path)
+            continue
+
+        replaced: set[MatchKey] = set(
+            zip(
+                df_matches.index.astype(str),
+                df_matches["teams"].astype(str),
+                df_matches["date"].astype(str),
+            )
+        )
+        temporary_path: Path = file_path.with_name(file_path.name + TEMPORARY_SUFFIX)
+
+        with open(file_path, "r", newline="") as previous_file:
+            with open(temporary_path, "w", newline="") as temporary_file:
+                copy_unreplaced_matches(previous_file, temporary_file, replaced)
+
+        df_matches.to_csv(temporary_path, mode="a", header=False)
+        os.replace(temporary_path, file_path)
@@ -0,0 +1,120 @@
+import re
+from typing import Optional, Pattern
+
+from bs4.dammit import EncodingDetector
+
+# start of the only regions of a webpage that are scraped
+SUBMENU_START_RE: Pattern[bytes] = re.compile(
+    rb'<ul\b[^>]*\bclass="list-tabs\s+list-tabs--secondary"', re.IGNORECASE
+)
+MATCH_TABLE_START_RE: Pattern[bytes] = re.compile(
+    rb'<div\b[^>]*\bid="js-leagueresults-all"', re.IGNORECASE
+)
+SEASONS_START_RE: Pattern[bytes] = re.compile(
+    rb'<div\b[^>]*\bclass="(?:[^"]*\s)?wrap-section__header__select[\s"]',
+    re.IGNORECASE,
+)
+
+# opening (group 1 is empty) or closing (group 1 is "/") tags
+TAG_RE: dict[str, Pattern[bytes]] = {
+    tag: re.compile(rb"<(/?)" + tag.encode() + rb"\b", re.IGNORECASE)
+    for tag in ["div", "ul"]
+}
+
+_enabled: bool = True
+
+
+def is_partial_parsing_enabled() -> bool:
+    return _enabled
+
+
+def set_partial_parsing(enabled: bool) -> None:
+    """
+    If enabled, only the regions of a webpage that are scraped are parsed
+    (see get_results_regions and get_seasons_region).
+    """
+
+    global _enabled
+    _enabled = enabled
+
+
+def _get_element_end(webpage: bytes, start: int, tag: str) -> Optional[int]:
+    # nested elements with the same tag are skipped by counting them
+    depth: int = 0
+
+    for match in TAG_RE[tag].finditer(webpage, start):
+        depth += -1 if match.group(1) else 1
+
+        if depth == 0:
+            end: int = webpage.find(b">", match.end())
+            return None if end == -1 else end + 1
+
+    return None
+
+
+def _get_elements(
+    webpage: bytes, start_re: Pattern[bytes], tag: str, first_only: bool
+) -> list[bytes]:
+    elements: list[bytes] = []
+
+    for match in start_re.finditer(webpage):
+        # an element that is not closed goes until the end of the webpage,
+        # like it would if the whole webpage was parsed
+        end: Optional[int] = _get_element_end(webpage, match.start(), tag)
+        elements.append(webpage[match.start() : end])
+
+        if first_only:
+            break
+
+    return elements
+
+
+def _create_document(webpage: bytes, regions: list[bytes]) -> bytes:
+    # the encoding declared by the original webpage is kept
+    encoding: Optional[str] = EncodingDetector.find_declared_encoding(
+        webpage, is_html=True
+    )
+    meta: bytes = b"" if encoding is None else f'<meta charset="{encoding}">'.encode()
+
+    return (
+        b"<html><head>"
+        + meta
+        + b"</head><body>"
+        + b"".join(regions)
+        + b"</body></html>"
+    )
+
+
+def get_results_regions(webpage: bytes) -> Optional[bytes]:
+    """
+    Document with only the secondary submenus (with the main section query)
+    and the matches table of a results webpage.
+
+    Returns None if those regions could not be found.
+    """
+
+    found: list[bytes] = _get_elements(
+        webpage, SUBMENU_START_RE, "ul", first_only=False
+    ) + _get_elements(webpage, MATCH_TABLE_START_RE, "div", first_only=True)
+
+    if not found:
+        return None
+
+    return _create_document(webpage, found)
+
+
+def get_seasons_region(webpage: bytes) -> Optional[bytes]:
+    """
+    Document with only the season dropdown menu of a tournament's webpage.
+
+    Returns None if it could not be found.
+    """
+
+    dropdown: list[bytes] = _get_elements(
+        webpage, SEASONS_START_RE, "div", first_only=True
+    )
+
+    if not dropdown:
+        return None
+
+    return _create_document(webpage, dropdown)
@@ -0,0 +1,264 @@
+import contextlib
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+# waiting for another process holding the database lock, in seconds
+BUSY_TIMEOUT: float = 60.0
+
+TaskRow = tuple[int, str, str, int]  # (seq, name, season_path, claims)
+
+
+@dataclass(frozen=True)
+class Task:
+    """
+    Season to be scraped by a worker.
+
+    "seq" is the position of the season in the queue: merged shards keep
+    the order seasons were queued in (the same as the sync engine's).
+    """
+
+    seq: int
+    name: str  # current name of the tournament
+    season_path: str
+
+
+@dataclass
+class QueueStats:
+    claimed: int = 0
+    reclaimed: int = 0  # claimed after the lease of another worker expired
+    stolen: int = 0  # claimed from a busy worker that had not started them
+    lost_to_thieves: int = 0  # claimed, but stolen before they were started
+    acked: int = 0
+    lost_leases: int = 0  # done, but the lease had expired and was claimed again
+
+    def report(self) -> str:
+        return (
+            f"claimed: {self.claimed} (reclaimed: {self.reclaimed}, "
+            f"stolen: {self.stolen}), lost to thieves: {self.lost_to_thieves}, "
+            f"acked: {self.acked}, lost leases: {self.lost_leases}"
+        )
+
+
+class WorkQueue:
+    """
+    Durable queue of seasons to be scraped, shared by workers that may run
+    in different processes (or hosts, if the file is on a shared filesystem).
+
+    Tasks are claimed with a lease: a claimed task is not handed to other
+    workers until its lease expires. Workers acknowledge tasks once their
+    matches are written to their shard. If a worker dies, the leases of its
+    unacknowledged tasks expire and other workers claim them again.
+
+    Tasks are claimed by priority (see put), which the coordinator sets
+    from schedule_seasons' order. Workers start claimed tasks one by one (see start):
+    a worker with nothing left to claim steals tasks that others claimed
+    but did not start yet, so no worker is idle while there is work queued.
+
+    -----
+    Parameters:
+
+        path: Path
+            Queue file.
+
+        lease_seconds: float
+            For how long a claimed (or started) task is reserved to its worker.
+    """
+
+    def __init__(self, path: Path, lease_seconds: float) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.lease_seconds: float = lease_seconds
+        self.stats: QueueStats = QueueStats()
+
+        # transactions are explicit: a task must not be claimed twice
+        self._connection: sqlite3.Connection = sqlite3.connect(
+            path, timeout=BUSY_TIMEOUT, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            " seq INTEGER PRIMARY KEY,"
+            " name TEXT NOT NULL,"
+            " season_path TEXT NOT NULL UNIQUE,"
+            " worker TEXT,"
+            " lease_expires REAL,"
+            " claims INTEGER NOT NULL DEFAULT 0,"
+            " done INTEGER NOT NULL DEFAULT 0,"
+            " priority REAL NOT NULL DEFAULT 0,"
+            " started INTEGER NOT NULL DEFAULT 0"
+            ")"
+        )
+        self._add_scheduling_columns()
+
+    def _add_scheduling_columns(self) -> None:
+        # queues created before tasks were scheduled lack these columns
+        columns: set[str] = {
+            row[1] for row in self._connection.execute("PRAGMA table_info(tasks)")
+        }
+
+        for column, column_type in [("priority", "REAL"), ("started", "INTEGER")]:
+            if column not in columns:
+                self._connection.execute(
+                    f"ALTER TABLE tasks ADD COLUMN {column} {column_type}"
+                    " NOT NULL DEFAULT 0"
+                )
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # the database is locked for writing from the start, so two workers
+        # can not read the same unclaimed tasks
+        self._connection.execute("BEGIN IMMEDIATE")
+
+        try:
+            yield self._connection
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+
+        self._connection.execute("COMMIT")
+
+    def put(self, tasks: Iterable[tuple[str, str, float]]) -> int:
+        """
+        Queue seasons, given as (tournament name, season path, priority).
+        Tasks with lower priorities are claimed first.
+
+        Seasons already in the queue are ignored.
+        Returns the number of seasons queued.
+        """
+
+        with self._transaction() as connection:
+            cursor = connection.executemany(
+                "INSERT OR IGNORE INTO tasks (name, season_path, priority)"
+                " VALUES (?, ?, ?)",
+                tasks,
+            )
+
+        return cursor.rowcount
+
+    def clear(self) -> int:
+        """
+        Remove every task, so that seasons are queued again by a new run.
+
+        Returns the number of tasks that were not done.
+        """
+
+        with self._transaction() as connection:
+            (pending,) = connection.execute(
+                "SELECT COUNT(*) FROM tasks WHERE NOT done"
+            ).fetchone()
+            connection.execute("DELETE FROM tasks")
+
+        return pending
+
+    def _lease(
+        self, connection: sqlite3.Connection, worker: str, rows: list[TaskRow]
+    ) -> list[Task]:
+        connection.executemany(
+            "UPDATE tasks SET worker = ?, lease_expires = ?, started = 0,"
+            " claims = claims + 1 WHERE seq = ?",
+            [(worker, time.time() + self.lease_seconds, row[0]) for row in rows],
+        )
+
+        return [Task(seq, name, season_path) for seq, name, season_path, _ in rows]
+
+    def claim(self, worker: str, count: int = 1) -> list[Task]:
+        """
+        Lease up to "count" tasks (queued or whose lease expired) to "worker",
+        by priority.
+
+        If there are none, up to "count" tasks claimed by other workers,
+        but not started yet, are stolen.
+
+        Returns an empty list if there is nothing left to claim.
+        """
+
+        now: float = time.time()
+
+        with self._transaction() as connection:
+            rows: list[TaskRow] = connection.execute(
+                "SELECT seq, name, season_path, claims FROM tasks"
+                " WHERE NOT done AND (lease_expires IS NULL OR lease_expires <= ?)"
+                " ORDER BY priority, seq LIMIT ?",
+                (now, count),
+            ).fetchall()
+
+            stolen: list[TaskRow] = []
+
+            if not rows:
+                stolen = connection.execute(
+                    "SELECT seq, name, season_path, claims FROM tasks"
+                    " WHERE NOT done AND NOT started AND worker != ?"
+                    " AND lease_expires > ? ORDER BY priority, seq LIMIT ?",
+                    (worker, now, count),
+                ).fetchall()
+
+            tasks: list[Task] = self._lease(connection, worker, rows + stolen)
+
+        self.stats.claimed += len(tasks)
+        self.stats.reclaimed += sum(claims > 0 for *_, claims in rows)
+        self.stats.stolen += len(stolen)
+
+        return tasks
+
+    def start(self, worker: str, task: Task) -> bool:
+        """
+        Mark a claimed task as started, so it can not be stolen anymore,
+        and renew its lease.
+
+        Returns False if another worker stole (or reclaimed) it:
+        then "worker" must not scrape it.
+        """
+
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE tasks SET started = 1, lease_expires = ?"
+                " WHERE seq = ? AND worker = ? AND NOT done",
+                (time.time() + self.lease_seconds, task.seq, worker),
+            )
+
+        if cursor.rowcount == 0:
+            self.stats.lost_to_thieves += 1
+            return False
+
+        return True
+
+    def ack(self, worker: str, task: Task) -> bool:
+        """
+        Mark task as done.
+
+        Returns False if the lease had expired and another worker claimed
+        the task again (then both of them may have scraped it).
+        """
+
+        with self._transaction() as connection:
+            connection.execute("UPDATE tasks SET done = 1 WHERE seq = ?", (task.seq,))
+            (holder,) = connection.execute(
+                "SELECT worker FROM tasks WHERE seq = ?", (task.seq,)
+            ).fetchone()
+
+        self.stats.acked += 1
+        self.stats.lost_leases += holder != worker
+
+        return holder == worker
+
+    def counts(self) -> dict[str, int]:
+        """
+        Number of tasks done, leased and queued (including expired leases).
+        """
+
+        done, leased, total = self._connection.execute(
+            "SELECT COALESCE(SUM(done), 0),"
+            " COALESCE(SUM(NOT done AND lease_expires > ?), 0), COUNT(*) FROM tasks",
+            (time.time(),),
+        ).fetchone()
+
+        return {"done": done, "leased": leased, "queued": total - done - leased}
+
+    def report(self) -> str:
+        return f"{self.counts()}; {self.stats.report()}"
+
+    def close(self) -> None:
+        self._connection.close()